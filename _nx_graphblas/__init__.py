@@ -22,22 +22,32 @@ def get_info():
             },
             "ancestors": {},
             "average_clustering": {},
+            "average_shortest_path_length": {},
             "bellman_ford_path": {},
             "bellman_ford_path_length": {},
             "bethe_hessian_matrix": {},
+            "betweenness_centrality": {},
             "bfs_layers": {},
             "boundary_expansion": {},
+            "center": {},
+            "closeness_centrality": {},
             "clustering": {},
             "complement": {},
             "compose": {},
+            "condensation": {},
             "conductance": {},
+            "connected_components": {},
             "cut_size": {},
             "degree_centrality": {},
             "descendants": {},
             "descendants_at_distance": {},
+            "diameter": {},
             "difference": {},
+            "dijkstra_path_length": {},
             "directed_modularity_matrix": {},
             "disjoint_union": {},
+            "eccentricity": {},
+            "edge_betweenness_centrality": {},
             "edge_boundary": {},
             "edge_expansion": {},
             "efficiency": {},
@@ -51,6 +61,7 @@ def get_info():
             "full_join": {},
             "generalized_degree": {},
             "google_matrix": {},
+            "harmonic_centrality": {},
             "has_path": {},
             "hits": {},
             "in_degree_centrality": {},
@@ -61,6 +72,7 @@ def get_info():
             "is_dominating_set": {},
             "is_isolate": {},
             "is_k_regular": {},
+            "is_strongly_connected": {},
             "isolates": {},
             "is_regular": {},
             "is_simple_path": {},
@@ -80,14 +92,20 @@ def get_info():
             "node_expansion": {},
             "normalized_cut_size": {},
             "normalized_laplacian_matrix": {},
+            "number_connected_components": {},
             "number_of_isolates": {},
+            "number_strongly_connected_components": {},
+            "number_weakly_connected_components": {},
             "out_degree_centrality": {},
             "overall_reciprocity": {},
             "pagerank": {},
+            "periphery": {},
+            "radius": {},
             "reciprocity": {},
             "reverse": {},
             "score_sequence": {},
             "single_source_bellman_ford_path_length": {},
+            "single_source_dijkstra_path_length": {},
             "single_source_shortest_path_length": {},
             "single_target_shortest_path_length": {},
             "s_metric": {},
@@ -97,11 +115,14 @@ def get_info():
                     'may specify size as string or number of rows. Default "256 MiB"',
                 },
             },
+            "strongly_connected_components": {},
             "symmetric_difference": {},
             "tournament_matrix": {},
             "transitivity": {},
             "triangles": {},
             "union": {},
             "volume": {},
+            "weakly_connected_components": {},
+            "wiener_index": {},
         },
     }
@@ -7,6 +7,7 @@ from .components import *
 from .core import *
 from .cuts import *
 from .dag import *
+from .distance_measures import *
 from .dominating import *
 from .efficiency_measures import *
 from .isolate import *
@@ -23,3 +24,4 @@ from .structuralholes import *
 from .tournament import *
 from .traversal import *
 from .triads import *
+from .wiener import *
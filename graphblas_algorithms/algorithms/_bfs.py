@@ -1,8 +1,25 @@
 """BFS routines used by other algorithms"""
 
 import numpy as np
-from graphblas import Matrix, Vector, binary, indexunary, replace, semiring, unary
-from graphblas.semiring import any_pair
+from graphblas import (
+    Matrix,
+    Vector,
+    agg,
+    binary,
+    dtypes,
+    indexunary,
+    monoid,
+    replace,
+    semiring,
+    unary,
+)
+from graphblas.semiring import any_pair, plus_first
+
+from .._utils import BFS_ENTRY_BYTES
+
+# Heuristics from Beamer, Asanović, and Patterson, "Direction-Optimizing Breadth-First Search"
+_ALPHA = 14  # Push -> pull when the frontier has more than 1/alpha of the unexplored edges
+_BETA = 24  # Pull -> push when the frontier has fewer than 1/beta of the nodes
 
 
 def _get_cutoff(n, cutoff):
@@ -11,7 +28,49 @@ def _get_cutoff(n, cutoff):
     return cutoff + 1  # Inclusive
 
 
-# Push-pull optimization is possible, but annoying to implement
+def _get_push_pull(G, *, transpose=False):
+    """Return ``expand(semiring, q, v)`` to compute the next frontier of a BFS.
+
+    Push computes ``q @ A`` (scatter out-edges of the frontier), and pull computes
+    ``AT @ q`` (gather in-edges of each node), which is faster for large frontiers
+    since masking by unvisited nodes ``~v.S`` skips the visited rows entirely.
+    The pull matrix is only materialized the first time a frontier is large enough,
+    and it is cached on the graph, so small traversals and undirected graphs are free.
+    """
+    A = G.get_property("offdiag")
+    n = A.nrows
+    if not G.is_directed():
+        push = pull = A
+        degrees_name = "degrees-"
+    elif transpose:
+        push = G.get_property("offdiagT")
+        pull = A
+        degrees_name = "column_degrees-"
+    else:
+        push = A
+        pull = None  # Use "offdiagT" when needed
+        degrees_name = "row_degrees-"
+    is_pull = False
+
+    def expand(semiring, q, v):
+        nonlocal is_pull, pull
+        if is_pull:
+            is_pull = q.nvals * _BETA >= n
+        elif q.nvals * _BETA >= n:
+            # Compare edges from the frontier to edges from unvisited nodes
+            degrees = G.get_property(degrees_name)
+            frontier_edges = plus_first(degrees @ q).new().get(0)
+            unexplored_edges = A.nvals - plus_first(degrees @ v).new().get(0)
+            is_pull = frontier_edges * _ALPHA > unexplored_edges
+        if not is_pull:
+            return semiring(q @ push)
+        if pull is None:
+            pull = G.get_property("offdiagT")
+        return semiring.commutes_to(pull @ q)
+
+    return expand
+
+
 def _bfs_plain(
     G, source=None, target=None, *, index=None, cutoff=None, transpose=False, name="bfs_plain"
 ):
@@ -25,10 +84,8 @@ def _bfs_plain(
         dst_id = G._key_to_id[target]
     else:
         dst_id = None
-    A = G.get_property("offdiag")
-    if transpose and G.is_directed():
-        A = A.T  # TODO: should we use "AT" instead?
-    n = A.nrows
+    expand = _get_push_pull(G, transpose=transpose)
+    n = len(G)
     v = Vector(bool, n, name=name)
     q = Vector(bool, n, name="q")
     v[index] = True
@@ -36,7 +93,7 @@ def _bfs_plain(
     any_pair_bool = any_pair[bool]
     cutoff = _get_cutoff(n, cutoff)
     for _i in range(1, cutoff):
-        q(~v.S, replace) << any_pair_bool(q @ A)
+        q(~v.S, replace) << expand(any_pair_bool, q, v)
         if q.nvals == 0:
             break
         v(q.S) << True
@@ -46,7 +103,7 @@ def _bfs_plain(
 
 
 def _bfs_level(G, source, target=None, *, cutoff=None, transpose=False, dtype=int):
-    if dtype == bool:
+    if dtypes.lookup_dtype(dtype) == dtypes.BOOL:
         dtype = int
     index = G._key_to_id[source]
     if target is not None:
@@ -55,10 +112,8 @@ def _bfs_level(G, source, target=None, *, cutoff=None, transpose=False, dtype=in
         dst_id = G._key_to_id[target]
     else:
         dst_id = None
-    A = G.get_property("offdiag")
-    if transpose and G.is_directed():
-        A = A.T  # TODO: should we use "AT" instead?
-    n = A.nrows
+    expand = _get_push_pull(G, transpose=transpose)
+    n = len(G)
     v = Vector(dtype, n, name="bfs_level")
     q = Vector(bool, n, name="q")
     v[index] = 0
@@ -66,7 +121,7 @@ def _bfs_level(G, source, target=None, *, cutoff=None, transpose=False, dtype=in
     any_pair_bool = any_pair[bool]
     cutoff = _get_cutoff(n, cutoff)
     for i in range(1, cutoff):
-        q(~v.S, replace) << any_pair_bool(q @ A)
+        q(~v.S, replace) << expand(any_pair_bool, q, v)
         if q.nvals == 0:
             break
         v(q.S) << i
@@ -76,7 +131,7 @@ def _bfs_level(G, source, target=None, *, cutoff=None, transpose=False, dtype=in
 
 
 def _bfs_levels(G, nodes, *, cutoff=None, dtype=int):
-    if dtype == bool:
+    if dtypes.lookup_dtype(dtype) == dtypes.BOOL:
         dtype = int
     A = G.get_property("offdiag")
     n = A.nrows
@@ -107,18 +162,172 @@ def _bfs_levels(G, nodes, *, cutoff=None, dtype=int):
     return D
 
 
+def _bfs_levels_iter(
+    G, nodes=None, *, cutoff=None, dtype=int, maxbytes=None, transpose=False, ordered=False
+):
+    """Multi-source BFS that yields ``(index, levels)`` for each source as it finishes.
+
+    If ``ordered`` is True, results are yielded in the order of ``nodes`` instead, so
+    results of sources that finish early are held until the sources before them finish.
+    See ``_bfs_levels_chunks``.
+    """
+    chunks = _bfs_levels_chunks(
+        G, nodes, cutoff=cutoff, dtype=dtype, maxbytes=maxbytes, transpose=transpose
+    )
+    if not ordered:
+        for indices, D in chunks:
+            for i, index in enumerate(indices.tolist()):
+                yield index, D[i, :].new(name="bfs_levels")
+        return
+    ids = range(len(G)) if nodes is None else G.list_to_ids(nodes).tolist()
+    held = {}  # {index: [levels]} of finished sources waiting for earlier sources
+    pos = 0
+    for indices, D in chunks:
+        for i, index in enumerate(indices.tolist()):
+            held.setdefault(index, []).append(D[i, :].new(name="bfs_levels"))
+        while pos < len(ids) and ids[pos] in held:
+            index = ids[pos]
+            levels = held[index]
+            yield index, levels.pop(0)
+            if not levels:
+                del held[index]
+            pos += 1
+
+
+def _bfs_levels_chunks(G, nodes=None, *, cutoff=None, dtype=int, maxbytes=None, transpose=False):
+    """Multi-source BFS that yields ``(indices, levels)`` for sources as they finish.
+
+    Each row of the ``levels`` Matrix is for the source node index in ``indices``.
+
+    Unlike ``_bfs_levels``, this does not compute a ``len(nodes) x n`` matrix at once.
+    Each row of ``D`` holds the step at which nodes were reached from one source, and
+    rows are recycled for new sources as soon as their frontier in ``Q`` is empty (or
+    ``cutoff`` is reached).  ``maxbytes`` bounds the memory used by ``D`` and ``Q``:
+    sources are added while the projected size of the batch fits, where each source is
+    expected to reach as many nodes as the finished sources did on average (and all
+    nodes until a source finishes).  At least one source is always being processed.
+    Results are yielded in the order that sources finish (see ``_bfs_levels_iter`` for
+    node order), and ``transpose=True``
+    gives the lengths of shortest paths to each source instead of from each source.
+    """
+    if dtypes.lookup_dtype(dtype) == dtypes.BOOL:
+        dtype = int
+    A = G.get_property("offdiagT" if transpose else "offdiag")
+    n = A.nrows
+    ids = range(n) if nodes is None else G.list_to_ids(nodes)
+    if ids is None or len(ids) == 0:
+        return
+    pending = iter(ids)
+    remaining = len(ids)
+    entrysize = BFS_ENTRY_BYTES
+    if maxbytes is None:
+        nslots = remaining
+    else:
+        nslots = max(1, min(remaining, maxbytes // (entrysize * n)))
+    D = Matrix(dtypes.INT64, nslots, n, name="bfs_levels")
+    Q = Matrix(bool, nslots, n, name="Q")
+    sources = np.full(nslots, -1, dtype=np.int64)  # -1 for free slots
+    starts = np.zeros(nslots, dtype=np.int64)
+    nfinished = nreached = 0
+    any_pair_bool = any_pair[bool]
+    step = 0
+    while True:
+        # Fill free slots with new sources while the projected batch fits in the budget
+        (free,) = np.nonzero(sources < 0)
+        if maxbytes is None or remaining == 0:
+            num_new = min(remaining, free.size)
+        else:
+            estimate = n if nfinished == 0 else -(-nreached // nfinished)
+            counts = np.zeros(nslots, dtype=np.int64)
+            rows, vals = D.reduce_rowwise(agg.count).new().to_coo()
+            counts[rows] = vals
+            projected = np.maximum(counts[sources >= 0], estimate).sum()
+            num_new = min(remaining, max(0, (maxbytes // entrysize - projected) // estimate))
+            if num_new == 0 and free.size == nslots:
+                num_new = 1
+            if num_new > free.size:
+                grow = max(num_new - free.size, min(nslots, remaining - free.size))
+                D.resize(nslots + grow, n)
+                Q.resize(nslots + grow, n)
+                sources = np.concatenate([sources, np.full(grow, -1, dtype=np.int64)])
+                starts = np.concatenate([starts, np.zeros(grow, dtype=np.int64)])
+                free = np.concatenate([free, np.arange(nslots, nslots + grow)])
+                nslots += grow
+            num_new = min(num_new, free.size)
+        if num_new > 0:
+            slots = free[:num_new]
+            new_sources = np.fromiter(pending, np.int64, count=num_new)
+            remaining -= num_new
+            sources[slots] = new_sources
+            starts[slots] = step
+            new = Matrix.from_coo(slots, new_sources, step, nrows=nslots, ncols=n)
+            D(new.S) << new
+            Q(new.S) << True
+        elif free.size == nslots:
+            return
+        # Advance all sources by one level
+        if cutoff is None or (step - starts[sources >= 0] < cutoff).any():
+            step += 1
+            Q(~D.S, replace) << any_pair_bool(Q @ A)
+            D(Q.S) << step
+        # Retire sources that are finished
+        is_done = sources >= 0
+        rows, _ = Q.reduce_rowwise(monoid.any).new().to_coo(values=False)
+        is_done[rows] = False
+        if cutoff is not None:
+            is_done |= (sources >= 0) & (step - starts >= cutoff)
+        (done,) = np.nonzero(is_done)
+        if done.size == 0:
+            continue
+        # Levels are the number of steps since each source started
+        Done = D[done, :].new()
+        offsets = Vector.from_coo(np.arange(done.size), starts[done], size=done.size)
+        Done = binary.minus(Done & semiring.any_first(offsets.diag() @ Done).new()).new(
+            dtype=dtype, name="bfs_levels"
+        )
+        nfinished += done.size
+        nreached += Done.nvals
+        finished = sources[done]
+        D[done, :] << Matrix(D.dtype, done.size, n)
+        Q[done, :] << Matrix(Q.dtype, done.size, n)
+        sources[done] = -1
+        yield finished, Done
+
+
+def _bfs_path_counts(G, ids):
+    """Multi-source BFS that counts shortest paths, as used by Brandes' algorithm.
+
+    Returns ``P`` and ``frontiers``: ``P[i, j]`` is the number of shortest paths from
+    node ``ids[i]`` to node ``j`` (as a float, since counts grow exponentially), and
+    ``frontiers[d]`` is the structure of the nodes at distance ``d`` from each source.
+    """
+    A = G.get_property("offdiag")
+    n = A.nrows
+    P = Matrix.from_coo(
+        np.arange(len(ids), dtype=np.uint64), ids, 1.0, nrows=len(ids), ncols=n, name="paths"
+    )
+    F = P.dup(name="frontier")
+    frontiers = [unary.one[bool](F).new(name="frontier_0")]
+    plus_first = semiring.plus_first[float]
+    for i in range(1, n):
+        F(~P.S, replace) << plus_first(F @ A)
+        if F.nvals == 0:
+            break
+        P(F.S) << F
+        frontiers.append(unary.one[bool](F).new(name=f"frontier_{i}"))
+    return P, frontiers
+
+
 def _bfs_parent(G, source, target=None, *, cutoff=None, transpose=False, dtype=int):
-    if dtype == bool:
+    if dtypes.lookup_dtype(dtype) == dtypes.BOOL:
         dtype = int
     index = G._key_to_id[source]
     if target is not None:
         dst_id = G._key_to_id[target]
     else:
         dst_id = None
-    A = G.get_property("offdiag")
-    if transpose and G.is_directed():
-        A = A.T  # TODO: should we use "AT" instead?
-    n = A.nrows
+    expand = _get_push_pull(G, transpose=transpose)
+    n = len(G)
     v = Vector(dtype, n, name="bfs_parent")
     q = Vector(dtype, n, name="q")
     v[index] = index
@@ -127,7 +336,7 @@ def _bfs_parent(G, source, target=None, *, cutoff=None, transpose=False, dtype=i
     index = indexunary.index[v.dtype]
     cutoff = _get_cutoff(n, cutoff)
     for _i in range(1, cutoff):
-        q(~v.S, replace) << min_first(q @ A)
+        q(~v.S, replace) << expand(min_first, q, v)
         if q.nvals == 0:
             break
         v(q.S) << q
@@ -142,7 +351,7 @@ def _bfs_plain_bidirectional(G, source):
     # Bi-directional BFS w/o symmetrizing the adjacency matrix
     index = G._key_to_id[source]
     A = G.get_property("offdiag")
-    # XXX: should we use `AT` if available?
+    AT = G.get_property("offdiagT")
     n = A.nrows
     v = Vector(bool, n, name="bfs_plain")
     q_out = Vector(bool, n, name="q_out")
@@ -166,10 +375,10 @@ def _bfs_plain_bidirectional(G, source):
             break
         # Traverse in-edges from the most recent `q_in` and `q_out`
         if is_in_empty:
-            q_in(~v.S) << any_pair_bool(A @ q_out)
+            q_in(~v.S) << any_pair_bool(q_out @ AT)
         else:
             q_in << binary.any(q_out | q_in)
-            q_in(~v.S, replace) << any_pair_bool(A @ q_in)
+            q_in(~v.S, replace) << any_pair_bool(q_in @ AT)
         is_in_empty = q_in.nvals == 0
         if not is_in_empty:
             v(q_in.S) << True
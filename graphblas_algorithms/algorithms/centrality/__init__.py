@@ -1,3 +1,6 @@
+from .betweenness import *
+from .closeness import *
 from .degree_alg import *
 from .eigenvector import *
+from .harmonic import *
 from .katz import *
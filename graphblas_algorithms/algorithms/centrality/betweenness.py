@@ -0,0 +1,111 @@
+import numpy as np
+from graphblas import Matrix, Vector, agg, binary, monoid, unary
+from graphblas.semiring import plus_first, plus_times
+
+from .._bfs import _bfs_path_counts
+
+__all__ = ["betweenness_centrality", "edge_betweenness_centrality"]
+
+
+def _brandes(G, nodes, chunksize, *, endpoints=False, edges=False):
+    """Batched Brandes: BFS from a batch of sources (one per row) at once.
+
+    The forward pass counts shortest paths level by level, and the backward pass
+    accumulates dependencies from the deepest level to the sources.  Sources are
+    processed ``chunksize`` at a time to bound memory.
+    """
+    A = G.get_property("offdiag")
+    AT = G.get_property("offdiagT") if G.is_directed() else A
+    n = A.nrows
+    ids = np.arange(n, dtype=np.uint64) if nodes is None else G.list_to_ids(nodes)
+    if chunksize is None or chunksize <= 0:
+        chunksize = max(1, len(ids))
+    bc = Vector(float, n, name="betweenness_centrality")
+    bc << 0.0
+    if edges:
+        E = Matrix(float, n, n, name="edge_dependencies")
+    for start in range(0, len(ids), chunksize):
+        batch = ids[start : start + chunksize]
+        P, frontiers = _bfs_path_counts(G, batch)
+        Delta = Matrix(float, len(batch), n, name="dependencies")
+        for d in range(len(frontiers) - 1, 0, -1):
+            # W[i, w] = (1 + Delta[i, w]) / P[i, w] for the nodes w at depth d
+            W = binary.plus(unary.one[float](frontiers[d]) | Delta).new(mask=frontiers[d].S)
+            W = binary.truediv(W & P).new(name="W")
+            if edges:
+                prev = P.dup(mask=frontiers[d - 1].S)
+                E(A.S, binary.plus) << plus_times(prev.T @ W)
+            if d > 1:
+                # Delta[i, v] += P[i, v] * sum(W[i, w] for successors w of v)
+                T = plus_first(W @ AT).new(mask=frontiers[d - 1].S)
+                Delta(binary.plus) << binary.times(T & P)
+        bc(binary.plus) << Delta.reduce_columnwise(monoid.plus)
+        if endpoints:
+            # Every node reached is an endpoint once, and each source is an endpoint
+            # for every node it reaches.  A source reaches itself, so subtract twice.
+            bc(binary.plus) << P.reduce_columnwise(agg.count)
+            counts = P.reduce_rowwise(agg.count).new(dtype=float).to_coo()[1] - 2
+            bc(binary.plus) << Vector.from_coo(batch, counts, size=n)
+    if edges:
+        return bc, E
+    return bc
+
+
+def betweenness_centrality(
+    G,
+    nodes=None,
+    *,
+    normalized=True,
+    endpoints=False,
+    chunksize=None,
+    name="betweenness_centrality",
+):
+    """Betweenness centrality from the shortest paths that start at ``nodes``.
+
+    ``nodes`` defaults to all nodes; otherwise, the result is extrapolated from
+    the sources in ``nodes`` as if every node were a source.
+    """
+    bc = _brandes(G, nodes, chunksize, endpoints=endpoints)
+    n = len(G)
+    if normalized:
+        if endpoints:
+            scale = None if n < 2 else 1 / (n * (n - 1))
+        else:
+            scale = None if n <= 2 else 1 / ((n - 1) * (n - 2))
+    elif not G.is_directed():
+        scale = 0.5
+    else:
+        scale = None
+    if scale is not None:
+        if nodes is not None:
+            scale *= n / len(nodes)
+        bc *= scale
+    bc.name = name
+    return bc
+
+
+def edge_betweenness_centrality(
+    G, nodes=None, *, normalized=True, chunksize=None, name="edge_betweenness_centrality"
+):
+    """Edge betweenness centrality from the shortest paths that start at ``nodes``.
+
+    The result has a value for every edge of ``G``, and it is symmetric for undirected
+    graphs.  Like NetworkX, the result is not extrapolated when ``nodes`` is given.
+    """
+    _, E = _brandes(G, nodes, chunksize, edges=True)
+    A = G._A
+    n = len(G)
+    rv = Matrix(float, n, n, name=name)
+    rv(A.S) << 0.0  # Include self-edges
+    rv(binary.plus) << E
+    if not G.is_directed():
+        rv(binary.plus) << E.T
+    if normalized:
+        scale = None if n <= 1 else 1 / (n * (n - 1))
+    elif not G.is_directed():
+        scale = 0.5
+    else:
+        scale = None
+    if scale is not None:
+        rv *= scale
+    return rv
@@ -0,0 +1,35 @@
+import numpy as np
+from graphblas import Vector, agg, monoid
+
+from ..shortest_paths.generic import _path_length_chunks
+
+__all__ = ["closeness_centrality"]
+
+
+def closeness_centrality(G, nodes=None, *, wf_improved=True, maxbytes=None):
+    """Closeness centrality from the lengths of shortest paths to each node.
+
+    Lengths are reduced as they are computed for chunks of nodes, so they are
+    never all kept at once.  ``maxbytes`` approximately limits the memory used.
+    """
+    n = len(G)
+    all_indices = []
+    all_values = []
+    for indices, D in _path_length_chunks(G, nodes, maxbytes=maxbytes, transpose=True):
+        totals = D.reduce_rowwise(monoid.plus[float]).new().to_dense(fill_value=0)
+        reached = D.reduce_rowwise(agg.count).new(dtype=float).to_dense(fill_value=0) - 1
+        values = np.zeros(totals.size)
+        if n > 1:
+            np.divide(reached, totals, out=values, where=totals > 0)
+            if wf_improved:
+                values *= reached / (n - 1)
+        all_indices.append(indices)
+        all_values.append(values)
+    if not all_indices:
+        return Vector(float, n, name="closeness_centrality")
+    return Vector.from_coo(
+        np.concatenate(all_indices),
+        np.concatenate(all_values),
+        size=n,
+        name="closeness_centrality",
+    )
@@ -0,0 +1,23 @@
+from graphblas import Vector, binary, monoid, select, unary
+
+from ..shortest_paths.generic import _path_length_chunks
+
+__all__ = ["harmonic_centrality"]
+
+
+def harmonic_centrality(G, nodes=None, *, sources=None, maxbytes=None):
+    """Harmonic centrality from the lengths of shortest paths from ``sources``.
+
+    Lengths are reduced as they are computed for chunks of sources, so they are
+    never all kept at once.  ``maxbytes`` approximately limits the memory used.
+    """
+    n = len(G)
+    rv = Vector(float, n, name="harmonic_centrality")
+    rv << 0.0
+    for _, D in _path_length_chunks(G, sources, maxbytes=maxbytes):
+        # Ignore paths of length zero such as from a source to itself
+        inverses = unary.minv[float](select.valuene(D, 0)).new()
+        rv(binary.plus) << inverses.reduce_columnwise(monoid.plus)
+    if nodes is not None:
+        rv = rv.dup(mask=G.list_to_mask(nodes), name="harmonic_centrality")
+    return rv
@@ -1,5 +1,5 @@
 import numpy as np
-from graphblas import Matrix, Vector, binary, replace, unary
+from graphblas import Matrix, Vector, binary, replace, select, unary
 from graphblas.semiring import plus_first, plus_pair, plus_times
 
 __all__ = [
@@ -41,10 +41,77 @@ def single_triangle(G, node, *, weighted=False):
     return val.reduce().get(0)
 
 
+def _mean_degree(G):
+    """Average number of neighbors per node, ignoring self-edges"""
+    n = len(G)
+    return 2 * G.get_property("L-").nvals / n if n else 0
+
+
+def _is_degree_skewed(G, *, k=1000, ratio=4):
+    """Whether the ``k`` largest degrees average more than ``ratio`` times the mean degree"""
+    degrees = G.get_property("degrees-").to_dense(fill_value=0)
+    n = degrees.size
+    if n == 0:
+        return False
+    k = min(k, n)
+    return np.partition(degrees, n - k)[n - k :].mean() > ratio * degrees.mean()
+
+
+def _degree_ordered_L(G):
+    """Lower triangle of the adjacency matrix with nodes permuted by ascending degree.
+
+    Each row holds the neighbors with smaller degree, so rows of high-degree nodes are
+    the long ones and the work of triangle counting is spread more evenly.
+    """
+    order = G.get_property("degree_order").to_dense()
+    A = G.get_property("offdiag")
+    return select.tril(A[order, order].new(), -1).new(name="L_degree_ordered")
+
+
+def _mask_to_ids(G, mask):
+    """The node ids selected by a Vector mask"""
+    v = Vector(bool, len(G))
+    v(mask) << True
+    return v.to_coo(values=False)[0]
+
+
+def _scatter(v, ids, size, name):
+    """Move the entries of ``v``, which are for node ids ``ids``, into a Vector of ``size``"""
+    indices, values = v.to_coo()
+    return Vector.from_coo(ids[indices], values, size=size, dtype=v.dtype, name=name)
+
+
+def _triangles_rows(G, A, Ar, *, weighted=False):
+    """Triangles of the nodes whose rows of the symmetric matrix ``A`` are ``Ar``"""
+    if weighted:
+        maxval = G.get_property("max_element-")
+        A, Ar = (unary.cbrt(X / maxval).new() for X in [A, Ar])
+        semiring = plus_times
+    else:
+        semiring = plus_pair
+    # Each triangle of a node is counted once for each of its two edges at the node
+    T = semiring(Ar @ A).new(mask=Ar.S)
+    if weighted:
+        T *= Ar
+    tri = T.reduce_rowwise().new()
+    if weighted:
+        tri *= 0.5
+    else:
+        tri << binary.cdiv(tri, 2)
+    return tri
+
+
 def triangles(G, *, weighted=False, mask=None):
     # Ignores self-edges
-    # Can we apply the mask earlier in the computation?
     L, U = G.get_properties("L- U-")
+    if mask is not None:
+        # Restrict the rows of the product to the masked nodes if they have few edges
+        ids = _mask_to_ids(G, mask)
+        A = G.get_property("offdiag")
+        Ar = A[ids, :].new()
+        if Ar.nvals < L.nvals:
+            tri = _triangles_rows(G, A, Ar, weighted=weighted)
+            return _scatter(tri, ids, len(G), "triangles")
     if weighted:
         maxval = G.get_property("max_element-")
         L = unary.cbrt(L / maxval)
@@ -52,6 +119,23 @@ def triangles(G, *, weighted=False, mask=None):
         semiring = plus_times
     else:
         semiring = plus_pair
+    if _mean_degree(G) < 8:
+        # For small degrees, one product that counts the triangles of each edge is faster.
+        # Every triangle of a node is counted by both of its edges that touch the node.
+        A = G.get_property("offdiag")
+        if weighted:
+            A = unary.cbrt(A / maxval).new()
+        E = semiring(A @ A.T).new(mask=L.S)
+        if weighted:
+            E *= L
+        tri = (E.reduce_rowwise().new(mask=mask) + E.reduce_columnwise().new(mask=mask)).new(
+            name="triangles"
+        )
+        if weighted:
+            tri *= 0.5
+        else:
+            tri << binary.cdiv(tri, 2)
+        return tri
     C = semiring(L @ L.T).new(mask=L.S)
     D = semiring(U @ L.T).new(mask=U.S)
     if weighted:
@@ -64,11 +148,39 @@ def triangles(G, *, weighted=False, mask=None):
     ).new(name="triangles")
 
 
-def total_triangles(G):
-    # We use SandiaDot method, because it's usually the fastest on large graphs.
-    # For smaller graphs, Sandia method is usually faster: plus_pair(L @ L).new(mask=L.S)
-    L, U = G.get_properties("L- U-")
-    return plus_pair(L @ U.T).new(mask=L.S).reduce_scalar().get(0)
+def total_triangles(G, *, method=None):
+    """The number of triangles in the graph, ignoring self-edges.
+
+    ``method`` may be "Burkhardt", "Cohen", "Sandia", or "SandiaDot".  By default,
+    SandiaDot is used for graphs with small average degree and Sandia otherwise,
+    and if a few nodes have much larger degree than average, then Sandia counts
+    triangles with nodes ordered by degree (the order is cached on the graph).
+    """
+    presort = False
+    if method is None:
+        if _mean_degree(G) < 8:
+            method = "SandiaDot"
+        else:
+            method = "Sandia"
+            presort = _is_degree_skewed(G)
+    if method == "Burkhardt":
+        A = G.get_property("offdiag")
+        return plus_pair(A @ A).new(mask=A.S).reduce_scalar().get(0) // 6
+    if method == "Cohen":
+        A, L, U = G.get_properties("offdiag L- U-")
+        return plus_pair(L @ U).new(mask=A.S).reduce_scalar().get(0) // 2
+    if method == "Sandia":
+        if presort:
+            L = G._cacheit("L_degree_ordered-", _degree_ordered_L, G)
+        else:
+            L = G.get_property("L-")
+        return plus_pair(L @ L).new(mask=L.S).reduce_scalar().get(0)
+    if method == "SandiaDot":
+        L, U = G.get_properties("L- U-")
+        return plus_pair(L @ U.T).new(mask=L.S).reduce_scalar().get(0)
+    raise ValueError(
+        f'method must be "Burkhardt", "Cohen", "Sandia", "SandiaDot", or None; got {method!r}'
+    )
 
 
 def transitivity(G):
@@ -98,29 +210,64 @@ def clustering(G, *, weighted=False, mask=None):
     return (2 * tri / denom).new(name="clustering")
 
 
-def clustering_directed(G, *, weighted=False, mask=None):
-    # Can we apply the mask earlier in the computation?
-    A, AT = G.get_properties("offdiag AT")
+def _triangles_directed_rows(G, A, AT, Ar, ATr, *, weighted=False):
+    """Directed triangles of the nodes whose rows of ``A`` and ``A.T`` are ``Ar`` and ``ATr``"""
     if weighted:
         maxval = G.get_property("max_element-")
-        A = unary.cbrt(A / maxval)
-        AT = unary.cbrt(AT / maxval)
+        A, AT, Ar, ATr = (unary.cbrt(X / maxval).new() for X in [A, AT, Ar, ATr])
         semiring = plus_times
     else:
         semiring = plus_pair
-    C = semiring(A @ A.T).new(mask=A.S)
-    D = semiring(AT @ A.T).new(mask=A.S)
-    E = semiring(AT @ AT.T).new(mask=A.S)
+    # The rows of C, C.T, D, and E of `clustering_directed` for these nodes
+    C = semiring(Ar @ AT).new(mask=Ar.S)
+    CT = semiring(Ar @ AT).new(mask=ATr.S)
+    D = semiring(ATr @ AT).new(mask=Ar.S)
+    E = semiring(ATr @ A).new(mask=ATr.S)
     if weighted:
-        C *= A
-        D *= A
-        E *= A
-    tri = (
-        C.reduce_rowwise().new(mask=mask)
-        + C.reduce_columnwise().new(mask=mask)
-        + D.reduce_rowwise().new(mask=mask)
-        + E.reduce_columnwise().new(mask=mask)
-    )
+        C *= Ar
+        CT *= ATr
+        D *= Ar
+        E *= ATr
+    return (
+        C.reduce_rowwise().new()
+        + CT.reduce_rowwise().new()
+        + D.reduce_rowwise().new()
+        + E.reduce_rowwise().new()
+    ).new()
+
+
+def clustering_directed(G, *, weighted=False, mask=None):
+    A, AT = G.get_properties("offdiag offdiagT")
+    tri = None
+    if mask is not None:
+        # Restrict the rows of the products to the masked nodes if they have few edges
+        ids = _mask_to_ids(G, mask)
+        Ar = A[ids, :].new()
+        ATr = AT[ids, :].new()
+        if Ar.nvals + ATr.nvals < A.nvals:
+            tri = _triangles_directed_rows(G, A, AT, Ar, ATr, weighted=weighted)
+            tri = _scatter(tri, ids, len(G), "triangles")
+    if tri is None:
+        if weighted:
+            maxval = G.get_property("max_element-")
+            A = unary.cbrt(A / maxval)
+            AT = unary.cbrt(AT / maxval)
+            semiring = plus_times
+        else:
+            semiring = plus_pair
+        C = semiring(A @ A.T).new(mask=A.S)
+        D = semiring(AT @ A.T).new(mask=A.S)
+        E = semiring(AT @ AT.T).new(mask=A.S)
+        if weighted:
+            C *= A
+            D *= A
+            E *= A
+        tri = (
+            C.reduce_rowwise().new(mask=mask)
+            + C.reduce_columnwise().new(mask=mask)
+            + D.reduce_rowwise().new(mask=mask)
+            + E.reduce_columnwise().new(mask=mask)
+        )
     recip_degrees, total_degrees = G.get_properties("recip_degrees- total_degrees-", mask=mask)
     denom = total_degrees * (total_degrees - 1) - 2 * recip_degrees
     return (tri / denom).new(name="clustering")
@@ -1,3 +1,6 @@
+import numpy as np
+from graphblas import Vector, binary, semiring
+
 from .._bfs import _bfs_plain
 from ..exceptions import PointlessConcept
 
@@ -10,3 +13,53 @@ def is_connected(G):
 
 def node_connected_component(G, n):
     return _bfs_plain(G, n)
+
+
+def connected_components(G):
+    """Label each node by the smallest node index in its component.
+
+    Returns the Vector of labels and the number of components.
+    """
+    return _fastsv(G.get_property("offdiag"))
+
+
+def number_connected_components(G):
+    return connected_components(G)[1]
+
+
+def _fastsv(*matrices, name="connected_components"):
+    """FastSV connected components (Zhang, Azad, and Hu, 2020)
+
+    Each node points to a parent, and trees of nodes are hooked onto the smallest
+    grandparent among the neighbors of their nodes, then shortcut by pointer jumping.
+    This stops when grandparents no longer change, which typically takes a number of
+    iterations that is logarithmic in the diameter, not proportional to the number
+    of components.  Neighbors are given by the union of the structures of ``matrices``,
+    so e.g. ``A`` and ``AT`` give weak connectivity without symmetrizing ``A``.
+    """
+    n = matrices[0].nrows
+    indices = np.arange(n, dtype=np.int64)
+    parents = Vector.from_coo(indices, indices, size=n, name=name)
+    if n == 0:
+        return parents, 0
+    grandparents = parents.dup(name="grandparents")
+    prev = parents.dup(name="prev_grandparents")
+    min_neighbors = parents.dup(name="min_neighbor_grandparents")
+    min_second = semiring.min_second[parents.dtype]
+    while True:
+        for A in matrices:
+            min_neighbors(binary.min) << min_second(A @ grandparents)
+        # Stochastic hooking: parents[parents[i]] = min(parents[parents[i]], min_neighbors[i])
+        hooks = Vector.from_coo(
+            parents.to_dense(), min_neighbors.to_dense(), size=n, dup_op=binary.min
+        )
+        parents(binary.min) << hooks
+        # Aggressive hooking and shortcutting
+        parents(binary.min) << min_neighbors
+        parents(binary.min) << grandparents
+        # Pointer jumping
+        grandparents << parents[parents.to_dense()]
+        if grandparents.isequal(prev):
+            break
+        prev << grandparents
+    return parents, int(np.count_nonzero(parents.to_dense() == indices))
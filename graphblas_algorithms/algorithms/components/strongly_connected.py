@@ -0,0 +1,139 @@
+import numpy as np
+from graphblas import Matrix, Vector, agg, binary, indexunary, replace, select
+from graphblas.semiring import any_first, any_pair, any_second, max_first, plus_pair
+
+from .._bfs import _bfs_plain
+from ..exceptions import PointlessConcept
+
+
+def is_strongly_connected(G):
+    if len(G) == 0:
+        raise PointlessConcept("Connectivity is undefined for the null graph.")
+    source = next(iter(G))
+    return _bfs_plain(G, source).nvals == len(G) and _bfs_plain(
+        G, source, transpose=True
+    ).nvals == len(G)
+
+
+def strongly_connected_components(G):
+    """Label each node by a node index in its strongly connected component.
+
+    Nodes without in-edges or out-edges from the remaining nodes are trimmed first,
+    since each is its own component.  The rest are found by coloring: every node gets
+    the largest node index that can reach it, and each node whose color is its own
+    index is the root of a component, which is the nodes of the same color that can
+    reach the root.  This repeats on the nodes that remain.
+
+    Returns the Vector of labels and the number of components.
+    """
+    A, AT = G.get_properties("offdiag offdiagT")
+    n = A.nrows
+    labels = Vector(int, n, name="strongly_connected_components")
+    remaining = Vector(bool, n, name="remaining")
+    remaining << True
+    while remaining.nvals > 0:
+        _trim(A, AT, labels, remaining)
+        if remaining.nvals > 0:
+            _color(A, AT, labels, remaining)
+    indices, values = labels.to_coo()
+    return labels, int(np.count_nonzero(indices == values))
+
+
+def number_strongly_connected_components(G):
+    return strongly_connected_components(G)[1]
+
+
+def _trim(A, AT, labels, remaining):
+    """Repeatedly remove nodes without in-edges or out-edges from the remaining nodes"""
+    # Missing degrees are zero
+    in_degrees = plus_pair(remaining @ A).new(mask=remaining.S, name="in_degrees")
+    out_degrees = plus_pair(remaining @ AT).new(mask=remaining.S, name="out_degrees")
+    trimmed = remaining.dup(mask=~in_degrees.S, name="trimmed")
+    trimmed(binary.any) << remaining.dup(mask=~out_degrees.S)
+    while trimmed.nvals > 0:
+        labels(trimmed.S) << indexunary.index(trimmed)
+        remaining(~trimmed.S, replace) << remaining
+        # Only neighbors of trimmed nodes may be trimmed next
+        changed_in = plus_pair(trimmed @ A).new(mask=remaining.S)
+        changed_out = plus_pair(trimmed @ AT).new(mask=remaining.S)
+        in_degrees(binary.minus) << changed_in
+        out_degrees(binary.minus) << changed_out
+        trimmed = select.valueeq(in_degrees, 0).new(mask=changed_in.S, name="trimmed")
+        trimmed(binary.any) << select.valueeq(out_degrees, 0).new(mask=changed_out.S)
+
+
+def _color(A, AT, labels, remaining):
+    """Find the components of nodes whose index is the largest of all nodes reaching them"""
+    colors = indexunary.index(remaining).new(name="colors")
+    frontier = colors.dup(name="frontier")
+    while frontier.nvals > 0:
+        candidates = max_first(frontier @ A).new(mask=remaining.S)
+        frontier = candidates.dup(mask=binary.gt(candidates & colors).new().V)
+        colors(frontier.S) << frontier
+    roots = binary.eq(colors & indexunary.index(colors)).new()
+    roots = select.valueeq(roots, True).new(name="roots")
+    # Backward BFS from each root along edges between nodes of the same color
+    D = colors.diag()
+    ET = binary.eq(any_first(D @ AT).new() & any_second(AT @ D).new()).new()
+    ET = select.valueeq(ET, True).new(name="ET")
+    visited = roots.dup(name="visited")
+    q = roots
+    while q.nvals > 0:
+        q(~visited.S, replace) << any_pair(q @ ET)
+        visited(q.S) << True
+    labels(visited.S) << colors
+    remaining(~visited.S, replace) << remaining
+
+
+def condensation(G, components=None):
+    """The graph of strongly connected components.
+
+    ``components`` maps each node to a component in ``range(ncomponents)``.  By default,
+    components are numbered in reverse topological order (sinks first, as with Tarjan's
+    algorithm), then by their first node.
+
+    Returns the DiGraph of components and the Vector of components.
+    """
+    from graphblas_algorithms import DiGraph
+
+    if components is None:
+        labels, ncomponents = strongly_connected_components(G)
+        # Renumber to range(ncomponents) in order of the first node of each component
+        indices, values = labels.to_coo()
+        _, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+        order = np.empty_like(first)
+        order[np.argsort(first)] = np.arange(ncomponents)
+        components = Vector.from_coo(indices, order[inverse], size=len(G))
+        C = _condense(G, components, ncomponents)
+        # Then renumber so every component comes after the components it reaches
+        order = _sinks_first(C)[order[inverse]]
+        components = Vector.from_coo(indices, order, size=len(G), name="components")
+    else:
+        ncomponents = components.reduce(binary.max).get(-1) + 1
+    return DiGraph(_condense(G, components, ncomponents)), components
+
+
+def _condense(G, components, ncomponents):
+    indices, values = components.to_coo()
+    P = Matrix.from_coo(indices, values, True, nrows=len(G), ncols=ncomponents, name="P")
+    A = G.get_property("offdiag")
+    C = any_pair[bool](any_pair[bool](P.T @ A).new() @ P).new()
+    return select.offdiag(C).new(name="condensation")
+
+
+def _sinks_first(C):
+    """Number the nodes of a DAG by repeatedly removing the nodes without out-edges"""
+    n = C.nrows
+    numbers = np.empty(n, dtype=np.int64)
+    out_degrees = C.reduce_rowwise(agg.count).new(name="out_degrees")
+    sinks = Vector(bool, n, name="sinks")
+    sinks(~out_degrees.S) << True
+    count = 0
+    while sinks.nvals > 0:
+        indices = sinks.to_coo(values=False)[0]
+        numbers[indices] = np.arange(count, count + indices.size)
+        count += indices.size
+        changed = plus_pair(C @ sinks).new()
+        out_degrees(binary.minus) << changed
+        sinks = select.valueeq(out_degrees, 0).new(mask=changed.S, name="sinks")
+    return numbers
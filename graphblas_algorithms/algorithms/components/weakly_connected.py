@@ -1,8 +1,24 @@
 from .._bfs import _bfs_plain_bidirectional
 from ..exceptions import PointlessConcept
+from .connected import _fastsv
 
 
 def is_weakly_connected(G):
     if len(G) == 0:
         raise PointlessConcept("Connectivity is undefined for the null graph.")
     return _bfs_plain_bidirectional(G, next(iter(G))).nvals == len(G)
+
+
+def weakly_connected_components(G):
+    """Label each node by the smallest node index in its weakly connected component.
+
+    Returns the Vector of labels and the number of components.
+    """
+    # Hook along out-edges and in-edges instead of symmetrizing A
+    A = G.get_property("offdiag")
+    AT = G._cache.get("offdiagT", A.T)
+    return _fastsv(A, AT, name="weakly_connected_components")
+
+
+def number_weakly_connected_components(G):
+    return weakly_connected_components(G)[1]
@@ -0,0 +1,181 @@
+import numpy as np
+from graphblas import Vector, binary, monoid, select
+from graphblas.semiring import any_first
+
+from .components import is_connected, is_strongly_connected
+from .exceptions import GraphBlasAlgorithmException, PointlessConcept
+from .shortest_paths.generic import _path_length_chunks
+
+__all__ = ["center", "diameter", "eccentricity", "periphery", "radius"]
+
+
+def _not_connected(G):
+    if G.is_directed():
+        return GraphBlasAlgorithmException(
+            "Found infinite path length because the digraph is not strongly connected"
+        )
+    return GraphBlasAlgorithmException(
+        "Found infinite path length because the graph is not connected"
+    )
+
+
+def _eccentricities(G, nodes=None, *, maxbytes=None):
+    """Compute the eccentricity of each node in ``nodes`` from all of its path lengths"""
+    n = len(G)
+    all_indices = []
+    all_values = []
+    for indices, D in _path_length_chunks(G, nodes, maxbytes=maxbytes):
+        if D.nvals != D.nrows * n:
+            raise _not_connected(G)
+        all_indices.append(indices)
+        all_values.append(D.reduce_rowwise(monoid.max).new().to_dense())
+    if not all_indices:
+        return Vector(int, n, name="eccentricity")
+    return Vector.from_coo(
+        np.concatenate(all_indices),
+        np.concatenate(all_values),
+        size=n,
+        dup_op=binary.first,
+        name="eccentricity",
+    )
+
+
+def _isclose(a, b):
+    """Compare bounds exactly for integers and up to rounding errors for floats"""
+    if np.issubdtype(np.result_type(a, b), np.integer):
+        return a == b
+    return np.isclose(a, b, rtol=1e-12, atol=0)
+
+
+def _bounded(G, compute, *, batchsize=16, maxbytes=None):
+    """Eccentricity bounds for undirected graphs (Takes and Kosters, 2013)
+
+    A path length ``d(s, i)`` from a node ``s`` with eccentricity ``e(s)`` bounds the
+    eccentricity of ``i`` between ``max(d(s, i), e(s) - d(s, i))`` and ``e(s) + d(s, i)``.
+    Nodes are only traversed from while their bounds may change the result of
+    ``compute``, and those with the smallest lower bounds and largest upper bounds
+    (then largest degrees) are traversed from first, ``batchsize`` at a time.  Each
+    node is traversed from at most once.
+
+    Float bounds that agree up to rounding are exact, except for "periphery" and
+    "center", which compare eccentricities exactly.  Returns the arrays of lower and
+    upper bounds and whether each node is exact.
+    """
+    n = len(G)
+    if not is_connected(G):
+        raise _not_connected(G)
+    degrees = G.get_property("degrees-").to_dense(fill_value=0)
+    lower = upper = None
+    # Sources already traversed from; their eccentricities are exact
+    done = np.zeros(n, dtype=bool)
+    undecided = np.ones(n, dtype=bool)
+    while undecided.any():
+        candidates = np.flatnonzero(undecided)
+        if candidates.size <= batchsize:
+            batch = candidates
+        elif lower is None:
+            # Start from the nodes with the largest degrees
+            batch = np.sort(np.argsort(-degrees, kind="stable")[:batchsize])
+        else:
+            by_lower = candidates[np.lexsort((-degrees[candidates], lower[candidates]))]
+            by_upper = candidates[np.lexsort((-degrees[candidates], -upper[candidates]))]
+            batch = np.union1d(by_lower[: (batchsize + 1) // 2], by_upper[: batchsize // 2])
+        for indices, D in _path_length_chunks(G, G.list_to_keys(batch.tolist()), maxbytes=maxbytes):
+            ecc = D.reduce_rowwise(monoid.max).new()
+            if lower is None:
+                lower = np.zeros(n, dtype=ecc.dtype.np_type)
+                if np.issubdtype(lower.dtype, np.integer):
+                    upper = np.full(n, np.iinfo(lower.dtype).max, dtype=lower.dtype)
+                else:
+                    upper = np.full(n, np.inf, dtype=lower.dtype)
+                exact = np.zeros(n, dtype=lower.dtype)
+            # Broadcast the eccentricity of each source to its row
+            E = any_first(ecc.diag() @ D).new()
+            diff = binary.minus(E & D).new().reduce_columnwise(monoid.max).new()
+            lower = np.maximum(lower, D.reduce_columnwise(monoid.max).new().to_dense(fill_value=0))
+            lower = np.maximum(lower, diff.to_dense(fill_value=0))
+            bound = binary.plus(E & D).new().reduce_columnwise(monoid.min).new()
+            upper = np.minimum(upper, bound.to_dense(fill_value=upper.max()))
+            exact[indices] = ecc.to_dense(fill_value=0)
+            done[indices] = True
+            # Bounds from other sources may differ by rounding, so keep sources exact
+            lower[done] = upper[done] = exact[done]
+        if compute not in {"periphery", "center"}:
+            is_exact = done | _isclose(lower, upper)
+        elif np.issubdtype(lower.dtype, np.integer):
+            is_exact = done | (lower == upper)
+        else:
+            # Membership compares eccentricities exactly (as networkx does), so float
+            # eccentricities must come from traversals, not from bounds
+            is_exact = done.copy()
+        if compute == "diameter":
+            undecided = ~is_exact & (upper > lower.max())
+        elif compute == "radius":
+            undecided = ~is_exact & (lower < upper.min())
+        elif compute == "periphery":
+            undecided = ~is_exact & (upper >= lower.max())
+        elif compute == "center":
+            undecided = ~is_exact & (lower <= upper.min())
+        else:  # "eccentricity"
+            undecided = ~is_exact
+        undecided &= ~done
+    return lower, upper, is_exact
+
+
+def eccentricity(G, nodes=None, *, maxbytes=None):
+    """The eccentricity of each node in ``nodes`` (default all nodes).
+
+    For undirected graphs, eccentricities of all nodes are computed from bounds, which
+    usually requires traversing from only a small fraction of the nodes.
+    """
+    if nodes is not None or G.is_directed() or len(G) == 0:
+        return _eccentricities(G, nodes, maxbytes=maxbytes)
+    lower, _, _ = _bounded(G, "eccentricity", maxbytes=maxbytes)
+    return Vector.from_dense(lower, name="eccentricity")
+
+
+def _check_graph(G):
+    if len(G) == 0:
+        raise PointlessConcept("The null graph has no eccentricities")
+    if G.is_directed() and not is_strongly_connected(G):
+        raise _not_connected(G)
+
+
+def diameter(G, *, maxbytes=None):
+    _check_graph(G)
+    if G.is_directed():
+        return _eccentricities(G, maxbytes=maxbytes).reduce(monoid.max).get()
+    lower, _, _ = _bounded(G, "diameter", maxbytes=maxbytes)
+    return lower.max().item()
+
+
+def radius(G, *, maxbytes=None):
+    _check_graph(G)
+    if G.is_directed():
+        return _eccentricities(G, maxbytes=maxbytes).reduce(monoid.min).get()
+    _, upper, _ = _bounded(G, "radius", maxbytes=maxbytes)
+    return upper.min().item()
+
+
+def periphery(G, *, maxbytes=None):
+    """Nodes whose eccentricity is the diameter; returns a boolean Vector"""
+    _check_graph(G)
+    if G.is_directed():
+        ecc = _eccentricities(G, maxbytes=maxbytes)
+        rv = binary.eq(ecc, ecc.reduce(monoid.max).get()).new(name="periphery")
+    else:
+        lower, _, is_exact = _bounded(G, "periphery", maxbytes=maxbytes)
+        rv = Vector.from_dense(is_exact & (lower == lower.max()), name="periphery")
+    return select.valueeq(rv, True).new(name="periphery")
+
+
+def center(G, *, maxbytes=None):
+    """Nodes whose eccentricity is the radius; returns a boolean Vector"""
+    _check_graph(G)
+    if G.is_directed():
+        ecc = _eccentricities(G, maxbytes=maxbytes)
+        rv = binary.eq(ecc, ecc.reduce(monoid.min).get()).new(name="center")
+    else:
+        _, upper, is_exact = _bounded(G, "center", maxbytes=maxbytes)
+        rv = Vector.from_dense(is_exact & (upper == upper.min()), name="center")
+    return select.valueeq(rv, True).new(name="center")
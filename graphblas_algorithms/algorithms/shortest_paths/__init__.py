@@ -1,4 +1,5 @@
 from .dense import *
 from .generic import *
+from .multiprocess import *
 from .unweighted import *
 from .weighted import *
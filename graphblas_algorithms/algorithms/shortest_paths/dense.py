@@ -1,5 +1,5 @@
 from graphblas import Matrix, Vector, binary, indexunary, replace, select
-from graphblas.semiring import any_plus, any_second
+from graphblas.semiring import any_plus, any_second, min_plus
 
 from ..exceptions import GraphBlasAlgorithmException
 
@@ -10,9 +10,82 @@ def floyd_warshall(G, is_weighted=False):
     return floyd_warshall_predecessor_and_distance(G, is_weighted, compute_predecessors=False)[1]
 
 
+def _use_dense_format(*matrices):
+    # Once (nearly) every value is present, bitmap format avoids index overhead in kernels
+    for M in matrices:
+        M.ss.config["sparsity_control"] = ["bitmap", "full"]
+
+
+def _floyd_warshall_blocked(G, is_weighted, permutation, blocksize):
+    """Floyd-Warshall distances that pivot on ``blocksize`` contiguous nodes at a time.
+
+    For each block ``K``, the diagonal tile ``D[K, K]`` is closed by repeated ``min_plus``
+    squaring, the column panel ``D[:, K]`` is extended through it, and the rest of ``D``
+    is updated with a single rank-``blocksize`` product ``min_plus(D[:, K] @ D[K, :])``.
+    This uses O(n / blocksize) Python-level iterations instead of O(n).
+    """
+    if G.is_directed():
+        A, row_degrees, column_degrees = G.get_properties("offdiag row_degrees- column_degrees-")
+        nonempty_nodes = binary.pair(row_degrees & column_degrees).new(name="nonempty_nodes")
+    else:
+        A, nonempty_nodes = G.get_properties("offdiag degrees-")
+    if permutation is not None:
+        if len(permutation) != nonempty_nodes.size:
+            raise GraphBlasAlgorithmException(
+                "permutation must contain every node in G with no repeats."
+            )
+        A = A[permutation, permutation].new()
+        nonempty_nodes = nonempty_nodes[permutation].new(name="nonempty_nodes")
+
+    if A.dtype == bool or not is_weighted:
+        dtype = int
+    else:
+        dtype = A.dtype
+    n = A.nrows
+    D = Matrix(dtype, nrows=n, ncols=n, name="floyd_warshall_dist")
+    if is_weighted:
+        D << A
+    else:
+        D(A.S) << 1  # Like `D << unary.one[int](A)`
+    del A
+    if blocksize is None:
+        blocksize = 64
+    is_dense = False
+    nonempty = nonempty_nodes.to_coo(values=False)[0]
+    # Pivot blocks are contiguous, so skip blocks without any nonempty nodes
+    for k0 in sorted(set((nonempty // blocksize * blocksize).tolist())):
+        k1 = min(k0 + blocksize, n)
+        # Shortest paths between nodes of the block that only pivot on the block
+        Tile = D[k0:k1, k0:k1].new(name="Tile")
+        # Each squaring doubles the number of hops, so stop early once paths are found
+        for _ in range(max(1, (k1 - k0 - 2).bit_length())):
+            Prev = Tile.dup()
+            Tile(binary.min) << min_plus(Tile @ Tile)
+            Tile << select.offdiag(Tile)
+            if Tile.isequal(Prev):
+                break
+        Row = D[k0:k1, :].new(name="Row")
+        Col = D[:, k0:k1].new(name="Col")
+        Col(binary.min) << min_plus(Col @ Tile)
+        Col << select.offdiag(Col, -k0)
+        D(binary.min) << select.offdiag(min_plus(Col @ Row).new(name="Outer"))
+        if not is_dense and 2 * D.nvals >= n * n:
+            _use_dense_format(D)
+            is_dense = True
+
+    # Set diagonal values to 0; missing values are implied to be infinity.
+    diag_mask = Vector(bool, size=n, name="diag_mask")
+    diag_mask << True
+    Diag_mask = diag_mask.diag(name="Diag_mask")
+    D(Diag_mask.S) << 0
+    return D
+
+
 def floyd_warshall_predecessor_and_distance(
-    G, is_weighted=False, *, compute_predecessors=True, permutation=None
+    G, is_weighted=False, *, compute_predecessors=True, permutation=None, blocksize=None
 ):
+    if not compute_predecessors:
+        return None, _floyd_warshall_blocked(G, is_weighted, permutation, blocksize)
     # By using `offdiag` instead of `G._A`, we ensure that D will not become dense.
     # Dense D may be better at times, but not including the diagonal will result in less work.
     # Typically, Floyd-Warshall algorithms sets the diagonal of D to 0 at the beginning.
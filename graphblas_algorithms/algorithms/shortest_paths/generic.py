@@ -1,12 +1,82 @@
-from ..exceptions import NoPath
-from .unweighted import bidirectional_shortest_path_length
+import numpy as np
+from graphblas import monoid
 
-__all__ = ["has_path"]
+from .._bfs import _bfs_levels_chunks
+from ..components import is_connected, is_strongly_connected
+from ..exceptions import GraphBlasAlgorithmException, NoPath, PointlessConcept
+from .unweighted import _landmark_rows, _landmark_upper_bound, bidirectional_shortest_path_length
+from .weighted import bellman_ford_path_lengths
 
+__all__ = ["average_shortest_path_length", "has_path"]
 
-def has_path(G, source, target):
+
+def has_path(G, source, target, *, landmarks=None):
+    if landmarks is not None and source in G and target in G:
+        # A path through a landmark answers most queries without a search
+        X, Y = _landmark_rows(landmarks, G.list_to_ids([source, target]))
+        if _landmark_upper_bound(X, Y, G.is_directed()) < np.inf:
+            return True
     try:
-        bidirectional_shortest_path_length(G, source, target)
+        bidirectional_shortest_path_length(G, source, target, landmarks=landmarks)
     except NoPath:
         return False
     return True
+
+
+def _path_length_chunks(G, nodes=None, *, maxbytes=None, transpose=False):
+    """Yield ``(indices, D)`` with the shortest path lengths from chunks of source nodes.
+
+    Each row of ``D`` is for the source node index in ``indices``, and ``transpose=True``
+    gives lengths of paths to the sources instead.  Results are meant to be reduced as
+    they are yielded, so ``maxbytes`` bounds the memory used at any time.
+    """
+    if G.get_property("is_iso"):
+        is_negative, iso_value = G.get_properties("has_negative_edges+ iso_value")
+        if not is_negative:
+            # All edges have the same weight, so use BFS
+            for indices, D in _bfs_levels_chunks(
+                G, nodes, dtype=iso_value.dtype, maxbytes=maxbytes, transpose=transpose
+            ):
+                if iso_value != 1:
+                    D *= iso_value
+                yield indices, D
+            return
+    if transpose and G.is_directed():
+        G = G.reverse()
+    nodes = list(G) if nodes is None else list(nodes)
+    if maxbytes is None:
+        chunksize = max(1, len(nodes))
+    else:
+        chunksize = max(1, maxbytes // (len(G) * G._A.dtype.np_type.itemsize))
+    for start in range(0, len(nodes), chunksize):
+        cur_nodes = nodes[start : start + chunksize]
+        yield G.list_to_ids(cur_nodes), bellman_ford_path_lengths(G, cur_nodes)
+
+
+def average_shortest_path_length(G, *, maxbytes=None):
+    """The average shortest path length computed without keeping the lengths.
+
+    Extra parameter: maxbytes
+
+    Parameters
+    ----------
+    maxbytes : int, optional
+        Approximate limit on the memory used for sources that are being processed.
+        By default, process all sources together.
+    """
+    n = len(G)
+    if n == 0:
+        raise PointlessConcept(
+            "the null graph has no paths, thus there is no average shortest path length"
+        )
+    if n == 1:
+        return 0
+    if G.is_directed():
+        if not is_strongly_connected(G):
+            raise GraphBlasAlgorithmException("Graph is not strongly connected.")
+    elif not is_connected(G):
+        raise GraphBlasAlgorithmException("Graph is not connected.")
+    total = 0
+    for _, D in _path_length_chunks(G, maxbytes=maxbytes):
+        total += D.reduce_scalar(monoid.plus).get(0)
+    return total / (n * (n - 1))
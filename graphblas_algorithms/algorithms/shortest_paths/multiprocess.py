@@ -0,0 +1,199 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from graphblas import Matrix, Vector, select
+from graphblas.semiring import any_pair
+
+from ..._utils import imap_ordered, node_chunks
+from .._bfs import _bfs_levels
+from ..exceptions import Unbounded
+from .weighted import _johnson_potentials, bellman_ford_path_lengths, johnson_path_lengths
+
+__all__ = ["multiprocess_path_length_chunks"]
+
+# The graph most recently loaded by this worker process, keyed by shared memory name
+_worker_graphs = {}
+
+
+def _export_shared(A, potentials=None):
+    """Copy the CSR arrays of ``A`` and ``potentials`` into one block of shared memory.
+
+    Returns the SharedMemory object (the caller must unlink it) and a picklable spec
+    that lets worker processes rebuild ``A``.
+    """
+    info = A.ss.export("csr")
+    arrays = {key: info[key] for key in ["indptr", "col_indices", "values"]}
+    if potentials is not None:
+        arrays["potentials"] = potentials.to_dense()
+    layout = []
+    offset = 0
+    for key, array in arrays.items():
+        layout.append((key, array.dtype.str, offset, array.size))
+        offset += -(-array.nbytes // 8) * 8  # Keep each array 8-byte aligned
+    shm = SharedMemory(create=True, size=max(offset, 1))
+    for key, dtype, start, size in layout:
+        np.ndarray(size, dtype, buffer=shm.buf, offset=start)[:] = arrays[key]
+    spec = {
+        "name": shm.name,
+        "nrows": info["nrows"],
+        "ncols": info["ncols"],
+        "is_iso": info["is_iso"],
+        "sorted_cols": info["sorted_cols"],
+        "dtype": A.dtype.name,
+        "layout": layout,
+    }
+    return shm, spec
+
+
+def _load_shared(spec, cls):
+    """Rebuild the graph from shared memory in a worker process (cached per process)"""
+    G = _worker_graphs.get(spec["name"])
+    if G is not None:
+        return G
+    _worker_graphs.clear()
+    shm = SharedMemory(name=spec["name"])
+    try:
+        arrays = {
+            key: np.ndarray(size, dtype, buffer=shm.buf, offset=start)
+            for key, dtype, start, size in spec["layout"]
+        }
+        if "potentials" in arrays:
+            h = Vector.from_dense(arrays.pop("potentials").copy(), name="johnson_potentials")
+        else:
+            h = None
+        # GraphBLAS must own its memory, so this copies the arrays once per process
+        A = Matrix.ss.import_csr(
+            nrows=spec["nrows"],
+            ncols=spec["ncols"],
+            is_iso=spec["is_iso"],
+            sorted_cols=spec["sorted_cols"],
+            dtype=spec["dtype"],
+            take_ownership=False,
+            **arrays,
+        )
+        del arrays
+    finally:
+        shm.close()
+    G = cls(A)
+    G._cache.update({"offdiag": A, "has_self_edges": False, "has_negative_diagonal": False})
+    if h is not None:
+        G._cache["johnson_potentials"] = h
+    _worker_graphs[spec["name"]] = G
+    return G
+
+
+def _compute_chunk(spec, cls, method, kwargs, ids):
+    G = _load_shared(spec, cls)
+    if method == "bfs":
+        D = _bfs_levels(G, ids, cutoff=kwargs.get("cutoff"), dtype=kwargs.get("dtype", int))
+        if kwargs.get("scale", 1) != 1:
+            D *= kwargs["scale"]
+    elif method == "johnson":
+        D = johnson_path_lengths(G, ids)
+    else:
+        D = bellman_ford_path_lengths(G, ids)
+    info = D.ss.export("csr")
+    arrays = {key: info[key] for key in ["indptr", "col_indices", "values", "is_iso"]}
+    return ids, arrays, D.dtype.name
+
+
+def multiprocess_path_length_chunks(
+    G,
+    nodes=None,
+    *,
+    weighted=True,
+    cutoff=None,
+    chunksize=None,
+    chunks=None,
+    executor=None,
+    max_workers=None,
+):
+    """Yield ``(indices, D)`` with shortest path lengths computed by worker processes.
+
+    The adjacency matrix without self-edges (and the potentials for Johnson's
+    algorithm, computed here once) is copied once into shared memory, and each worker
+    process rebuilds it once.  Workers compute chunks of ``chunksize``
+    sources (BFS if unweighted, otherwise Bellman-Ford, delta-stepping, or Johnson's
+    algorithm as in ``bellman_ford_path_lengths``) and send path lengths back as
+    compact CSR arrays.  Results are yielded in order, and at most ``max_workers``
+    chunks are in flight.  Each row of ``D`` is for the source node index in
+    ``indices``.
+
+    Extra parameters: cutoff, chunksize, chunks, executor, max_workers
+
+    Parameters
+    ----------
+    cutoff : int, optional
+        Only for unweighted path lengths.
+    chunksize : int, optional
+        The number of sources per chunk.  By default, split sources evenly among workers.
+    chunks : iterable of lists of nodes, optional
+        The sources of each chunk to use instead of ``nodes`` and ``chunksize``.  Chunks
+        are taken lazily, so they may adapt to the results yielded so far.
+    executor : concurrent.futures.ProcessPoolExecutor, optional
+        By default, a pool of ``max_workers`` processes started with "forkserver".
+    max_workers : int, optional
+        The number of chunks in flight; by default, the number of CPUs.
+    """
+    if max_workers is None:
+        max_workers = multiprocessing.cpu_count()
+    n = len(G)
+    if chunks is None:
+        ids = np.arange(n, dtype=np.uint64) if nodes is None else G.list_to_ids(nodes)
+        if len(ids) == 0:
+            return
+        if chunksize is None:
+            chunksize = -(-len(ids) // max_workers)
+        chunks = node_chunks(chunksize, ids.tolist())
+    else:
+        chunks = (G.list_to_ids(chunk).tolist() for chunk in chunks)
+    kwargs = {}
+    if not weighted:
+        method = "bfs"
+        kwargs["cutoff"] = cutoff
+    elif G.get_property("is_iso") and not G.get_property("has_negative_edges+"):
+        # All edges have the same weight, so use BFS
+        method = "bfs"
+        iso_value = G.get_property("iso_value")
+        kwargs["dtype"] = iso_value.dtype.name
+        kwargs["scale"] = iso_value.value
+    elif G.is_directed() and G.get_property("has_negative_edges-"):
+        method = "johnson"
+    else:
+        method = "bellman_ford"
+    if method != "bfs" and G.get_property("has_negative_diagonal"):
+        negative_diagonal = select.valuelt(G.get_property("diag"), 0).new()
+    else:
+        negative_diagonal = None
+
+    if method == "johnson":
+        # Compute potentials once here instead of in every worker
+        potentials = G._cacheit("johnson_potentials", _johnson_potentials, G)
+    else:
+        potentials = None
+    shm, spec = _export_shared(G.get_property("offdiag"), potentials)
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ProcessPoolExecutor(
+            max_workers, mp_context=multiprocessing.get_context("forkserver")
+        )
+    cls = type(G)
+    try:
+        func = partial(_compute_chunk, spec, cls, method, kwargs)
+        for chunk, arrays, dtype in imap_ordered(
+            func, chunks, executor=executor, max_workers=max_workers
+        ):
+            D = Matrix.ss.import_csr(
+                nrows=len(chunk), ncols=n, dtype=dtype, name="path_lengths", **arrays
+            )
+            if negative_diagonal is not None and any_pair(D @ negative_diagonal).nvals > 0:
+                raise Unbounded("Negative cycle detected.")
+            yield np.array(chunk, dtype=np.uint64), D
+    finally:
+        if owns_executor:
+            executor.shutdown(cancel_futures=True)
+        shm.close()
+        shm.unlink()
@@ -1,13 +1,17 @@
+import numpy as np
 from graphblas import Matrix, Vector, replace
 from graphblas.semiring import any_pair
 
-from .._bfs import _bfs_level, _bfs_levels
+from .._bfs import _bfs_level, _bfs_levels, _bfs_levels_iter
 from ..exceptions import NoPath
 
 __all__ = [
     "single_source_shortest_path_length",
     "single_target_shortest_path_length",
     "all_pairs_shortest_path_length",
+    "all_pairs_shortest_path_length_iter",
+    "bidirectional_shortest_path_length",
+    "landmark_index",
 ]
 
 
@@ -19,8 +23,8 @@ def single_target_shortest_path_length(G, target, cutoff=None):
     return _bfs_level(G, target, cutoff=cutoff, transpose=True)
 
 
-def all_pairs_shortest_path_length(G, cutoff=None, *, nodes=None, expand_output=False):
-    D = _bfs_levels(G, nodes, cutoff=cutoff)
+def all_pairs_shortest_path_length(G, cutoff=None, *, nodes=None, expand_output=False, dtype=int):
+    D = _bfs_levels(G, nodes, cutoff=cutoff, dtype=dtype)
     if nodes is not None and expand_output and D.ncols != D.nrows:
         ids = G.list_to_ids(nodes)
         rv = Matrix(D.dtype, D.ncols, D.ncols, name=D.name)
@@ -29,7 +33,152 @@ def all_pairs_shortest_path_length(G, cutoff=None, *, nodes=None, expand_output=
     return D
 
 
-def bidirectional_shortest_path_length(G, source, target):
+def all_pairs_shortest_path_length_iter(
+    G, cutoff=None, *, nodes=None, maxbytes=None, dtype=int, ordered=False
+):
+    """Yield ``(node, lengths)`` for each source node as its BFS finishes.
+
+    Extra parameters: maxbytes, ordered
+
+    Parameters
+    ----------
+    maxbytes : int, optional
+        Approximate limit on the memory used for sources that are being processed.
+        The number of sources processed together adapts to how much of the graph
+        each source reaches.  By default, process all sources together.
+    ordered : bool, default False
+        Whether to yield sources in the order of ``nodes`` (default all nodes) instead
+        of as they finish, which may hold results of sources that finish early.
+    """
+    id_to_key = G.id_to_key
+    for index, d in _bfs_levels_iter(
+        G, nodes, cutoff=cutoff, dtype=dtype, maxbytes=maxbytes, ordered=ordered
+    ):
+        yield id_to_key[index], d
+
+
+def landmark_index(G, k=16):
+    """Shortest path lengths between every node and ``k`` landmark nodes.
+
+    The index is used by ``bidirectional_shortest_path_length`` and ``has_path`` to
+    bound path lengths with the triangle inequality (the "ALT" technique).  Landmarks
+    are chosen farthest-first starting from the node with the largest degree, so nodes
+    in other components are chosen before nodes that are already close to a landmark.
+
+    Returns an ``n x k`` Matrix with lengths from each landmark (the graph is undirected),
+    or an ``n x 2k`` Matrix whose last ``k`` columns are lengths to each landmark for
+    directed graphs.  The index is cached on ``G``.
+    """
+    return G._cacheit(f"landmark_index_{k}", _landmark_index, G, k)
+
+
+def _landmark_index(G, k):
+    n = len(G)
+    k = min(k, n)
+    is_directed = G.is_directed()
+    # Lengths are less than n, so store them compactly
+    dtype = np.int16 if n < 2**15 else np.int32
+    degrees = G.get_property("total_degrees-" if is_directed else "degrees-")
+    nearest = np.full(n, np.iinfo(dtype).max, dtype=dtype)
+    index = int(np.argmax(degrees.to_dense(fill_value=0))) if n > 0 else 0
+    columns = []
+    for _ in range(k):
+        key = G.id_to_key[index]
+        v = _bfs_level(G, key, dtype=dtype)
+        columns.append(v)
+        if is_directed:
+            columns.append(_bfs_level(G, key, transpose=True, dtype=dtype))
+        nearest = np.minimum(nearest, v.to_dense(fill_value=nearest.max()))
+        index = int(np.argmax(nearest))
+        if nearest[index] == 0:
+            break
+    if is_directed:
+        # Lengths from landmarks first, then lengths to landmarks
+        columns = columns[::2] + columns[1::2]
+    rows = []
+    cols = []
+    values = []
+    for j, v in enumerate(columns):
+        indices, vals = v.to_coo()
+        rows.append(indices)
+        cols.append(np.full(indices.size, j, dtype=np.uint64))
+        values.append(vals)
+    if not columns:
+        return Matrix(dtype, nrows=n, ncols=0, name="landmark_index")
+    return Matrix.from_coo(
+        np.concatenate(rows),
+        np.concatenate(cols),
+        np.concatenate(values),
+        dtype=dtype,
+        nrows=n,
+        ncols=len(columns),
+        name="landmark_index",
+    )
+
+
+def _landmark_rows(landmarks, ids):
+    # Missing lengths (unreachable) are -1
+    return landmarks[ids, :].new().to_dense(fill_value=-1).astype(np.float64)
+
+
+def _landmark_pairs(X, Y, is_directed):
+    """Pairs ``(P, Q)`` of landmark lengths where ``Q - P`` bounds the length from X to Y"""
+    if not is_directed:
+        return [(X, Y), (Y, X)]
+    k = X.shape[-1] // 2
+    # d(L, y) - d(L, x) and d(x, L) - d(y, L)
+    return [(X[..., :k], Y[..., :k]), (Y[..., k:], X[..., k:])]
+
+
+def _landmark_lower_bound(X, Y, is_directed):
+    """Lower bounds of path lengths from X to Y; infinity if there is no path"""
+    rv = 0
+    for P, Q in _landmark_pairs(X, Y, is_directed):
+        # If P is reachable but Q is not, then there is no path
+        bound = np.where(P < 0, 0, np.where(Q < 0, np.inf, Q - P))
+        rv = np.maximum(rv, bound.max(axis=-1, initial=0))
+    return rv
+
+
+def _landmark_upper_bound(X, Y, is_directed):
+    """Upper bound of the path length from X to Y through a landmark; may be infinity"""
+    if is_directed:
+        k = X.shape[-1] // 2
+        to_landmark, from_landmark = X[k:], Y[:k]
+    else:
+        to_landmark, from_landmark = X, Y
+    valid = (to_landmark >= 0) & (from_landmark >= 0)
+    return (to_landmark + from_landmark)[valid].min(initial=np.inf)
+
+
+def _prune_frontier(q, landmarks, other, level, upper, is_directed, *, forward):
+    """Remove nodes in the frontier ``q`` at ``level`` that can't be on a shortest path.
+
+    ``other`` is the landmark row of the target (if ``forward``) or the source, and
+    ``upper`` is an upper bound of the length of the shortest path.
+    """
+    ids, _ = q.to_coo(values=False)
+    X = _landmark_rows(landmarks, ids)
+    if forward:
+        lower = _landmark_lower_bound(X, other, is_directed)
+    else:
+        lower = _landmark_lower_bound(other, X, is_directed)
+    keep = (level + lower <= upper) & (lower < np.inf)
+    if not keep.all():
+        q << Vector.from_coo(ids[keep], True, size=q.size)
+
+
+def bidirectional_shortest_path_length(G, source, target, *, landmarks=None):
+    """The length of the shortest path from source to target.
+
+    Extra parameter: landmarks
+
+    Parameters
+    ----------
+    landmarks : Matrix, optional
+        Index from ``landmark_index(G)``.  Its bounds answer many queries directly,
+        and nodes that can't be on a shortest path are pruned from the BFS frontiers.
+    """
     # Perform bidirectional BFS from source to target and target to source
     # TODO: have this raise NodeNotFound?
     if source not in G or target not in G:
@@ -38,6 +187,15 @@ def bidirectional_shortest_path_length(G, source, target):
     dst = G._key_to_id[target]
     if src == dst:
         return 0
+    if landmarks is not None:
+        is_directed = G.is_directed()
+        X, Y = _landmark_rows(landmarks, [src, dst])
+        lower = _landmark_lower_bound(X, Y, is_directed)
+        if lower == np.inf:
+            raise NoPath(f"No path between {source} and {target}.")
+        upper = _landmark_upper_bound(X, Y, is_directed)
+        if lower == upper:
+            return int(upper)
     A = G.get_property("offdiag")
     q_src = Vector(bool, size=A.nrows, name="q_src")
     q_src[src] = True
@@ -48,17 +206,27 @@ def bidirectional_shortest_path_length(G, source, target):
     any_pair_bool = any_pair[bool]
     for i in range(1, A.nrows + 1, 2):
         q_src(~seen_src.S, replace) << any_pair_bool(q_src @ A)
+        if landmarks is not None and q_src.nvals > 0:
+            _prune_frontier(q_src, landmarks, Y, (i + 1) // 2, upper, is_directed, forward=True)
         if q_src.nvals == 0:
-            raise NoPath(f"No path between {source} and {target}.")
+            break
         if any_pair_bool(q_src @ q_dst):
             return i
+        if landmarks is not None and i + 1 >= upper:
+            return int(upper)
 
         seen_dst(q_dst.S) << True
         q_dst(~seen_dst.S, replace) << any_pair_bool(A @ q_dst)
+        if landmarks is not None and q_dst.nvals > 0:
+            _prune_frontier(q_dst, landmarks, X, (i + 1) // 2, upper, is_directed, forward=False)
         if q_dst.nvals == 0:
-            raise NoPath(f"No path between {source} and {target}.")
+            break
         if any_pair_bool(q_src @ q_dst):
             return i + 1
+        if landmarks is not None and i + 2 >= upper:
+            return int(upper)
 
         seen_src(q_src.S) << True
+    if landmarks is not None and upper < np.inf:
+        return int(upper)
     raise NoPath(f"No path between {source} and {target}.")
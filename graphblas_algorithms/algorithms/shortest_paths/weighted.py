@@ -1,15 +1,29 @@
 import numpy as np
-from graphblas import Matrix, Vector, binary, indexunary, monoid, replace, select, unary
-from graphblas.semiring import any_pair, min_plus
+from graphblas import (
+    Matrix,
+    Scalar,
+    Vector,
+    binary,
+    dtypes,
+    indexunary,
+    monoid,
+    replace,
+    select,
+    unary,
+)
+from graphblas.semiring import any_eq, any_pair, any_plus, min_plus
 
 from .._bfs import _bfs_level, _bfs_levels, _bfs_parent, _bfs_plain
 from ..exceptions import NoPath, Unbounded
 
 __all__ = [
     "single_source_bellman_ford_path_length",
+    "single_source_dijkstra_path_length",
+    "dijkstra_path_length",
     "bellman_ford_path",
     "bellman_ford_path_length",
     "bellman_ford_path_lengths",
+    "johnson_path_lengths",
     "negative_edge_cycle",
 ]
 
@@ -46,19 +60,33 @@ def _bellman_ford_path_length(G, source, target=None, *, cutoff=None, name):
     # Use `offdiag` instead of `A`, b/c self-loops don't contribute to the result,
     # and negative self-loops are easy negative cycles to avoid.
     # We check if we hit a self-loop negative cycle at the end.
-    if dst_id is None:
-        A, has_negative_diagonal = G.get_properties("offdiag has_negative_diagonal")
+    A, is_negative, has_negative_diagonal = G.get_properties(
+        "offdiag has_negative_edges- has_negative_diagonal"
+    )
+    if not is_negative:
+        d = _delta_stepping(G, src_id, dst_id, cutoff=cutoff, name=name)
     else:
-        A, is_negative, has_negative_diagonal = G.get_properties(
-            "offdiag has_negative_edges- has_negative_diagonal"
-        )
+        d = _bellman_ford(A, src_id, dst_id, cutoff=cutoff, name=name)
+    if has_negative_diagonal:
+        # We removed diagonal entries above, so check if we visited one with a negative weight
+        diag = G.get_property("diag")
+        if any_pair(d @ select.valuelt(diag, 0)):
+            raise Unbounded("Negative cycle detected.")
+    if dst_id is not None:
+        d = d.get(dst_id)
+        if d is None:
+            raise NoPath(f"node {target} not reachable from {source}")
+    return d
+
+
+def _bellman_ford(A, src_id, dst_id=None, *, cutoff=None, name):
     if A.dtype == bool:
         # Should we upcast e.g. INT8 to INT64 as well?
         dtype = int
     else:
         dtype = A.dtype
     n = A.nrows
-    d = Vector(dtype, n, name="single_source_bellman_ford_path_length")
+    d = Vector(dtype, n, name=name)
     d[src_id] = 0
     cur = d.dup(name="cur")
     mask = Vector(bool, n, name="mask")
@@ -81,9 +109,6 @@ def _bellman_ford_path_length(G, source, target=None, *, cutoff=None, name):
             break
         # Update `d` with values that improved
         d(cur.S) << cur
-        if dst_id is not None and not is_negative:
-            # Limit exploration if we have a target
-            cutoff = cur.get(dst_id, cutoff)
     else:
         # Check for negative cycle when for loop completes without breaking
         cur << min_plus(cur @ A)
@@ -92,19 +117,122 @@ def _bellman_ford_path_length(G, source, target=None, *, cutoff=None, name):
         mask << binary.lt(cur & d)
         if dst_id is None and mask.reduce(monoid.lor) or dst_id is not None and mask.get(dst_id):
             raise Unbounded("Negative cycle detected.")
-    if has_negative_diagonal:
-        # We removed diagonal entries above, so check if we visited one with a negative weight
-        diag = G.get_property("diag")
-        cur << select.valuelt(diag, 0)
-        if any_pair(d @ cur):
-            raise Unbounded("Negative cycle detected.")
-    if dst_id is not None:
-        d = d.get(dst_id)
-        if d is None:
-            raise NoPath(f"node {target} not reachable from {source}")
     return d
 
 
+def _delta_stepping(G, src_id, dst_id=None, *, cutoff=None, name):
+    """Shortest path lengths from a source when no edge weights are negative.
+
+    This is delta-stepping (Meyer and Sanders, 2003).  Nodes are settled in buckets of
+    path lengths ``[lo, lo + delta)`` where ``lo`` is the smallest unsettled length.
+    Light edges (weight <= delta) may lead back into the current bucket, so they are
+    relaxed repeatedly from the nodes that improved, and heavy edges are relaxed once
+    from all nodes of the bucket after it is settled.
+    """
+    L, H, delta = G.get_properties("light_edges- heavy_edges- delta")
+    if L.dtype == bool:
+        dtype = dtypes.lookup_dtype(int)
+    else:
+        dtype = L.dtype
+    np_type = dtype.np_type.type
+    if cutoff is not None:
+        # Thunks for `select` should have the same dtype as the values
+        if np.issubdtype(np_type, np.integer):
+            cutoff //= 1
+        cutoff = Scalar.from_value(cutoff, dtype)
+    n = L.nrows
+    d = Vector(dtype, n, name=name)
+    d[src_id] = 0
+    # Path lengths that may still improve
+    unsettled = d.dup(name="unsettled")
+    bucket = Vector(bool, n, name="bucket")
+    cur = Vector(dtype, n, name="cur")
+    frontier = Vector(dtype, n, name="frontier")
+    mask = Vector(bool, n, name="mask")
+    one = unary.one[bool]
+
+    def relax(frontier, A):
+        # Update `d` with the improved path lengths from `frontier`, and return them
+        cur << min_plus(frontier @ A)
+        if cutoff is not None:
+            cur << select.valuele(cur, cutoff)
+        mask << one(cur)
+        mask(binary.second) << binary.lt(cur & d)
+        cur(mask.V, replace) << cur
+        d(cur.S) << cur
+        unsettled(cur.S) << cur
+        return cur
+
+    while unsettled.nvals > 0:
+        # The smallest unsettled path length begins the next bucket
+        lo = unsettled.reduce(monoid.min).get()
+        hi = np_type(lo + delta)
+        if hi <= lo:
+            # Rounding of large floats; settle only the smallest path lengths
+            hi = np.nextafter(np_type(lo), np.inf)
+        hi = Scalar.from_value(hi, dtype)
+        frontier << select.valuelt(unsettled, hi)
+        bucket.clear()
+        while frontier.nvals > 0:
+            bucket(frontier.S) << True
+            frontier << select.valuelt(relax(frontier, L), hi)
+        # Path lengths in the bucket are final, so relax its heavy edges once
+        unsettled(~bucket.S, replace) << unsettled
+        if H.nvals > 0:
+            frontier(bucket.S, replace) << d
+            relax(frontier, H)
+        if dst_id is not None and bucket.get(dst_id):
+            break
+    return d
+
+
+def _delta_stepping_rows(G, D):
+    """Delta-stepping from many sources at once; updates ``D`` inplace.
+
+    ``D`` has the initial path lengths from a source in each row.  All rows share the
+    buckets of ``_delta_stepping``, since the lengths from every source begin at 0.
+    Buckets are settled in increasing order, so lengths less than the end of the last
+    bucket are final, and we don't need to keep track of unsettled lengths separately.
+    No edge weights may be negative.
+    """
+    L, H, delta = G.get_properties("light_edges- heavy_edges- delta")
+    np_type = D.dtype.np_type.type
+    nrows, ncols = D.shape
+    Frontier = Matrix(D.dtype, nrows, ncols, name="Frontier")
+    Cur = Matrix(D.dtype, nrows, ncols, name="Cur")
+    Mask = Matrix(bool, nrows, ncols, name="Mask")
+    one = unary.one[bool]
+
+    def relax(Frontier, A):
+        # Update `D` with the improved path lengths from `Frontier`, and return them
+        Cur << min_plus(Frontier @ A)
+        Mask << one(Cur)
+        Mask(binary.second) << binary.lt(Cur & D)
+        Cur(Mask.V, replace) << Cur
+        D(Cur.S) << Cur
+        return Cur
+
+    Unsettled = D
+    while True:
+        lo = Unsettled.reduce_scalar(monoid.min).get()
+        if lo is None:
+            break
+        hi = np_type(lo + delta)
+        if hi <= lo:
+            hi = np.nextafter(np_type(lo), np.inf)
+        hi = Scalar.from_value(hi, D.dtype)
+        Frontier << select.valuelt(Unsettled, hi)
+        while Frontier.nvals > 0:
+            Frontier << select.valuelt(relax(Frontier, L), hi)
+        if H.nvals > 0:
+            # Path lengths in the bucket are final, so relax its heavy edges once
+            Frontier << select.valuelt(D, hi)
+            Frontier << select.valuege(Frontier, Scalar.from_value(lo, D.dtype))
+            relax(Frontier, H)
+        Unsettled = select.valuege(D, hi).new(name="Unsettled")
+    return D
+
+
 def single_source_bellman_ford_path_length(
     G, source, *, cutoff=None, name="single_source_bellman_ford_path_length"
 ):
@@ -115,6 +243,16 @@ def bellman_ford_path_length(G, source, target):
     return _bellman_ford_path_length(G, source, target, name="bellman_ford_path_length")
 
 
+def single_source_dijkstra_path_length(
+    G, source, *, cutoff=None, name="single_source_dijkstra_path_length"
+):
+    return _bellman_ford_path_length(G, source, cutoff=cutoff, name=name)
+
+
+def dijkstra_path_length(G, source, target):
+    return _bellman_ford_path_length(G, source, target, name="dijkstra_path_length")
+
+
 def bellman_ford_path_lengths(G, nodes=None, *, expand_output=False):
     """Extra parameter: expand_output
 
@@ -169,22 +307,25 @@ def bellman_ford_path_lengths(G, nodes=None, *, expand_output=False):
             ncols=n,
             name="bellman_ford_path_lengths",
         )
-    Cur = D.dup(name="Cur")
-    Mask = Matrix(bool, D.nrows, D.ncols, name="Mask")
-    one = unary.one[bool]
-    for _i in range(n - 1):
-        Cur << min_plus(Cur @ A)
-        Mask << one(Cur)
-        Mask(binary.second) << binary.lt(Cur & D)
-        Cur(Mask.V, replace) << Cur
-        if Cur.nvals == 0:
-            break
-        D(Cur.S) << Cur
+    if not G.get_property("has_negative_edges-"):
+        _delta_stepping_rows(G, D)
     else:
-        Cur << min_plus(Cur @ A)
-        Mask << binary.lt(Cur & D)
-        if Mask.reduce_scalar(monoid.lor):
-            raise Unbounded("Negative cycle detected.")
+        Cur = D.dup(name="Cur")
+        Mask = Matrix(bool, D.nrows, D.ncols, name="Mask")
+        one = unary.one[bool]
+        for _i in range(n - 1):
+            Cur << min_plus(Cur @ A)
+            Mask << one(Cur)
+            Mask(binary.second) << binary.lt(Cur & D)
+            Cur(Mask.V, replace) << Cur
+            if Cur.nvals == 0:
+                break
+            D(Cur.S) << Cur
+        else:
+            Cur << min_plus(Cur @ A)
+            Mask << binary.lt(Cur & D)
+            if Mask.reduce_scalar(monoid.lor):
+                raise Unbounded("Negative cycle detected.")
     if has_negative_diagonal:
         diag = G.get_property("diag")
         cur = select.valuelt(diag, 0)
@@ -197,6 +338,75 @@ def bellman_ford_path_lengths(G, nodes=None, *, expand_output=False):
     return D
 
 
+def _johnson_potentials(G):
+    """Path lengths from a new node with an edge of weight 0 to every node"""
+    A = G.get_property("offdiag")
+    if A.dtype == bool:
+        dtype = int
+    else:
+        dtype = A.dtype
+    n = A.nrows
+    h = Vector(dtype, n, name="johnson_potentials")
+    h << 0
+    cur = h.dup(name="cur")
+    mask = Vector(bool, n, name="mask")
+    # Paths from the new node have at most n edges, one of which is the first edge
+    for _i in range(n):
+        cur << min_plus(cur @ A)
+        mask << binary.lt(cur & h)
+        cur(mask.V, replace) << cur
+        if cur.nvals == 0:
+            break
+        h(cur.S) << cur
+    else:
+        raise Unbounded("Negative cycle detected.")
+    return h
+
+
+def _johnson_graph(G, h):
+    """The graph with reweighted edges, so properties such as "delta" are computed once"""
+    Gr = type(G)(_johnson_reweighted(G, h), key_to_id=G._key_to_id)
+    Gr._cache.update(
+        {"has_self_edges": False, "has_negative_diagonal": False, "has_negative_edges-": False}
+    )
+    return Gr
+
+
+def _johnson_reweighted(G, h):
+    """Non-negative weights ``A[u, v] + h[u] - h[v]`` that keep the same shortest paths"""
+    A = G.get_property("offdiag")
+    A = any_plus(h.diag() @ A).new(name="johnson_reweighted-")
+    A << any_plus(A @ unary.ainv(h).new().diag())
+    if A.dtype.np_type.kind == "f":
+        # Don't let rounding give negative weights
+        A << binary.max(A, 0)
+    return A
+
+
+def johnson_path_lengths(G, nodes=None):
+    """Shortest path lengths from ``nodes`` (default all nodes) by Johnson's algorithm.
+
+    Edges are reweighted to be non-negative once with potentials from a single run of
+    Bellman-Ford, and the potentials and the reweighted graph (with its own cached
+    properties) are cached.  Path lengths are then computed with delta-stepping and
+    the reweighting is undone, so computing lengths for a few sources at a time is
+    fast if weights may be negative.
+    """
+    h = G._cacheit("johnson_potentials", _johnson_potentials, G)
+    Gr = G._cacheit("johnson_graph", _johnson_graph, G, h)
+    D = bellman_ford_path_lengths(Gr, nodes)
+    D.name = "johnson_path_lengths"
+    # Undo the reweighting: d(u, v) = d'(u, v) - h[u] + h[v]
+    hsrc = h if nodes is None else h[G.list_to_ids(nodes)].new()
+    D << any_plus(D @ h.diag())
+    D << any_plus(unary.ainv(hsrc).new().diag() @ D)
+    if G.get_property("has_negative_diagonal"):
+        diag = G.get_property("diag")
+        if any_pair(D @ select.valuelt(diag, 0)).nvals > 0:
+            raise Unbounded("Negative cycle detected.")
+    return D
+
+
 def _reconstruct_path_from_parents(G, parents, src, dst):
     indices, values = parents.to_coo(sort=False)
     d = dict(zip(indices.tolist(), values.tolist(), strict=True))
@@ -213,6 +423,8 @@ def _reconstruct_path_from_parents(G, parents, src, dst):
 def bellman_ford_path(G, source, target):
     src_id = G._key_to_id[source]
     dst_id = G._key_to_id[target]
+    if src_id == dst_id:
+        return [source]
     if G.get_property("is_iso"):
         # If the edges are iso-valued (and positive), then we can simply do level BFS
         is_negative = G.get_property("has_negative_edges+")
@@ -237,10 +449,7 @@ def bellman_ford_path(G, source, target):
 
     prev = d.dup(name="prev")
     cur = Vector(dtype, n, name="cur")
-    indices = Vector(int, n, name="indices")
     mask = Vector(bool, n, name="mask")
-    B = Matrix(dtype, n, n, name="B")
-    Indices = Matrix(int, n, n, name="Indices")
     cols = prev.to_coo(values=False)[0]
     one = unary.one[bool]
     for _i in range(n - 1):
@@ -265,22 +474,17 @@ def bellman_ford_path(G, source, target):
             # Limit exploration if we have a target
             cutoff = cur.get(dst_id, cutoff)
 
-        # Now try to find the parents!
-        # This is also not standard. Typically, UDTs and UDFs are used to keep
-        # track of both the minimum element and the parent id at the same time.
-        # Only include rows and columns that were used this iteration.
+        # Now find the parents with a second pass (an argmin) over only the edges
+        # relaxed in this iteration: the parent of `j` is the smallest `i` in `prev`
+        # such that `prev[i] + A[i, j] == cur[j]`.
         rows = cols
         cols = cur.to_coo(values=False)[0]
-        B.clear()
-        B[rows, cols] = A[rows, cols]
-
-        # Reverse engineer to determine parent
-        B << binary.plus(prev & B)
-        B << binary.iseq(B & cur)
-        B << select.valuene(B, False)
-        Indices << indexunary.rowindex(B)
-        indices << Indices.reduce_columnwise(monoid.min)
-        p(indices.S) << indices
+        B = A[rows, cols].new(name="B")
+        B << any_plus(prev[rows].new().diag() @ B)
+        B << any_eq(B @ cur[cols].new().diag())
+        B << select.valueeq(B, True)
+        indices, values = indexunary.rowindex(B).new().reduce_columnwise(monoid.min).new().to_coo()
+        p[cols[indices]] = Vector.from_dense(rows[values])
         prev, cur = cur, prev
     else:
         # Check for negative cycle when for loop completes without breaking
@@ -288,7 +492,8 @@ def bellman_ford_path(G, source, target):
         if cutoff is not None:
             cur << select.valuele(cur, cutoff)
         mask << binary.lt(cur & d)
-        if mask.get(dst_id):
+        # Parents may form a cycle even if the negative cycle doesn't reach the target
+        if mask.reduce(monoid.lor):
             raise Unbounded("Negative cycle detected.")
     path = _reconstruct_path_from_parents(G, p, src_id, dst_id)
     if has_negative_diagonal and path:
@@ -1,6 +1,8 @@
 from graphblas import Vector, replace
 from graphblas.semiring import any_pair
 
+from .._bfs import _get_push_pull
+
 __all__ = [
     "bfs_layers",
     "descendants_at_distance",
@@ -13,15 +15,15 @@ def bfs_layers(G, sources):
     ids = G.list_to_ids(sources)
     if ids is None or len(ids) == 0:
         return
-    A = G.get_property("offdiag")
-    n = A.nrows
+    expand = _get_push_pull(G)
+    n = len(G)
     v = Vector(bool, size=n, name="bfs_layers")
     q = Vector.from_coo(ids, True, size=n, name="q")
     any_pair_bool = any_pair[bool]
     yield q.dup(name="bfs_layer_0")
     for i in range(1, n):
         v(q.S) << True
-        q(~v.S, replace) << any_pair_bool(q @ A)
+        q(~v.S, replace) << expand(any_pair_bool, q, v)
         if q.nvals == 0:
             return
         yield q.dup(name=f"bfs_layer_{i}")
@@ -29,8 +31,8 @@ def bfs_layers(G, sources):
 
 def descendants_at_distance(G, source, distance):
     index = G._key_to_id[source]
-    A = G.get_property("offdiag")
-    n = A.nrows
+    expand = _get_push_pull(G)
+    n = len(G)
     q = Vector(bool, size=n, name=f"descendants_at_distance_{distance}")
     q[index] = True
     if distance == 0:
@@ -39,7 +41,7 @@ def descendants_at_distance(G, source, distance):
     any_pair_bool = any_pair[bool]
     for _i in range(1, distance + 1):
         v(q.S) << True
-        q(~v.S, replace) << any_pair_bool(q @ A)
+        q(~v.S, replace) << expand(any_pair_bool, q, v)
         if q.nvals == 0:
             break
     return q
@@ -0,0 +1,19 @@
+from graphblas import monoid
+
+from .components import is_connected, is_strongly_connected
+from .shortest_paths.generic import _path_length_chunks
+
+__all__ = ["wiener_index"]
+
+
+def wiener_index(G, *, maxbytes=None):
+    if G.is_directed():
+        if not is_strongly_connected(G):
+            return float("inf")
+    elif not is_connected(G):
+        return float("inf")
+    total = 0
+    for _, D in _path_length_chunks(G, maxbytes=maxbytes):
+        total += D.reduce_scalar(monoid.plus).get(0)
+    # Each pair of nodes is counted twice in undirected graphs
+    return total if G.is_directed() else total / 2
@@ -1,2 +1,3 @@
+from ._caching import CachePolicy, CacheStats, PropertyStore
 from .digraph import *
 from .graph import *
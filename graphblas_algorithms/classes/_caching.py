@@ -1,9 +1,422 @@
-from graphblas import Scalar, dtypes, op
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from itertools import count
+from numbers import Number
+from pathlib import Path
+
+import numpy as np
+from graphblas import Matrix, Scalar, Vector, dtypes, op
 from graphblas.core import operator
 
+from .._utils import normalize_chunksize
+
 NONNEGATIVE_DTYPES = {dtypes.BOOL, dtypes.UINT8, dtypes.UINT16, dtypes.UINT32, dtypes.UINT64}
 
 
+class CachePolicy:
+    """Limit the memory used by the cached properties of a graph.
+
+    Only cached Matrix and Vector objects count towards the budget.  Each is charged
+    ``nvals * (itemsize + 8)`` bytes (one index per value), and objects cached under
+    several keys (such as ``"L-"`` and ``"L+"`` when there are no self-edges) are only
+    charged once.  The adjacency matrix of the graph is never charged or evicted.
+
+    When the budget is exceeded, entries are evicted using the GreedyDual algorithm:
+    each entry has a priority of ``L + cost`` set when it is used, where ``cost`` is the
+    time it took to compute and ``L`` is the priority of the most recently evicted entry.
+    This behaves like LRU when all entries are equally expensive, but lets expensive
+    entries such as ``"AT"`` outlive cheap reductions.  A single entry larger than the
+    budget is never cached.
+
+    Parameters
+    ----------
+    maxbytes : int or str, optional
+        The byte budget such as ``2**30`` or ``"1 GiB"``.  None means unbounded.
+    """
+
+    def __init__(self, maxbytes=None):
+        if isinstance(maxbytes, str):
+            maxbytes = normalize_chunksize(maxbytes)
+        elif maxbytes is not None:
+            if not isinstance(maxbytes, Number) or maxbytes < 0:
+                raise ValueError(f"maxbytes must be a non-negative number; got {maxbytes!r}")
+            maxbytes = int(maxbytes)
+        self.maxbytes = maxbytes
+
+    def __repr__(self):
+        return f"{type(self).__name__}(maxbytes={self.maxbytes!r})"
+
+    def sizeof(self, value):
+        """The number of bytes charged for caching ``value``"""
+        if not isinstance(value, (Matrix, Vector)):
+            return 0
+        nvals = value.nvals
+        itemsize = value.dtype.np_type.itemsize
+        if value.ss.is_iso:
+            return 8 * nvals + itemsize
+        return nvals * (itemsize + 8)
+
+
+class CacheStats:
+    """Record how the cached properties of a graph are used.
+
+    Enable with ``G.cache_stats = True``.  For each key requested with
+    ``G.get_property``, this records the number of hits (already cached) and misses,
+    the total seconds spent computing it, the bytes it uses, and how many times each
+    derivation path was taken, such as ``"offdiag (cached)"`` or ``"A"``.  Paths are
+    recorded by the reductions (e.g. "degrees-" or "min_element+") and by
+    ``G.get_properties`` when it derives degrees from the diagonal.
+    """
+
+    _fields = ("hits", "misses", "seconds", "nbytes", "paths")
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.report()!r})"
+
+    def __getstate__(self):
+        return self.report()
+
+    def __setstate__(self, state):
+        self._stats = state
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = {"hits": 0, "misses": 0, "seconds": 0.0, "nbytes": 0}
+            stats["paths"] = {}
+        return stats
+
+    def record_hit(self, key):
+        with self._lock:
+            self._get(key)["hits"] += 1
+
+    def record_miss(self, key, seconds, nbytes):
+        with self._lock:
+            stats = self._get(key)
+            stats["misses"] += 1
+            stats["seconds"] += seconds
+            stats["nbytes"] = nbytes
+
+    def record_path(self, key, path):
+        with self._lock:
+            paths = self._get(key)["paths"]
+            paths[path] = paths.get(path, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+    def report(self):
+        """Return stats as a dict such as ``{key: {"hits": 1, "misses": 1, ...}}``"""
+        with self._lock:
+            return {
+                key: {**stats, "paths": dict(stats["paths"])} for key, stats in self._stats.items()
+            }
+
+    def to_pandas(self):
+        """Return stats as a pandas DataFrame with one row per key (requires pandas)"""
+        import pandas as pd
+
+        return pd.DataFrame.from_dict(self.report(), orient="index", columns=self._fields)
+
+
+class PropertyCache(dict):
+    """The ``G._cache`` dict that tracks usage of entries so they may be evicted.
+
+    Eviction only happens in ``trim``, which ``G.get_property`` calls once no thread is
+    computing a property, so getters may freely read entries they just computed.
+
+    ``G.get_property`` holds ``lock(key)`` while computing ``key``, so threads that need
+    the same property wait for one thread to compute it.  A lock is shared by the "-"
+    and "+" variants of a property, which are computed from (and aliased to) each other.
+    """
+
+    def __init__(self, *args, policy=None, store=None, stats=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.policy = policy
+        self.store = store
+        self.stats = stats
+        self._priorities = {}  # GreedyDual priority of each key
+        self._costs = {}  # seconds it took to compute each key
+        self._last_used = {}  # tie-breaker so equal priorities are evicted in LRU order
+        self._ticks = count()
+        self._inflation = 0.0
+        self._depth = 0  # number of properties being computed by all threads
+        self._pending = {}  # {key: Future} of properties being computed by `G.warm`
+        self._lock = threading.RLock()
+        self._key_locks = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for attr in ["_ticks", "_depth", "_pending", "_lock", "_key_locks"]:
+            del state[attr]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._ticks = count(max(self._last_used.values(), default=-1) + 1)
+        self._depth = 0
+        self._pending = {}
+        self._lock = threading.RLock()
+        self._key_locks = {}
+
+    def lock(self, key):
+        """The lock to hold while computing ``key``"""
+        if key[-1] in {"-", "+"}:
+            key = key[:-1]
+        with self._lock:
+            if (lock := self._key_locks.get(key)) is None:
+                lock = self._key_locks[key] = threading.RLock()
+        return lock
+
+    def _enter(self):
+        with self._lock:
+            self._depth += 1
+
+    def _exit(self, base=None, keep=None):
+        with self._lock:
+            self._depth -= 1
+            self.trim(base, keep)
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self._touch(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._touch(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._forget(key)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def pop(self, key, *args):
+        self._forget(key)
+        return super().pop(key, *args)
+
+    def clear(self):
+        super().clear()
+        self._priorities.clear()
+        self._costs.clear()
+        self._last_used.clear()
+        self._inflation = 0.0
+
+    def _touch(self, key):
+        self._priorities[key] = self._inflation + self._costs.get(key, 0.0)
+        self._last_used[key] = next(self._ticks)
+
+    def _forget(self, key):
+        self._priorities.pop(key, None)
+        self._costs.pop(key, None)
+        self._last_used.pop(key, None)
+
+    def set_cost(self, key, seconds):
+        """Record how long it took to compute ``key``"""
+        self._costs[key] = seconds
+        self._priorities[key] = self._inflation + seconds
+
+    def _groups(self, base=None):
+        """Group keys that refer to the same object: ``{id: [value, keys]}``"""
+        groups = {}
+        for key, value in list(self.items()):
+            if value is base or not isinstance(value, (Matrix, Vector)):
+                continue
+            if (group := groups.get(id(value))) is None:
+                groups[id(value)] = [value, [key]]
+            else:
+                group[1].append(key)
+        return groups
+
+    def nbytes(self, base=None):
+        """Total bytes charged by the policy (excluding ``base``, the adjacency matrix)"""
+        sizeof = (self.policy or CachePolicy()).sizeof
+        return sum(sizeof(value) for value, _ in self._groups(base).values())
+
+    def trim(self, base=None, keep=None):
+        """Evict entries until the cache fits within the byte budget of the policy
+
+        The entry ``keep`` (the property that was just requested) is only evicted if it
+        is larger than the budget; the caller holds a reference to it anyway.
+        """
+        with self._lock:
+            if self._depth == 0 and self.policy is not None and self.policy.maxbytes is not None:
+                self._trim(base, keep)
+
+    def _trim(self, base, keep):
+        maxbytes = self.policy.maxbytes
+        sizeof = self.policy.sizeof
+        groups = {}
+        total = 0
+        for gid, (value, keys) in self._groups(base).items():
+            nbytes = sizeof(value)
+            if nbytes > maxbytes:
+                # Refuse to cache anything larger than the budget
+                for key in keys:
+                    del self[key]
+            elif nbytes > 0:
+                total += nbytes
+                if keep not in keys:
+                    groups[gid] = (nbytes, keys)
+        if total <= maxbytes:
+            return
+        priorities = self._priorities
+        last_used = self._last_used
+
+        def rank(gid):
+            keys = groups[gid][1]
+            return (
+                max(priorities.get(key, 0.0) for key in keys),
+                max(last_used.get(key, -1) for key in keys),
+            )
+
+        for gid in sorted(groups, key=rank):
+            nbytes, keys = groups[gid]
+            self._inflation = max(self._inflation, rank(gid)[0])
+            for key in keys:
+                del self[key]
+            total -= nbytes
+            if total <= maxbytes:
+                break
+
+
+class PropertyStore:
+    """Save the cached properties of graphs to a directory to reuse them in other processes.
+
+    Entries are keyed by the type of the graph and the fingerprint of its adjacency
+    matrix (see ``G.get_property("fingerprint")``), so any graph with the same data
+    may use them.  Once assigned with ``G.property_store = PropertyStore(directory)``,
+    missing properties are loaded from the store the first time they are requested
+    with ``G.get_property``.  Properties are saved with ``store.save(G)`` and when
+    ``G.get_properties`` returns.
+
+    Matrices and vectors are saved with SuiteSparse:GraphBLAS serialization, and other
+    values (Python numbers, bools, strings, and Scalars) are kept in ``index.json``.
+    Other objects are not saved.  The index of each graph is read once, so properties
+    saved by other processes later are not seen.
+
+    Parameters
+    ----------
+    directory : str or path-like
+        Where to save the properties.  Created if it doesn't exist.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._indexes = {}  # {fingerprint directory: {key: [kind, item]}}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({str(self.directory)!r})"
+
+    def _get_directory(self, G):
+        return self.directory / f"{type(G).__name__}-{G.get_property('fingerprint')}"
+
+    @staticmethod
+    def _read_index_file(path):
+        try:
+            return json.loads((path / "index.json").read_text())
+        except FileNotFoundError:
+            return {}
+
+    def _read_index(self, path):
+        index = self._indexes.get(path)
+        if index is None:
+            index = self._indexes[path] = self._read_index_file(path)
+        return index
+
+    def load(self, G, name):
+        """Load ``name`` (and keys that share its value) into ``G._cache`` if stored"""
+        path = self._get_directory(G)
+        index = self._read_index(path)
+        if name not in index:
+            return False
+        kind, item = index[name]
+        cache = G._cache
+        if kind == "value":
+            cache[name] = item
+            return True
+        if kind == "scalar":
+            dtype, value = item
+            cache[name] = Scalar(dtype) if value is None else Scalar.from_value(value, dtype)
+            return True
+        try:
+            data = np.frombuffer((path / item).read_bytes(), np.uint8)
+        except FileNotFoundError:
+            return False
+        cls = Matrix if kind == "matrix" else Vector
+        value = cls.ss.deserialize(data, name=name)
+        for key, (other_kind, other_item) in index.items():
+            if other_kind == kind and other_item == item and key not in cache:
+                cache[key] = value
+        return True
+
+    def save(self, G):
+        """Save the entries of ``G._cache`` that are not yet in the store"""
+        path = self._get_directory(G)
+        index = self._read_index(path)
+        cache = G._cache
+        new_entries = {}
+        filenames = {  # Save values cached under several keys once
+            id(cache[key]): item
+            for key, (kind, item) in index.items()
+            if kind in {"matrix", "vector"} and key in cache
+        }
+        for key, value in list(cache.items()):
+            if key in index or key == "fingerprint" or value is G._A:
+                continue
+            if isinstance(value, (Matrix, Vector)):
+                kind = "matrix" if isinstance(value, Matrix) else "vector"
+                if (filename := filenames.get(id(value))) is None:
+                    filename = f"{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}.bin"
+                    filenames[id(value)] = filename
+                    self._write(path / filename, value.ss.serialize().tobytes())
+                new_entries[key] = [kind, filename]
+            elif isinstance(value, Scalar):
+                new_entries[key] = ["scalar", [value.dtype.name, value.value]]
+            elif value is None or isinstance(value, (bool, Number, str)):
+                if isinstance(value, np.generic):
+                    value = value.item()
+                new_entries[key] = ["value", value]
+        if new_entries:
+            # Merge with what other processes may have saved
+            index = self._read_index_file(path)
+            index.update(new_entries)
+            self._indexes[path] = index
+            self._write(path / "index.json", json.dumps(index).encode())
+
+    @staticmethod
+    def _write(filepath, data):
+        # Write atomically so other processes never read partial files
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmpname = tempfile.mkstemp(dir=filepath.parent, suffix=".tmp")
+        tmppath = Path(tmpname)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            tmppath.replace(filepath)
+        except BaseException:
+            tmppath.unlink()
+            raise
+
+
+def _record_path(cache, key, path):
+    if cache.stats is not None:
+        cache.stats.record_path(key, path)
+
+
 def get_reduce_to_vector(key, opname, methodname):
     op_ = op.from_string(opname)
     op_, opclass = operator.find_opclass(op_)
@@ -16,9 +429,14 @@ def get_reduce_to_vector(key, opname, methodname):
                 if key in cache:
                     return cache[key].dup(mask=mask)
                 if cache.get("has_self_edges") is False and f"{keybase}+" in cache:
+                    _record_path(cache, key, f"{keybase}+ (cached)")
                     cache[key] = cache[f"{keybase}+"]
                     return cache[key].dup(mask=mask)
+                if methodname == "reduce_columnwise" and "offdiagT" in cache:
+                    _record_path(cache, key, "offdiagT (cached)")
+                    return cache["offdiagT"].reduce_rowwise(op_).new(mask=mask, name=key)
                 if "offdiag" in cache:
+                    _record_path(cache, key, "offdiag (cached)")
                     return getattr(cache["offdiag"], methodname)(op_).new(mask=mask, name=key)
                 if (
                     "L-" in cache
@@ -26,17 +444,25 @@ def get_reduce_to_vector(key, opname, methodname):
                     and opclass in {"BinaryOp", "Monoid"}
                     and G.get_property("has_self_edges")
                 ):
+                    _record_path(cache, key, "L- and U- (cached)")
                     return op_(
                         getattr(cache["L-"], methodname)(op_).new(mask=mask)
                         | getattr(cache["U-"], methodname)(op_).new(mask=mask)
                     ).new(name=key)
                 if not G.get_property("has_self_edges"):
+                    _record_path(cache, key, f"{keybase}+")
                     return G.get_property(f"{keybase}+", mask=mask)
+                _record_path(cache, key, "offdiag")
                 return getattr(G.get_property("offdiag"), methodname)(op_).new(mask=mask, name=key)
             if key not in cache:
                 if cache.get("has_self_edges") is False and f"{keybase}+" in cache:
+                    _record_path(cache, key, f"{keybase}+ (cached)")
                     cache[key] = cache[f"{keybase}+"]
+                elif methodname == "reduce_columnwise" and "offdiagT" in cache:
+                    _record_path(cache, key, "offdiagT (cached)")
+                    cache[key] = cache["offdiagT"].reduce_rowwise(op_).new(name=key)
                 elif "offdiag" in cache:
+                    _record_path(cache, key, "offdiag (cached)")
                     cache[key] = getattr(cache["offdiag"], methodname)(op_).new(name=key)
                 elif (
                     "L-" in cache
@@ -44,13 +470,16 @@ def get_reduce_to_vector(key, opname, methodname):
                     and opclass in {"BinaryOp", "Monoid"}
                     and G.get_property("has_self_edges")
                 ):
+                    _record_path(cache, key, "L- and U- (cached)")
                     cache[key] = op_(
                         getattr(cache["L-"], methodname)(op_)
                         | getattr(cache["U-"], methodname)(op_)
                     ).new(name=key)
                 elif not G.get_property("has_self_edges"):
+                    _record_path(cache, key, f"{keybase}+")
                     cache[key] = G.get_property(f"{keybase}+")
                 else:
+                    _record_path(cache, key, "offdiag")
                     cache[key] = getattr(G.get_property("offdiag"), methodname)(op_).new(name=key)
             if (
                 "has_self_edges" not in cache
@@ -71,17 +500,23 @@ def get_reduce_to_vector(key, opname, methodname):
                 if key in cache:
                     return cache[key].dup(mask=mask)
                 if cache.get("has_self_edges") is False and f"{keybase}-" in cache:
+                    _record_path(cache, key, f"{keybase}- (cached)")
                     cache[key] = cache[f"{keybase}-"]
                     return cache[key].dup(mask=mask)
                 if methodname == "reduce_columnwise" and "AT" in cache:
+                    _record_path(cache, key, "AT (cached)")
                     return cache["AT"].reduce_rowwise(op_).new(mask=mask, name=key)
+                _record_path(cache, key, "A")
                 return getattr(A, methodname)(op_).new(mask=mask, name=key)
             if key not in cache:
                 if cache.get("has_self_edges") is False and f"{keybase}-" in cache:
+                    _record_path(cache, key, f"{keybase}- (cached)")
                     cache[key] = cache[f"{keybase}-"]
                 elif methodname == "reduce_columnwise" and "AT" in cache:
+                    _record_path(cache, key, "AT (cached)")
                     cache[key] = cache["AT"].reduce_rowwise(op_).new(name=key)
                 else:
+                    _record_path(cache, key, "A")
                     cache[key] = getattr(A, methodname)(op_).new(name=key)
             if (
                 "has_self_edges" not in cache
@@ -106,16 +541,22 @@ def get_reduce_to_scalar(key, opname):
             cache = G._cache
             if key not in cache:
                 if cache.get("has_self_edges") is False and f"{keybase}+" in cache:
+                    _record_path(cache, key, f"{keybase}+ (cached)")
                     cache[key] = cache[f"{keybase}+"]
                 elif f"{opname}_rowwise-" in cache:
+                    _record_path(cache, key, f"{opname}_rowwise- (cached)")
                     cache[key] = cache[f"{opname}_rowwise-"].reduce(op_).new(name=key)
                 elif f"{opname}_columnwise-" in cache:
+                    _record_path(cache, key, f"{opname}_columnwise- (cached)")
                     cache[key] = cache[f"{opname}_columnwise-"].reduce(op_).new(name=key)
                 elif cache.get("has_self_edges") is False and f"{opname}_rowwise+" in cache:
+                    _record_path(cache, key, f"{opname}_rowwise+ (cached)")
                     cache[key] = cache[f"{opname}_rowwise+"].reduce(op_).new(name=key)
                 elif cache.get("has_self_edges") is False and f"{opname}_columnwise+" in cache:
+                    _record_path(cache, key, f"{opname}_columnwise+ (cached)")
                     cache[key] = cache[f"{opname}_columnwise+"].reduce(op_).new(name=key)
                 elif "offdiag" in cache:
+                    _record_path(cache, key, "offdiag (cached)")
                     cache[key] = cache["offdiag"].reduce_scalar(op_).new(name=key)
                 elif (
                     "L-" in cache
@@ -123,12 +564,15 @@ def get_reduce_to_scalar(key, opname):
                     and opclass in {"BinaryOp", "Monoid"}
                     and G.get_property("has_self_edges")
                 ):
+                    _record_path(cache, key, "L- and U- (cached)")
                     return op_(
                         cache["L-"].reduce(op_)._as_vector() | cache["U-"].reduce(op_)._as_vector()
                     )[0].new(name=key)
                 elif not G.get_property("has_self_edges"):
+                    _record_path(cache, key, f"{keybase}+")
                     cache[key] = G.get_property(f"{keybase}+")
                 else:
+                    _record_path(cache, key, "offdiag")
                     cache[key] = G.get_property("offdiag").reduce_scalar(op_).new(name=key)
             if (
                 "has_self_edges" not in cache
@@ -147,16 +591,22 @@ def get_reduce_to_scalar(key, opname):
             cache = G._cache
             if key not in cache:
                 if cache.get("has_self_edges") is False and f"{keybase}-" in cache:
+                    _record_path(cache, key, f"{keybase}- (cached)")
                     cache[key] = cache[f"{keybase}-"]
                 elif f"{opname}_rowwise+" in cache:
+                    _record_path(cache, key, f"{opname}_rowwise+ (cached)")
                     cache[key] = cache[f"{opname}_rowwise+"].reduce(op_).new(name=key)
                 elif f"{opname}_columnwise+" in cache:
+                    _record_path(cache, key, f"{opname}_columnwise+ (cached)")
                     cache[key] = cache[f"{opname}_columnwise+"].reduce(op_).new(name=key)
                 elif cache.get("has_self_edges") is False and f"{opname}_rowwise-" in cache:
+                    _record_path(cache, key, f"{opname}_rowwise- (cached)")
                     cache[key] = cache[f"{opname}_rowwise-"].reduce(op_).new(name=key)
                 elif cache.get("has_self_edges") is False and f"{opname}_columnwise-" in cache:
+                    _record_path(cache, key, f"{opname}_columnwise- (cached)")
                     cache[key] = cache[f"{opname}_columnwise-"].reduce(op_).new(name=key)
                 else:
+                    _record_path(cache, key, "A")
                     cache[key] = A.reduce_scalar(op_).new(name=key)
             if (
                 "has_self_edges" not in cache
@@ -175,8 +625,10 @@ def get_reduce_to_scalar(key, opname):
             cache = G._cache
             if key not in cache:
                 if not G.get_property("has_self_edges"):
+                    _record_path(cache, key, "no self-edges")
                     cache[key] = Scalar(op_[A.dtype].return_type, name=key)
                 else:
+                    _record_path(cache, key, "diag")
                     cache[key] = G.get_property("diag").reduce(op_).new(name=key)
             return cache[key]
 
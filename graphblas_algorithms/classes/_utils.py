@@ -1,8 +1,15 @@
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+
 import graphblas as gb
 import numpy as np
-from graphblas import Matrix, Vector, binary
+from graphblas import Matrix, Vector, binary, select
 from graphblas.core.matrix import TransposedMatrix
 
+from ._caching import CachePolicy, CacheStats, PropertyStore
+
 ################
 # Classmethods #
 ################
@@ -35,26 +42,248 @@ def id_to_key(self):
 
 
 def get_property(self, name, *, mask=None):
-    return self._get_property[self._cache_aliases.get(name, name)](self, mask)
+    name = self._cache_aliases.get(name, name)
+    cache = self._cache
+    future = cache._pending.get(name)
+    if future is not None and not future.done() and not getattr(_warming, "active", False):
+        # Wait for `G.warm` to finish computing it, and raise if that failed
+        future.result()
+    cache._enter()
+    try:
+        # Only one thread computes a property; others wait for it
+        with cache.lock(name):
+            is_new = name not in cache
+            if is_new and cache.store is not None and name != "fingerprint":
+                is_new = not cache.store.load(self, name)
+                if not is_new and cache.stats is not None:
+                    cache.stats.record_path(name, "store")
+            start = perf_counter()
+            rv = self._get_property[name](self, mask)
+            seconds = perf_counter() - start
+            if is_new and name in cache:
+                cache.set_cost(name, seconds)
+        if cache.stats is not None:
+            if is_new:
+                nbytes = (cache.policy or CachePolicy()).sizeof(cache.get(name))
+                cache.stats.record_miss(name, seconds, nbytes)
+            else:
+                cache.stats.record_hit(name)
+    finally:
+        cache._exit(self._A, name)
+    return rv
 
 
-def get_properties(self, names, *, mask=None):
+def _get_names(self, names):
     if isinstance(names, str):
         # Separated by commas and/or spaces
-        names = [
+        return [
             self._cache_aliases.get(name, name)
             for name in names.replace(" ", ",").split(",")
             if name
         ]
-    else:
-        names = [self._cache_aliases.get(name, name) for name in names]
-    results = {
-        name: self._get_property[name](self, mask)
-        for name in sorted(names, key=self._property_priority.__getitem__)
-    }
+    return [self._cache_aliases.get(name, name) for name in names]
+
+
+def get_properties(self, names, *, mask=None):
+    names = _get_names(self, names)
+    cache = self._cache
+    # Don't evict anything until all the properties have been computed
+    cache._enter()
+    try:
+        _get_diag_first(self, names, mask=mask)
+        results = {
+            name: self.get_property(name, mask=mask)
+            for name in sorted(names, key=self._property_priority.__getitem__)
+        }
+        if cache.store is not None and cache._depth == 1:
+            cache.store.save(self)
+    finally:
+        cache._exit(self._A)
     return [results[name] for name in names]
 
 
+_warming = threading.local()  # Set in threads computing properties for `G.warm`
+
+
+@functools.cache
+def _get_warm_executor():
+    """The thread pool shared by all graphs for `G.warm`"""
+    return ThreadPoolExecutor(thread_name_prefix="graphblas_algorithms.warm")
+
+
+def warm(self, names, *, executor=None):
+    """Compute properties in background threads so they are ready when needed.
+
+    SuiteSparse:GraphBLAS releases the GIL, so the caller may do other work (such as
+    I/O) while e.g. "AT" is computed.  Each property is submitted to ``executor`` as
+    its own task in priority order, so independent properties such as "AT" and "L-"
+    may be computed at the same time.  ``G.get_property`` of a property that is being
+    warmed waits for it to finish.
+
+    Parameters
+    ----------
+    names : str or list of str
+        Properties to compute, such as ``"AT L- U- degrees-"``.
+    executor : concurrent.futures.Executor, optional
+        Where to run; by default, a thread pool shared by all graphs.
+
+    Returns
+    -------
+    concurrent.futures.Future
+        Resolves to the list of computed properties, or raises the first error.
+    """
+    names = _get_names(self, names)
+    cache = self._cache
+    pending = cache._pending
+    if executor is None:
+        executor = _get_warm_executor()
+    futures = {}  # {name: Future} of properties being warmed
+    new_futures = {}  # Those warmed by this call
+    for name in sorted(set(names), key=self._property_priority.__getitem__):
+        if (future := pending.get(name)) is None and name not in cache:
+            future = new_futures[name] = pending[name] = Future()
+        if future is not None:
+            futures[name] = future
+
+    def compute(name, future):
+        if not future.set_running_or_notify_cancel():
+            return
+        _warming.active = True
+        try:
+            result = self.get_property(name)
+        except BaseException as exc:
+            del pending[name]
+            future.set_exception(exc)
+        else:
+            del pending[name]
+            future.set_result(result)
+        finally:
+            _warming.active = False
+
+    rv = Future()
+    rv.set_running_or_notify_cancel()
+    remaining = len(futures) + 1  # Don't finish until every task is submitted
+    lock = threading.Lock()
+
+    def finish(_future=None):
+        nonlocal remaining
+        with lock:
+            remaining -= 1
+            if remaining > 0:
+                return
+        try:
+            results = [
+                futures[name].result() if name in futures else self.get_property(name)
+                for name in names
+            ]
+        except BaseException as exc:
+            rv.set_exception(exc)
+        else:
+            rv.set_result(results)
+
+    for future in futures.values():
+        future.add_done_callback(finish)
+    submitted = 0
+    try:
+        for name, future in new_futures.items():
+            executor.submit(compute, name, future)
+            submitted += 1
+    except BaseException as exc:
+        for name, future in list(new_futures.items())[submitted:]:
+            del pending[name]
+            future.set_exception(exc)
+    finish()
+    return rv
+
+
+# Properties that only depend on the structure of A
+_STRUCTURAL_PROPERTIES = {
+    "offdiag",
+    "U+",
+    "L+",
+    "U-",
+    "L-",
+    "diag",
+    "count_rowwise+",
+    "count_rowwise-",
+    "count_columnwise+",
+    "count_columnwise-",
+}
+
+
+def _get_diag_first(self, names, *, mask=None):
+    """Get the diagonal before other structural properties, and derive degrees from it.
+
+    This does not fuse the passes over A: "offdiag", "L-", and "U-" are still each
+    computed by their own select.  When several structural properties are requested,
+    getting the (cheap) diagonal first tells us whether A has self-edges.  Without
+    self-edges, offdiag is A and "-" properties are the same as "+" properties, so the
+    getters do less work.  With self-edges, degrees that ignore self-edges are the row
+    (or column) counts of A--which SuiteSparse gets from the structure for free--less
+    one where there is a diagonal entry, instead of reductions of ``select.offdiag(A)``.
+    The remaining properties are computed by the getters in priority order.
+
+    Splitting A into L-, U-, offdiag, and diag with one pass over its exported CSR
+    arrays, or selecting L- and U- from offdiag, was slower than separate selects.
+    """
+    cache = self._cache
+    todo = {name for name in names if name in _STRUCTURAL_PROPERTIES and name not in cache}
+    if mask is not None:
+        # Masked degrees are not cached
+        todo = {name for name in todo if not name.startswith("count_")}
+    if len(todo) < 2 or cache.get("has_self_edges") is False:
+        return
+    degrees = {name for name in todo if name.startswith("count_") and name[-1] == "-"}
+    wanted = todo | cache.keys()
+    if "offdiag" in wanted or ("L-" in wanted and "U-" in wanted):
+        # The getters will reduce these from offdiag or from L- and U-
+        degrees.clear()
+    if not degrees and "offdiag" not in todo:
+        return
+    diag = self.get_property("diag")
+    if not cache["has_self_edges"]:
+        return
+    for name in degrees:
+        if cache.stats is not None:
+            cache.stats.record_path(name, f"{name[:-1]}+ and diag")
+        rv = self.get_property(f"{name[:-1]}+").dup(name=name)
+        rv(mask=diag.S, accum=binary.minus)[...] << 1
+        cache[name] = select.valuene(rv).new(name=name)
+
+
+def get_cache_policy(self):
+    return self._cache.policy
+
+
+def set_cache_policy(self, policy):
+    if policy is not None and not isinstance(policy, CachePolicy):
+        policy = CachePolicy(policy)
+    self._cache.policy = policy
+    self._cache.trim(self._A)
+
+
+def get_property_store(self):
+    return self._cache.store
+
+
+def set_property_store(self, store):
+    if store is not None and not isinstance(store, PropertyStore):
+        store = PropertyStore(store)
+    self._cache.store = store
+
+
+def get_cache_stats(self):
+    return self._cache.stats
+
+
+def set_cache_stats(self, stats):
+    if stats is True:
+        stats = CacheStats()
+    elif stats is False:
+        stats = None
+    self._cache.stats = stats
+
+
 def dict_to_vector(self, d, *, size=None, dtype=None, name=None):
     if d is None:
         return None
@@ -158,6 +387,21 @@ def vector_to_set(self, v):
     return {id_to_key[index] for index in indices}
 
 
+def vector_to_components(self, labels):
+    """Yield sets of nodes that have the same label, in order of their first node"""
+    id_to_key = self.id_to_key
+    indices, values = labels.to_coo(sort=True)
+    if indices.size == 0:
+        return
+    order = np.argsort(values, kind="stable")
+    values = values[order]
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    # Order components by their first node (labels need not be node indices)
+    groups = np.split(indices[order], starts[1:])
+    for group in sorted(groups, key=lambda group: group[0]):
+        yield {id_to_key[index] for index in group.tolist()}
+
+
 def matrix_to_nodenodemap(self, A, *, fill_value=None, values_are_keys=False):
     from .nodemap import NodeNodeMap
 
@@ -250,9 +494,51 @@ def to_networkx(self, edge_attribute="weight"):
 
 
 def _cacheit(self, key, func, *args, **kwargs):
-    if key not in self._cache:
-        self._cache[key] = func(*args, **kwargs)
-    return self._cache[key]
+    cache = self._cache
+    with cache.lock(key):
+        if key not in cache:
+            cache[key] = rv = func(*args, **kwargs)
+        else:
+            rv = cache[key]
+    return rv
+
+
+def subgraph(self, nodes, *, name=None):
+    """The subgraph induced on `nodes` as a new graph (not a view).
+
+    Nodes not in the graph are ignored, and nodes keep the order they have in the graph.
+    """
+    key_to_id = self._key_to_id
+    indices = sorted({key_to_id[key] for key in nodes if key in key_to_id})
+    return self._subgraph(np.array(indices, np.uint64), name=name)
+
+
+def _subgraph(self, indices, *, name=None):
+    """The subgraph induced on sorted node ids `indices`, which reuses cached properties"""
+    A = self._A[indices, indices].new(name=name)
+    rv = type(self)(A, key_to_id=self.renumber_key_to_id(indices.tolist()))
+    cache = self._cache
+    new_cache = rv._cache
+    new_cache.policy = cache.policy
+    new_cache.store = cache.store
+    if "AT" in cache and cache["AT"] is not self._A:
+        # Extracting from AT is cheaper than another transpose
+        new_cache["AT"] = cache["AT"][indices, indices].new(name="AT")
+    if "diag" in cache:
+        diag = cache["diag"][indices].new(name="diag")
+        new_cache["diag"] = diag
+        new_cache["has_self_edges"] = diag.nvals > 0
+    elif cache.get("has_self_edges") is False:
+        new_cache["has_self_edges"] = False
+    if cache.get("is_iso") and A.nvals > 0:
+        new_cache["is_iso"] = True
+        if "iso_value" in cache:
+            new_cache["iso_value"] = cache["iso_value"]
+    # Removing edges can't add negative values
+    for key in ["has_negative_diagonal", "has_negative_edges-", "has_negative_edges+"]:
+        if cache.get(key) is False:
+            new_cache[key] = False
+    return rv
 
 
 def renumber_key_to_id(self, indices):
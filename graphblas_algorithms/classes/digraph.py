@@ -2,17 +2,21 @@ from collections import defaultdict
 from copy import deepcopy
 
 import graphblas as gb
-from graphblas import Matrix, binary, replace, select, unary
+from graphblas import Matrix, Scalar, Vector, binary, replace, select, unary
 
 import graphblas_algorithms as ga
 
 from . import _utils
-from ._caching import get_reduce_to_scalar, get_reduce_to_vector
+from ._caching import PropertyCache, get_reduce_to_scalar, get_reduce_to_vector
 from .graph import (
     Graph,
     get_A,
+    get_delta,
     get_diag,
+    get_fingerprint,
+    get_heavy_edges,
     get_iso_value,
+    get_light_edges,
     get_offdiag,
     has_negative_diagonal,
     has_negative_edgesm,
@@ -26,10 +30,32 @@ def get_AT(G, mask=None):
     A = G._A
     cache = G._cache
     if "AT" not in cache:
-        cache["AT"] = A.T.new()
+        if cache.get("has_self_edges") is False and "offdiagT" in cache:
+            cache["AT"] = cache["offdiagT"]
+        else:
+            cache["AT"] = A.T.new()
     return cache["AT"]
 
 
+def get_offdiagT(G, mask=None):
+    """select.offdiag(A.T)"""
+    cache = G._cache
+    if "offdiagT" not in cache:
+        if cache.get("has_self_edges") is False and "AT" in cache:
+            cache["offdiagT"] = cache["AT"]
+        elif "AT" in cache:
+            cache["offdiagT"] = select.offdiag(cache["AT"]).new(name="offdiagT")
+            if "has_self_edges" not in cache:
+                cache["has_self_edges"] = cache["AT"].nvals > cache["offdiagT"].nvals
+            if not cache["has_self_edges"]:
+                cache["offdiagT"] = cache["AT"]
+        else:
+            cache["offdiagT"] = G.get_property("offdiag").T.new(name="offdiagT")
+    if cache.get("has_self_edges") is False and "AT" not in cache:
+        cache["AT"] = cache["offdiagT"]
+    return cache["offdiagT"]
+
+
 def get_Up(G, mask=None):
     """select.triu(A)"""
     A = G._A
@@ -371,6 +397,102 @@ def has_self_edges(G, mask=None):
     return cache["has_self_edges"]
 
 
+def _copy_reversed_cache(G, rv, *, copy=True):
+    """Copy cached properties of G that are also valid for ``rv = G.reverse()``
+
+    If ``copy`` is True, Matrix, Vector, and Scalar values are copied (once each, so values
+    cached under several keys stay shared), otherwise they are shared with G.
+    """
+    cache = G._cache
+    new_cache = rv._cache
+    new_cache.policy = cache.policy
+    new_cache.store = cache.store
+    copies = {id(G._A): G._A.dup() if copy else G._A}
+    if "AT" in cache:
+        copies[id(cache["AT"])] = rv._A
+
+    def get_copy(val):
+        if not copy or not isinstance(val, (Matrix, Vector, Scalar)):
+            return val
+        if (new_val := copies.get(id(val))) is None:
+            new_val = copies[id(val)] = val.dup()
+        return new_val
+
+    new_cache["AT"] = copies[id(G._A)]
+    if "offdiag" in cache:
+        new_cache["offdiagT"] = get_copy(cache["offdiag"])
+    if "offdiagT" in cache:
+        new_cache["offdiag"] = get_copy(cache["offdiagT"])
+    for key, val in list(cache.items()):
+        if "_rowwise" in key:
+            # Row and column reductions swap
+            new_cache[key.replace("_rowwise", "_columnwise")] = get_copy(val)
+        elif "_columnwise" in key:
+            new_cache[key.replace("_columnwise", "_rowwise")] = get_copy(val)
+        elif (
+            key in _REVERSIBLE_PROPERTIES
+            or key.endswith("_diagonal")
+            or key[:-1].endswith("_element")
+        ):
+            new_cache[key] = get_copy(val)
+
+
+# Properties that are the same for the reverse graph
+_REVERSIBLE_PROPERTIES = {
+    "delta",
+    "diag",
+    "has_self_edges",
+    "is_iso",
+    "iso_value",
+    "has_negative_diagonal",
+    "has_negative_edges+",
+    "has_negative_edges-",
+    "recip_degrees+",
+    "recip_degrees-",
+    "total_degrees+",
+    "total_degrees-",
+    "total_recip+",
+    "total_recip-",
+}
+
+
+def _copy_undirected_cache(G, rv, reciprocal):
+    """Copy or derive cached properties of G that are valid for ``rv = G.to_undirected()``"""
+    cache = G._cache
+    new_cache = rv._cache
+    new_cache.policy = cache.policy
+    new_cache.store = cache.store
+    # The diagonal is unchanged
+    for key, val in list(cache.items()):
+        if key in {"diag", "has_self_edges", "has_negative_diagonal"} or key.endswith("_diagonal"):
+            new_cache[key] = val
+    if cache.get("is_iso") and rv._A.nvals > 0:
+        new_cache["is_iso"] = True
+        if "iso_value" in cache:
+            new_cache["iso_value"] = cache["iso_value"]
+    for suffix in "-+":
+        if not reciprocal:
+            # A | A.T has the same values as A
+            for key in [
+                f"has_negative_edges{suffix}",
+                f"min_element{suffix}",
+                f"max_element{suffix}",
+            ]:
+                if key in cache:
+                    new_cache[key] = cache[key]
+        elif cache.get(f"has_negative_edges{suffix}") is False:
+            new_cache[f"has_negative_edges{suffix}"] = False
+        # Degrees of A & A.T are reciprocal degrees, and A | A.T has the rest
+        if f"recip_degrees{suffix}" not in cache:
+            continue
+        if reciprocal:
+            new_cache[f"count_rowwise{suffix}"] = cache[f"recip_degrees{suffix}"]
+        elif f"total_degrees{suffix}" in cache:
+            new_cache[f"count_rowwise{suffix}"] = binary.minus(
+                cache[f"total_degrees{suffix}"] | cache[f"recip_degrees{suffix}"]
+            ).new(name=f"count_rowwise{suffix}")
+
+
 def to_directed_graph(G, weight=None, dtype=None):
     # We should do some sanity checks here to ensure we're returning a valid directed graph
     if isinstance(G, DiGraph):
@@ -456,6 +578,7 @@ class DiGraph(Graph):
                     "A",
                     "AT",
                     "offdiag",
+                    "offdiagT",
                     "U+",
                     "L+",
                     "U-",
@@ -487,6 +610,7 @@ class DiGraph(Graph):
             "A": get_A,
             "AT": get_AT,
             "offdiag": get_offdiag,
+            "offdiagT": get_offdiagT,
             "U+": get_Up,
             "L+": get_Lp,
             "U-": get_Um,
@@ -500,6 +624,10 @@ class DiGraph(Graph):
             "total_recip-": get_total_recipm,
             "is_iso": is_iso,
             "iso_value": get_iso_value,
+            "fingerprint": get_fingerprint,
+            "delta": get_delta,
+            "light_edges-": get_light_edges,
+            "heavy_edges-": get_heavy_edges,
             "has_negative_diagonal": has_negative_diagonal,
             "has_negative_edges-": has_negative_edgesm,
             "has_negative_edges+": has_negative_edgesp,
@@ -532,13 +660,17 @@ class DiGraph(Graph):
             key_to_id = {i: i for i in range(A.nrows)}
         self._key_to_id = key_to_id
         self._id_to_key = None
-        self._cache = {}
+        self._cache = PropertyCache()
 
     # Graphblas-specific methods
     from_networkx = classmethod(_utils.from_networkx)
     id_to_key = property(_utils.id_to_key)
+    cache_policy = property(_utils.get_cache_policy, _utils.set_cache_policy)
+    property_store = property(_utils.get_property_store, _utils.set_property_store)
+    cache_stats = property(_utils.get_cache_stats, _utils.set_cache_stats)
     get_property = _utils.get_property
     get_properties = _utils.get_properties
+    warm = _utils.warm
     dict_to_vector = _utils.dict_to_vector
     list_to_vector = _utils.list_to_vector
     list_to_mask = _utils.list_to_mask
@@ -554,8 +686,11 @@ class DiGraph(Graph):
     vector_to_nodemap = _utils.vector_to_nodemap
     vector_to_nodeset = _utils.vector_to_nodeset
     vector_to_set = _utils.vector_to_set
+    vector_to_components = _utils.vector_to_components
     _cacheit = _utils._cacheit
     renumber_key_to_id = _utils.renumber_key_to_id
+    subgraph = _utils.subgraph
+    _subgraph = _utils._subgraph
 
     # NetworkX methods
     def to_directed_class(self):
@@ -605,19 +740,28 @@ class DiGraph(Graph):
         if as_view:
             raise NotImplementedError("`as_vew=True` is not implemented in `G.to_undirected`")
         A = self._A
+        AT = self._cache.get("AT", A.T)
         if reciprocal:
-            B = binary.any(A & A.T).new(name=name)
+            B = binary.any(A & AT).new(name=name)
         else:
-            B = binary.any(A | A.T).new(name=name)
-        return Graph(B, key_to_id=self._key_to_id)
+            B = binary.any(A | AT).new(name=name)
+        rv = Graph(B, key_to_id=self._key_to_id)
+        _copy_undirected_cache(self, rv, reciprocal)
+        return rv
 
     def reverse(self, copy=True):
-        # We could even reuse many of the cached values
-        A = self._A.T  # This probably mostly works, but does not yet support assignment
-        if copy:
-            A = A.new()
+        if "AT" in self._cache:
+            A = self._cache["AT"]
+            if copy:
+                # Don't share a Matrix between this graph's cache and the new graph
+                A = A.dup()
+        else:
+            A = self._A.T  # This probably mostly works, but does not yet support assignment
+            if copy:
+                A = A.new()
         rv = type(self)(A, key_to_id=self._key_to_id)
         rv.graph.update(deepcopy(self.graph))
+        _copy_reversed_cache(self, rv, copy=copy)
         return rv
 
 
@@ -1,12 +1,19 @@
+import hashlib
 from collections import defaultdict
 
 import graphblas as gb
-from graphblas import Matrix, Vector, select
+import numpy as np
+from graphblas import Matrix, Scalar, Vector, dtypes, select
 
 import graphblas_algorithms as ga
 
 from . import _utils
-from ._caching import NONNEGATIVE_DTYPES, get_reduce_to_scalar, get_reduce_to_vector
+from ._caching import (
+    NONNEGATIVE_DTYPES,
+    PropertyCache,
+    get_reduce_to_scalar,
+    get_reduce_to_vector,
+)
 
 
 def get_A(G, mask=None):
@@ -37,6 +44,14 @@ def get_offdiag(G, mask=None):
     return cache["offdiag"]
 
 
+def get_offdiagT(G, mask=None):
+    """select.offdiag(A).T"""
+    cache = G._cache
+    if "offdiagT" not in cache:
+        cache["offdiagT"] = G.get_property("offdiag")
+    return cache["offdiagT"]
+
+
 def get_Up(G, mask=None):
     """select.triu(A)"""
     A = G._A
@@ -249,6 +264,83 @@ def get_iso_value(G, mask=None):
     return cache["iso_value"]
 
 
+def get_fingerprint(G, mask=None):
+    """Hash of the shape, dtype, and values of A"""
+    cache = G._cache
+    if "fingerprint" not in cache:
+        A = G._A
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{A.nrows},{A.ncols},{A.nvals},{A.dtype.name}".encode())
+        # SuiteSparse:GraphBLAS
+        info = A.ss.export("csr", sort=True)
+        h.update(b"iso" if info["is_iso"] else b"noniso")
+        for key in ["indptr", "col_indices", "values"]:
+            h.update(np.ascontiguousarray(info[key]).data)
+        cache["fingerprint"] = h.hexdigest()
+    return cache["fingerprint"]
+
+
+def get_delta(G, mask=None):
+    """Bucket width for delta-stepping: the average weight times the average degree
+
+    Meyer and Sanders suggest the largest weight divided by the average degree, but
+    each bucket costs a few GraphBLAS calls however small it is, so fewer and larger
+    buckets are faster in practice.
+    """
+    cache = G._cache
+    if "delta" not in cache:
+        A = G.get_property("offdiag")
+        if A.nvals == 0:
+            delta = 1
+        elif A.dtype == bool:
+            # The plus monoid isn't defined for BOOL, so count True as 1 like Bellman-Ford
+            delta = A.dup(dtype=dtypes.INT64).reduce_scalar().get(0) / A.nrows
+        else:
+            delta = G.get_property("plus_element-").get(0) / A.nrows
+        if A.dtype == bool or np.issubdtype(A.dtype.np_type, np.integer):
+            delta = max(1, int(delta))
+        elif not delta > 0:
+            delta = 1.0
+        cache["delta"] = delta
+    return cache["delta"]
+
+
+def get_light_edges(G, mask=None):
+    """select.valuele(offdiag, delta)"""
+    cache = G._cache
+    if "light_edges-" not in cache:
+        A, delta = G.get_properties("offdiag delta")
+        if A.dtype == bool:
+            A = A.dup(dtype=dtypes.INT64)
+        cache["light_edges-"] = select.valuele(A, Scalar.from_value(delta, A.dtype)).new(
+            name="light_edges-"
+        )
+    return cache["light_edges-"]
+
+
+def get_heavy_edges(G, mask=None):
+    """select.valuegt(offdiag, delta)"""
+    cache = G._cache
+    if "heavy_edges-" not in cache:
+        A, delta = G.get_properties("offdiag delta")
+        if A.dtype == bool:
+            A = A.dup(dtype=dtypes.INT64)
+        cache["heavy_edges-"] = select.valuegt(A, Scalar.from_value(delta, A.dtype)).new(
+            name="heavy_edges-"
+        )
+    return cache["heavy_edges-"]
+
+
+def get_degree_order(G, mask=None):
+    """Node ids sorted by degree ignoring self-edges (smallest first; ties by id)"""
+    cache = G._cache
+    if "degree_order" not in cache:
+        degrees = G.get_property("degrees-").to_dense(fill_value=0)
+        order = np.argsort(degrees, kind="stable").astype(np.uint64)
+        cache["degree_order"] = Vector.from_dense(order, name="degree_order")
+    return cache["degree_order"]
+
+
 def to_undirected_graph(G, weight=None, dtype=None):
     # We should do some sanity checks here to ensure we're returning a valid undirected graph
     if isinstance(G, Graph):
@@ -315,6 +407,7 @@ class Graph:
                     "A",
                     "AT",
                     "offdiag",
+                    "offdiagT",
                     "U+",
                     "L+",
                     "U-",
@@ -338,6 +431,7 @@ class Graph:
             "A": get_A,
             "AT": get_AT,
             "offdiag": get_offdiag,
+            "offdiagT": get_offdiagT,
             "U+": get_Up,
             "L+": get_Lp,
             "U-": get_Um,
@@ -345,6 +439,11 @@ class Graph:
             "diag": get_diag,
             "is_iso": is_iso,
             "iso_value": get_iso_value,
+            "fingerprint": get_fingerprint,
+            "delta": get_delta,
+            "light_edges-": get_light_edges,
+            "heavy_edges-": get_heavy_edges,
+            "degree_order": get_degree_order,
             "has_negative_diagonal": has_negative_diagonal,
             "has_negative_edges-": has_negative_edgesm,
             "has_negative_edges+": has_negative_edgesp,
@@ -379,13 +478,17 @@ class Graph:
             key_to_id = {i: i for i in range(A.nrows)}
         self._key_to_id = key_to_id
         self._id_to_key = None
-        self._cache = {}
+        self._cache = PropertyCache()
 
     # Graphblas-specific methods
     from_networkx = classmethod(_utils.from_networkx)
     id_to_key = property(_utils.id_to_key)
+    cache_policy = property(_utils.get_cache_policy, _utils.set_cache_policy)
+    property_store = property(_utils.get_property_store, _utils.set_property_store)
+    cache_stats = property(_utils.get_cache_stats, _utils.set_cache_stats)
     get_property = _utils.get_property
     get_properties = _utils.get_properties
+    warm = _utils.warm
     dict_to_vector = _utils.dict_to_vector
     list_to_vector = _utils.list_to_vector
     list_to_mask = _utils.list_to_mask
@@ -401,8 +504,11 @@ class Graph:
     vector_to_nodemap = _utils.vector_to_nodemap
     vector_to_nodeset = _utils.vector_to_nodeset
     vector_to_set = _utils.vector_to_set
+    vector_to_components = _utils.vector_to_components
     _cacheit = _utils._cacheit
     renumber_key_to_id = _utils.renumber_key_to_id
+    subgraph = _utils.subgraph
+    _subgraph = _utils._subgraph
 
     # NetworkX methods
     def to_directed_class(self):
@@ -87,6 +87,10 @@ class NodeMap(MutableMapping):
         self.vector.clear()
         self._fill_value = None
 
+    def copy(self):
+        # Return a dict, since keys that are not nodes can't be added to a NodeMap
+        return dict(self)
+
     def get(self, key, default=None):
         idx = self._key_to_id[key]
         rv = self.vector.get(idx)
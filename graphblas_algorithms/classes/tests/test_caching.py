@@ -0,0 +1,321 @@
+import copy
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import graphblas as gb
+import networkx as nx
+import pytest
+
+import graphblas_algorithms as ga
+from graphblas_algorithms.classes import graph
+from graphblas_algorithms.classes._caching import CachePolicy, PropertyCache
+
+
+def test_cache_policy_budget():
+    G = ga.Graph.from_networkx(nx.karate_club_graph())
+    expected = ga.triangles(G)
+    G.cache_policy = "2 KiB"
+    assert G.cache_policy.maxbytes == 2048
+    assert G._cache.nbytes(G._A) <= 2048
+    result = ga.triangles(G)
+    assert result.isequal(expected)
+    assert G._cache.nbytes(G._A) <= 2048
+    # Budget too small for any matrix
+    G.cache_policy = 100
+    assert G._cache.nbytes(G._A) <= 100
+    assert "L-" not in G._cache
+    assert "U-" not in G._cache
+    result = ga.triangles(G)
+    assert result.isequal(expected)
+    assert "L-" not in G._cache
+    assert G._cache["has_self_edges"] is False
+    # Unbounded
+    G.cache_policy = None
+    G.get_properties("L- U-")
+    assert G._cache["L-"] is G._cache["L+"]
+    assert G._cache["U-"] is G._cache["U+"]
+
+
+def test_cache_aliases_share_budget():
+    G = ga.Graph.from_networkx(nx.karate_club_graph())
+    U = G.get_property("U-")
+    G.get_property("U+")
+    assert G._cache["U+"] is U
+    policy = CachePolicy()
+    nbytes = policy.sizeof(U)
+    assert G._cache.nbytes(G._A) == nbytes
+    G.cache_policy = nbytes
+    assert G._cache["U+"] is G._cache["U-"]
+    G.get_property("L-")
+    assert G._cache.nbytes(G._A) <= nbytes
+    # Aliases are evicted together
+    assert ("U-" in G._cache) == ("U+" in G._cache)
+    assert ("L-" in G._cache) == ("L+" in G._cache)
+
+
+def test_cache_policy_lru():
+    G = nx.DiGraph(nx.karate_club_graph())
+    G.add_edge(0, 0)
+    G = ga.DiGraph.from_networkx(G)
+    AT = G.get_property("AT")
+    nbytes = CachePolicy().sizeof(AT)
+    G.cache_policy = nbytes + nbytes // 2
+    G.get_property("U-")
+    G.get_property("L-")
+    assert G._cache.nbytes(G._A) <= nbytes + nbytes // 2
+    assert "L-" in G._cache  # just requested, so kept
+    assert ("AT" in G._cache) != ("U-" in G._cache)
+    # Results do not change
+    assert G.get_property("U-").isequal(gb.select.triu(G._A, 1).new())
+    assert G.get_property("AT").isequal(G._A.T.new())
+
+
+def test_property_cache_eviction_order():
+    cache = PropertyCache(policy=CachePolicy(3 * 16))
+    vectors = {key: gb.Vector.from_coo([0], [1.5], size=3) for key in "abcd"}
+    for key in "abc":
+        cache[key] = vectors[key]
+        cache.set_cost(key, 1.0)
+    cache["a"]  # "b" is now least recently used
+    cache["d"] = vectors["d"]
+    cache.set_cost("d", 1.0)
+    cache.trim()
+    assert list(cache) == ["a", "c", "d"]
+    # More expensive entries survive longer
+    cache.set_cost("a", 10.0)
+    cache["b"] = vectors["b"]
+    cache.set_cost("b", 1.0)
+    cache.trim(keep="b")
+    assert sorted(cache) == ["a", "b", "d"]
+
+
+def test_bad_policy():
+    with pytest.raises(ValueError, match="non-negative"):
+        CachePolicy(-1)
+    with pytest.raises(ValueError, match="non-negative"):
+        CachePolicy([1])
+
+
+@pytest.mark.parametrize("self_edges", [False, True])
+def test_get_properties_together(self_edges):
+    G = nx.DiGraph(nx.karate_club_graph())
+    G.remove_edges_from([(0, 1), (5, 6)])
+    if self_edges:
+        G.add_edge(0, 0)
+        G.add_edge(33, 33)
+    names = "offdiag U+ L- diag row_degrees- column_degrees- row_degrees+"
+    for cls, nxG in [(ga.Graph, G.to_undirected()), (ga.DiGraph, G)]:
+        for props in [names, "U- row_degrees-", "offdiag column_degrees-", "diag L+ L-"]:
+            G1 = cls.from_networkx(nxG)
+            G2 = cls.from_networkx(nxG)
+            results = G1.get_properties(props)
+            for name, result in zip(props.split(), results, strict=True):
+                assert result.isequal(G2.get_property(name), check_dtype=True), name
+            assert G1.get_property("has_self_edges") is self_edges
+
+
+def test_property_store(tmp_path, monkeypatch):
+    nxG = nx.karate_club_graph()
+    nxG.add_edge(0, 0)
+    G = ga.Graph.from_networkx(nxG)
+    G.property_store = tmp_path
+    L = G.get_property("L+")
+    fingerprint = G.get_property("fingerprint")
+    assert not (tmp_path / f"Graph-{fingerprint}").exists()
+    U, degrees = G.get_properties("U- degrees-")
+    G.get_property("plus_element-")
+    G.property_store.save(G)
+    assert (tmp_path / f"Graph-{fingerprint}" / "index.json").exists()
+    assert ga.DiGraph.from_networkx(nxG).get_property("fingerprint") == fingerprint
+    assert ga.Graph.from_networkx(nx.karate_club_graph()).get_property("fingerprint") != fingerprint
+    # Another graph with the same data loads from the store instead of computing
+    G2 = ga.Graph.from_networkx(nxG)
+    G2.property_store = ga.PropertyStore(tmp_path)
+    monkeypatch.setattr(graph, "select", None)
+    assert G2.get_property("L+").isequal(L)
+    assert G2.get_property("U-").isequal(U)
+    assert G2.get_property("degrees-").isequal(degrees)
+    assert G2._cache["has_self_edges"] is True
+    assert G2.get_property("plus_element-").isequal(G.get_property("plus_element-"))
+
+
+def test_cache_stats():
+    nxG = nx.karate_club_graph()
+    nxG.add_edge(0, 0)
+    G = ga.Graph.from_networkx(nxG)
+    assert G.cache_stats is None
+    G.cache_stats = True
+    G.get_property("offdiag")
+    G.get_property("degrees-")
+    G.get_property("degrees-")
+    G.get_property("min_element-")
+    report = G.cache_stats.report()
+    assert report["count_rowwise-"]["hits"] == 1
+    assert report["count_rowwise-"]["misses"] == 1
+    assert report["count_rowwise-"]["paths"] == {"offdiag (cached)": 1}
+    assert report["count_rowwise-"]["nbytes"] > 0
+    assert report["offdiag"]["seconds"] > 0
+    assert report["min_element-"]["paths"] == {"offdiag (cached)": 1}
+    G.cache_stats.clear()
+    assert G.cache_stats.report() == {}
+    G.cache_stats = False
+    assert G.cache_stats is None
+
+
+def _check_cache(G):
+    # Cached values must match freshly computed values
+    G2 = type(G)(G._A.dup(), key_to_id=G._key_to_id)
+    for key, val in G._cache.items():
+        expected = G2.get_property(key)
+        if isinstance(val, (gb.Matrix, gb.Vector, gb.Scalar)):
+            assert val.isequal(expected), key
+        else:
+            assert val == expected, key
+
+
+def test_reverse_and_to_undirected_keep_cache():
+    nxG = nx.gnp_random_graph(30, 0.2, seed=42, directed=True)
+    nxG.add_edge(3, 3)
+    G = ga.DiGraph.from_networkx(nxG)
+    G.get_properties("AT diag row_degrees- column_degrees+ recip_degrees- total_degrees-")
+    G.get_properties("min_element+ max_element- is_iso has_negative_edges-")
+    R = G.reverse(copy=False)
+    assert R._A is G._cache["AT"]
+    assert R._cache["AT"] is G._A
+    assert R._cache["count_columnwise-"] is G._cache["count_rowwise-"]
+    assert R._cache["count_rowwise+"] is G._cache["count_columnwise+"]
+    _check_cache(R)
+    assert R.reverse(copy=False)._A is G._A
+    # A copy doesn't share its adjacency matrix or cached values with the original
+    R = G.reverse()
+    assert R._A is not G._cache["AT"]
+    assert R._A.isequal(G._cache["AT"])
+    assert R._cache["AT"] is not G._A
+    assert R._cache["AT"].isequal(G._A)
+    assert R._cache["count_columnwise-"] is not G._cache["count_rowwise-"]
+    assert R._cache["count_columnwise-"].isequal(G._cache["count_rowwise-"])
+    assert R._cache["min_element+"] is not G._cache["min_element+"]
+    _check_cache(R)
+    AT = G._cache["AT"].dup()
+    R._A.clear()
+    assert G._cache["AT"].isequal(AT)
+    for reciprocal in [False, True]:
+        U = G.to_undirected(reciprocal=reciprocal)
+        assert "count_rowwise-" in U._cache
+        _check_cache(U)
+
+
+@pytest.mark.parametrize("self_edges", [False, True])
+def test_offdiagT(self_edges):
+    nxG = nx.gnp_random_graph(30, 0.2, seed=42, directed=True)
+    if self_edges:
+        nxG.add_edge(3, 3)
+    expected = ga.DiGraph.from_networkx(nxG).get_property("offdiag").T.new()
+    for first in ["offdiag", "AT", "offdiagT"]:
+        G = ga.DiGraph.from_networkx(nxG)
+        G.get_property(first)
+        assert G.get_property("offdiagT").isequal(expected)
+        assert (G._cache.get("AT") is G._cache["offdiagT"]) is ("AT" in G._cache and not self_edges)
+        G.get_property("column_degrees-")
+        _check_cache(G)
+        if "AT" in G._cache:
+            R = G.reverse(copy=False)
+            assert R._cache["offdiag"] is G._cache["offdiagT"]
+            assert R._cache.get("offdiagT") is G._cache.get("offdiag")
+            _check_cache(R)
+        R = G.reverse()
+        assert R._cache["offdiag"] is not G._cache["offdiagT"]
+        assert R._cache["offdiag"].isequal(G._cache["offdiagT"])
+        assert (R._cache["offdiag"] is R._A) is not self_edges
+        _check_cache(R)
+    G = ga.Graph.from_networkx(nxG.to_undirected())
+    assert G.get_property("offdiagT") is G.get_property("offdiag")
+
+
+def test_subgraph_keeps_cache():
+    nxG = nx.gnp_random_graph(30, 0.2, seed=42, directed=True)
+    nxG.add_edge(3, 3)
+    nxG.add_edge(4, 4)
+    G = ga.DiGraph.from_networkx(nxG)
+    G.get_properties("AT diag has_negative_edges+ is_iso")
+    nodes = [10, 4, 2, 3, 5, 100]
+    H = G.subgraph(nodes)
+    assert list(H) == [2, 3, 4, 5, 10]
+    assert H._A.isequal(ga.DiGraph.from_networkx(nxG.subgraph(nodes))._A)
+    assert {"AT", "diag", "has_self_edges"} <= H._cache.keys()
+    _check_cache(H)
+    G = ga.Graph.from_networkx(nxG.to_undirected())
+    G.get_property("has_self_edges")
+    H = G.subgraph([0, 1, 2])
+    _check_cache(H)
+
+
+def test_warm():
+    G = ga.DiGraph.from_networkx(nx.gnp_random_graph(30, 0.2, seed=42, directed=True))
+    future = G.warm("AT L- U- row_degrees-")
+    U = G.get_property("U-")
+    AT, L, U2, degrees = future.result()
+    assert U2.isequal(U)
+    assert AT.isequal(G._A.T.new())
+    assert degrees.isequal(G._A.reduce_rowwise(gb.agg.count).new())
+    assert G._cache._pending == {}
+    # Each property is its own task, and cached properties are not submitted
+    G2 = ga.DiGraph.from_networkx(nx.gnp_random_graph(30, 0.2, seed=42, directed=True))
+    G2.get_property("AT")
+    submitted = []
+    with ThreadPoolExecutor(4) as executor:
+        submit = executor.submit
+
+        def record(func, name, *args):
+            submitted.append(name)
+            return submit(func, name, *args)
+
+        executor.submit = record
+        AT2, L2 = G2.warm("AT L-", executor=executor).result()
+    assert submitted == ["L-"]
+    assert AT2.isequal(AT)
+    assert L2.isequal(L)
+    # Properties that can't be submitted fail without staying pending
+    with pytest.raises(RuntimeError, match="shutdown"):
+        G2.warm("U- offdiag", executor=executor).result()
+    assert G2._cache._pending == {}
+    future = G.warm(["L+", "not_a_property"])
+    with pytest.raises(KeyError, match="not_a_property"):
+        future.result()
+    assert G._cache._pending == {}
+    # Waiting for a property that fails to warm raises the error
+    future = Future()
+    G._cache._pending["AT"] = future
+    timer = threading.Timer(0.05, future.set_exception, [MemoryError("warm failed")])
+    timer.start()
+    with pytest.raises(MemoryError, match="warm failed"):
+        G.get_property("AT")
+    timer.join()
+    del G._cache._pending["AT"]
+    assert G.get_property("AT").isequal(G._A.T.new())
+
+
+def test_threads_compute_once():
+    G = ga.Graph.from_networkx(nx.gnp_random_graph(500, 0.05, seed=42))
+    G.cache_stats = True
+    barrier = threading.Barrier(8)
+    results = []
+
+    def run():
+        barrier.wait()
+        results.append(ga.triangles(G))
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 8
+    assert all(result.isequal(results[0]) for result in results)
+    report = G.cache_stats.report()
+    assert report["L-"]["misses"] == 1
+    assert report["U-"]["misses"] == 1
+    assert G._cache._depth == 0
+    H = copy.deepcopy(G)
+    assert H._cache["L-"].isequal(G._cache["L-"])
+    assert H.get_property("U+") is H._cache["U-"]
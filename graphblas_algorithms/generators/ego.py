@@ -19,6 +19,4 @@ def ego_graph(G, n, radius=1, center=True, undirected=False, is_weighted=False):
         del v[G._key_to_id[n]]
 
     indices, _ = v.to_coo(values=False)
-    A = G._A[indices, indices].new(name="ego")
-    key_to_id = G.renumber_key_to_id(indices.tolist())
-    return type(G)(A, key_to_id=key_to_id)
+    return G._subgraph(indices, name="ego")
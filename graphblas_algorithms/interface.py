@@ -6,6 +6,19 @@ from . import nxapi
 #######
 
 
+def _has_equal_weights(G, weight):
+    if not hasattr(G, "edges"):
+        return True
+    if hasattr(G, "_A"):
+        return G._A.nvals == 0 or G.get_property("iso_value") is not None
+    values = set()
+    for *_, value in G.edges(data=weight, default=1):
+        values.add(value)
+        if len(values) > 1:
+            return False
+    return True
+
+
 class Dispatcher:
     # Begin auto-generated code: dispatch
     mod = nxapi.boundary
@@ -15,10 +28,14 @@ class Dispatcher:
 
     mod = nxapi.centrality
     # ====================
+    betweenness_centrality = mod.betweenness.betweenness_centrality
+    edge_betweenness_centrality = mod.betweenness.edge_betweenness_centrality
+    closeness_centrality = mod.closeness.closeness_centrality
     degree_centrality = mod.degree_alg.degree_centrality
     in_degree_centrality = mod.degree_alg.in_degree_centrality
     out_degree_centrality = mod.degree_alg.out_degree_centrality
     eigenvector_centrality = mod.eigenvector.eigenvector_centrality
+    harmonic_centrality = mod.harmonic.harmonic_centrality
     katz_centrality = mod.katz.katz_centrality
 
     mod = nxapi.cluster
@@ -37,9 +54,19 @@ class Dispatcher:
 
     mod = nxapi.components
     # ====================
+    connected_components = mod.connected.connected_components
     is_connected = mod.connected.is_connected
     node_connected_component = mod.connected.node_connected_component
+    number_connected_components = mod.connected.number_connected_components
+    condensation = mod.strongly_connected.condensation
+    is_strongly_connected = mod.strongly_connected.is_strongly_connected
+    number_strongly_connected_components = (
+        mod.strongly_connected.number_strongly_connected_components
+    )
+    strongly_connected_components = mod.strongly_connected.strongly_connected_components
     is_weakly_connected = mod.weakly_connected.is_weakly_connected
+    number_weakly_connected_components = mod.weakly_connected.number_weakly_connected_components
+    weakly_connected_components = mod.weakly_connected.weakly_connected_components
 
     mod = nxapi.core
     # ==============
@@ -61,6 +88,14 @@ class Dispatcher:
     ancestors = mod.ancestors
     descendants = mod.descendants
 
+    mod = nxapi.distance_measures
+    # ===========================
+    center = mod.center
+    diameter = mod.diameter
+    eccentricity = mod.eccentricity
+    periphery = mod.periphery
+    radius = mod.radius
+
     mod = nxapi.dominating
     # ====================
     is_dominating_set = mod.is_dominating_set
@@ -130,6 +165,7 @@ class Dispatcher:
     floyd_warshall = mod.dense.floyd_warshall
     floyd_warshall_numpy = mod.dense.floyd_warshall_numpy
     floyd_warshall_predecessor_and_distance = mod.dense.floyd_warshall_predecessor_and_distance
+    average_shortest_path_length = mod.generic.average_shortest_path_length
     has_path = mod.generic.has_path
     all_pairs_shortest_path_length = mod.unweighted.all_pairs_shortest_path_length
     single_source_shortest_path_length = mod.unweighted.single_source_shortest_path_length
@@ -137,8 +173,10 @@ class Dispatcher:
     all_pairs_bellman_ford_path_length = mod.weighted.all_pairs_bellman_ford_path_length
     bellman_ford_path = mod.weighted.bellman_ford_path
     bellman_ford_path_length = mod.weighted.bellman_ford_path_length
+    dijkstra_path_length = mod.weighted.dijkstra_path_length
     negative_edge_cycle = mod.weighted.negative_edge_cycle
     single_source_bellman_ford_path_length = mod.weighted.single_source_bellman_ford_path_length
+    single_source_dijkstra_path_length = mod.weighted.single_source_dijkstra_path_length
 
     mod = nxapi.simple_paths
     # ======================
@@ -167,9 +205,34 @@ class Dispatcher:
     # ================
     is_triad = mod.is_triad
 
+    mod = nxapi.wiener
+    # ================
+    wiener_index = mod.wiener_index
+
     del mod
     # End auto-generated code: dispatch
 
+    @staticmethod
+    def can_run(name, args, kwargs):
+        import inspect
+
+        # Edge weights must be given by an attribute name (not e.g. a function)
+        try:
+            bound = inspect.signature(getattr(Dispatcher, name)).bind_partial(*args, **kwargs)
+        except TypeError:
+            return True
+        weight = bound.arguments.get("weight")
+        if weight is None:
+            return True
+        if not isinstance(weight, str):
+            return False
+        if name in {"betweenness_centrality", "edge_betweenness_centrality"}:
+            # Only unweighted shortest paths are implemented, which are the same if all
+            # edge weights are equal, so let NetworkX compute other weighted graphs.
+            G = bound.arguments.get("G")
+            return G is None or _has_equal_weights(G, weight)
+        return True
+
     @staticmethod
     def convert_from_nx(
         graph,
@@ -244,6 +307,15 @@ class Dispatcher:
         from .classes import Graph
 
         if isinstance(obj, Graph):
+            if name == "condensation":
+                # Add "members" node attributes, which are not supported by our graphs
+                rv = obj.to_networkx(edge_attribute=None)
+                rv.graph.update(obj.graph)
+                for node in rv:
+                    rv.nodes[node]["members"] = set()
+                for key, component in obj.graph["mapping"].items():
+                    rv.nodes[component]["members"].add(key)
+                return rv
             obj = obj.to_networkx()
         elif isinstance(obj, Matrix):
             if name in {
@@ -6,6 +6,7 @@ from .components import *
 from .core import *
 from .cuts import *
 from .dag import *
+from .distance_measures import *
 from .dominating import *
 from .efficiency_measures import *
 from .generators import *
@@ -23,6 +24,7 @@ from .smetric import *
 from .structuralholes import *
 from .traversal import *
 from .triads import *
+from .wiener import *
 from .tournament import is_tournament
 
 from . import centrality
@@ -39,3 +41,4 @@ from . import operators
 from . import shortest_paths
 from . import tournament
 from . import traversal
+from . import wiener
@@ -1,127 +1,89 @@
-from math import ceil
-from numbers import Number
-
-try:
-    from itertools import pairwise  # Added in Python 3.10
-except ImportError:
-
-    def pairwise(it):
-        it = iter(it)
-        for prev in it:
-            for cur in it:
-                yield (prev, cur)
-                prev = cur
-
-
-BYTES_UNITS = {
-    "": 1,
-    "b": 1,
-    "kb": 1000,
-    "mb": 1000**2,
-    "gb": 1000**3,
-    "tb": 1000**4,
-    "pb": 1000**5,
-    "eb": 1000**6,
-    "zb": 1000**7,
-    "kib": 1024,
-    "mib": 1024**2,
-    "gib": 1024**3,
-    "tib": 1024**4,
-    "pib": 1024**5,
-    "eib": 1024**6,
-    "zib": 1024**7,
-}
-
-
-def normalize_chunksize(chunksize, itemsize=1, N=None):
-    if chunksize is None:
-        return None
-    if isinstance(chunksize, Number):
-        rv = int(chunksize)
-        if rv <= 0 or N is not None and rv >= N:
-            return None
-        return rv
-    if not isinstance(chunksize, str):
-        raise TypeError(f"chunksize must be a number or a string; got {type(chunksize)}")
-    chunkstring = chunksize.replace(" ", "").replace("_", "").lower()
-    if not chunkstring or chunkstring == "all":
+from concurrent.futures import ProcessPoolExecutor
+
+from .._utils import normalize_chunksize
+from .exception import NetworkXError
+
+
+def uses_processes(executor):
+    """Whether ``executor`` asks for worker processes that share the graph in memory"""
+    if isinstance(executor, str):
+        if executor != "processes":
+            raise ValueError(f'executor must be an Executor or "processes"; got {executor!r}')
+        return True
+    return isinstance(executor, ProcessPoolExecutor)
+
+
+# Targets for `chunksize="auto"`
+AUTO_CHUNK_BYTES = 10 * 1024**2
+AUTO_CHUNK_SECONDS = 0.5
+
+
+class AdaptiveChunks:
+    """Chunks of nodes whose sizes adapt to the results of earlier chunks.
+
+    This is used for ``chunksize="auto"``.  The first chunk is as large as fits in
+    ``maxbytes`` if every result row were dense.  After a chunk is recorded with
+    ``record``, later chunks are sized so that results use about ``maxbytes`` given
+    the observed number of values per row, and so a chunk takes about ``seconds`` to
+    compute.  Sizes grow by at most 4x at a time.  Chunks are created lazily, so sizes
+    adapt even if several chunks are in flight.
+
+    Parameters
+    ----------
+    nodes : list
+    N : int
+        The number of columns of a result row.
+    itemsize : int
+        The size in bytes of a value in the results.
+    maxbytes : int, optional
+    seconds : float, optional
+    """
+
+    def __init__(self, nodes, N, itemsize, *, maxbytes=None, seconds=None):
+        self.nodes = nodes
+        self.maxbytes = AUTO_CHUNK_BYTES if maxbytes is None else maxbytes
+        self.seconds = AUTO_CHUNK_SECONDS if seconds is None else seconds
+        self._entrysize = itemsize + 8  # Value and column index
+        self.size = max(1, self.maxbytes // max(1, N * itemsize))
+
+    def __iter__(self):
+        nodes = self.nodes
+        start = 0
+        while start < len(nodes):
+            stop = start + self.size
+            yield nodes[start:stop]
+            start = stop
+
+    def record(self, nrows, nvals, seconds=None):
+        """Update the chunk size from a chunk of ``nrows`` rows with ``nvals`` values"""
+        if nrows <= 0:
+            return
+        rowbytes = max(1, nvals / nrows) * self._entrysize
+        size = self.maxbytes / rowbytes
+        if seconds is not None and seconds > 0:
+            size = min(size, nrows * self.seconds / seconds)
+        self.size = max(1, min(int(size), 4 * nrows))
+
+
+def chunksize_to_maxbytes(chunksize, G):
+    """Convert ``chunksize`` to a memory budget for sources processed together.
+
+    A number is the number of sources if each reaches every node.
+    """
+    if len(G) == 0:
         return None
-    for i, c in enumerate(reversed(chunkstring)):
-        if c.isdigit():
-            index = len(chunkstring) - i
-            break
-    else:
-        chunkstring = f"1{chunkstring}"
-        index = 1
+    rowsize = len(G) * G._A.dtype.np_type.itemsize
+    chunksize = normalize_chunksize(chunksize, rowsize, len(G))
+    return None if chunksize is None else chunksize * rowsize
 
-    prefix = chunkstring[:index]
-    suffix = chunkstring[index:]
 
-    try:
-        number = float(prefix)
-    except ValueError as exc:
-        raise ValueError(
-            f"Bad chunksize: {chunksize!r}. Could not interpret {prefix!r} as a number."
-        ) from exc
-
-    if suffix in {"chunk", "chunks"}:
-        if number <= 1:
-            return None
-        if N is None:
-            raise TypeError(
-                f"N argument is required to determine chunksize to split into {int(number)} chunks"
-            )
-        rv = ceil(N / number)
-    else:
-        scale = BYTES_UNITS.get(suffix)
-        if scale is None:
-            raise ValueError(
-                f"Bad chunksize: {chunksize!r}. Could not interpret {suffix!r} as a bytes unit."
-            )
-        number *= scale
-        if chunkstring[-1] == "b":
-            number = max(1, number / itemsize)
-        rv = int(round(number))
-    if rv <= 0 or N is not None and rv >= N:
+def nbunch_to_list(G, nbunch):
+    """Like ``G.nbunch_iter(nbunch)`` in NetworkX, but return a list (or None for all nodes)"""
+    if nbunch is None:
         return None
-    return rv
-
-
-def partition(chunksize, L, *, evenly=True):
-    """Partition a list into chunks"""
-    N = len(L)
-    if N == 0:
-        return
-    chunksize = int(chunksize)
-    if chunksize <= 0 or chunksize >= N:
-        yield L
-        return
-    if chunksize == 1:
-        yield from L
-        return
-    if evenly:
-        k = ceil(len(L) / chunksize)
-        if k * chunksize != N:
-            yield from split_evenly(k, L)
-            return
-    for start, stop in pairwise(range(0, N + chunksize, chunksize)):
-        yield L[start:stop]
-
-
-def split_evenly(k, L):
-    """Split a list into approximately-equal parts"""
-    N = len(L)
-    if N == 0:
-        return
-    k = int(k)
-    if k <= 1:
-        yield L
-        return
-    start = 0
-    for i in range(1, k):
-        stop = (N * i + k - 1) // k
-        if stop != start:
-            yield L[start:stop]
-            start = stop
-    if stop != N:
-        yield L[stop:]
+    if nbunch in G:
+        return [nbunch]
+    try:
+        return [node for node in nbunch if node in G]
+    except TypeError as exc:
+        raise NetworkXError("nbunch is not a node or a sequence of nodes.") from exc
@@ -0,0 +1,67 @@
+from graphblas import select
+
+from graphblas_algorithms import algorithms
+from graphblas_algorithms.classes.digraph import to_graph
+from graphblas_algorithms.utils import not_implemented_for, py_random_state
+
+from .._utils import normalize_chunksize
+
+__all__ = ["betweenness_centrality", "edge_betweenness_centrality"]
+
+
+def _get_sources(G, k, seed):
+    if k is None:
+        return None
+    return seed.sample(list(G), k)
+
+
+def _get_graph(G, weight):
+    G = to_graph(G, weight=weight)
+    if weight is not None and G.get_property("iso_value") is None and G._A.nvals > 0:
+        # Shortest paths are the same as unweighted shortest paths only if weights are equal
+        raise NotImplementedError("betweenness centrality is not implemented for weighted graphs")
+    return G
+
+
+def _get_chunksize(G, chunksize):
+    # Memory is dominated by a few dense float rows for each source in a batch
+    return normalize_chunksize(chunksize, len(G) * 8, len(G))
+
+
+@not_implemented_for("multigraph")
+@py_random_state("seed")
+def betweenness_centrality(
+    G, k=None, normalized=True, weight=None, endpoints=False, seed=None, *, chunksize="10 MiB"
+):
+    G = _get_graph(G, weight)
+    result = algorithms.betweenness_centrality(
+        G,
+        _get_sources(G, k, seed),
+        normalized=normalized,
+        endpoints=endpoints,
+        chunksize=_get_chunksize(G, chunksize),
+    )
+    return G.vector_to_nodemap(result)
+
+
+@not_implemented_for("multigraph")
+@py_random_state("seed")
+def edge_betweenness_centrality(
+    G, k=None, normalized=True, weight=None, seed=None, *, chunksize="10 MiB"
+):
+    G = _get_graph(G, weight)
+    result = algorithms.edge_betweenness_centrality(
+        G,
+        _get_sources(G, k, seed),
+        normalized=normalized,
+        chunksize=_get_chunksize(G, chunksize),
+    )
+    if not G.is_directed():
+        # Each undirected edge once, in the order of `G.edges()` in NetworkX
+        result = select.triu(result).new()
+    rows, cols, values = result.to_coo()
+    id_to_key = G.id_to_key
+    return {
+        (id_to_key[row], id_to_key[col]): val
+        for row, col, val in zip(rows.tolist(), cols.tolist(), values.tolist(), strict=True)
+    }
@@ -0,0 +1,25 @@
+from graphblas_algorithms import algorithms
+from graphblas_algorithms.classes.digraph import to_graph
+
+from .._utils import chunksize_to_maxbytes
+from ..exception import NetworkXUnbounded, NodeNotFound
+
+__all__ = ["closeness_centrality"]
+
+
+def closeness_centrality(G, u=None, distance=None, wf_improved=True, *, chunksize="10 MiB"):
+    G = to_graph(G, weight=distance)
+    if u is not None and u not in G:
+        raise NodeNotFound(f"Source {u} is not in G")
+    try:
+        result = algorithms.closeness_centrality(
+            G,
+            None if u is None else [u],
+            wf_improved=wf_improved,
+            maxbytes=chunksize_to_maxbytes(chunksize, G),
+        )
+    except algorithms.exceptions.Unbounded as e:
+        raise NetworkXUnbounded(*e.args) from e
+    if u is not None:
+        return result.get(G._key_to_id[u])
+    return G.vector_to_nodemap(result)
@@ -0,0 +1,21 @@
+from graphblas_algorithms import algorithms
+from graphblas_algorithms.classes.digraph import to_graph
+
+from .._utils import chunksize_to_maxbytes, nbunch_to_list
+from ..exception import NetworkXUnbounded
+
+__all__ = ["harmonic_centrality"]
+
+
+def harmonic_centrality(G, nbunch=None, distance=None, sources=None, *, chunksize="10 MiB"):
+    G = to_graph(G, weight=distance)
+    try:
+        result = algorithms.harmonic_centrality(
+            G,
+            nbunch_to_list(G, nbunch),
+            sources=nbunch_to_list(G, sources),
+            maxbytes=chunksize_to_maxbytes(chunksize, G),
+        )
+    except algorithms.exceptions.Unbounded as e:
+        raise NetworkXUnbounded(*e.args) from e
+    return G.vector_to_nodemap(result)
@@ -1,11 +1,12 @@
 from graphblas import monoid
 
 from graphblas_algorithms import algorithms
+from graphblas_algorithms._utils import partition
 from graphblas_algorithms.classes.digraph import to_graph
 from graphblas_algorithms.classes.graph import to_undirected_graph
 from graphblas_algorithms.utils import not_implemented_for
 
-from ._utils import normalize_chunksize, partition
+from ._utils import normalize_chunksize
 
 __all__ = [
     "triangles",
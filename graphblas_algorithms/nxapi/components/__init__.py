@@ -1,2 +1,3 @@
 from .connected import *
+from .strongly_connected import *
 from .weakly_connected import *
@@ -6,11 +6,20 @@ from graphblas_algorithms.utils import not_implemented_for
 from ..exception import NetworkXPointlessConcept
 
 __all__ = [
+    "connected_components",
     "is_connected",
     "node_connected_component",
+    "number_connected_components",
 ]
 
 
+@not_implemented_for("directed")
+def connected_components(G):
+    G = to_undirected_graph(G)
+    labels, _ = algorithms.connected_components(G)
+    yield from G.vector_to_components(labels)
+
+
 @not_implemented_for("directed")
 def is_connected(G):
     G = to_undirected_graph(G)
@@ -25,3 +34,9 @@ def node_connected_component(G, n):
     G = to_undirected_graph(G)
     rv = algorithms.node_connected_component(G, n)
     return G.vector_to_nodeset(rv)
+
+
+@not_implemented_for("directed")
+def number_connected_components(G):
+    G = to_undirected_graph(G)
+    return algorithms.number_connected_components(G)
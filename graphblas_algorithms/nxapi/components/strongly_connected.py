@@ -0,0 +1,50 @@
+from graphblas_algorithms import algorithms
+from graphblas_algorithms.algorithms.exceptions import PointlessConcept
+from graphblas_algorithms.classes.digraph import to_directed_graph
+from graphblas_algorithms.utils import not_implemented_for
+
+from ..exception import NetworkXPointlessConcept
+
+__all__ = [
+    "condensation",
+    "is_strongly_connected",
+    "number_strongly_connected_components",
+    "strongly_connected_components",
+]
+
+
+@not_implemented_for("undirected")
+def strongly_connected_components(G):
+    G = to_directed_graph(G)
+    labels, _ = algorithms.strongly_connected_components(G)
+    yield from G.vector_to_components(labels)
+
+
+@not_implemented_for("undirected")
+def number_strongly_connected_components(G):
+    G = to_directed_graph(G)
+    return algorithms.number_strongly_connected_components(G)
+
+
+@not_implemented_for("undirected")
+def is_strongly_connected(G):
+    G = to_directed_graph(G)
+    try:
+        return algorithms.is_strongly_connected(G)
+    except PointlessConcept as e:
+        raise NetworkXPointlessConcept(*e.args) from e
+
+
+@not_implemented_for("undirected")
+def condensation(G, scc=None):
+    G = to_directed_graph(G)
+    if scc is not None and len(G) > 0:
+        scc = G.dict_to_vector(
+            {node: i for i, component in enumerate(scc) for node in component}, dtype=int
+        )
+    else:
+        scc = None
+    C, components = algorithms.condensation(G, scc)
+    # Node attributes are not supported, so only add the "mapping" graph attribute
+    C.graph["mapping"] = G.vector_to_dict(components)
+    return C
@@ -7,6 +7,8 @@ from ..exception import NetworkXPointlessConcept
 
 __all__ = [
     "is_weakly_connected",
+    "number_weakly_connected_components",
+    "weakly_connected_components",
 ]
 
 
@@ -17,3 +19,16 @@ def is_weakly_connected(G):
         return algorithms.is_weakly_connected(G)
     except PointlessConcept as e:
         raise NetworkXPointlessConcept(*e.args) from e
+
+
+@not_implemented_for("undirected")
+def weakly_connected_components(G):
+    G = to_directed_graph(G)
+    labels, _ = algorithms.weakly_connected_components(G)
+    yield from G.vector_to_components(labels)
+
+
+@not_implemented_for("undirected")
+def number_weakly_connected_components(G):
+    G = to_directed_graph(G)
+    return algorithms.number_weakly_connected_components(G)
@@ -0,0 +1,80 @@
+from graphblas_algorithms import algorithms
+from graphblas_algorithms.classes.digraph import to_graph
+
+from ._utils import chunksize_to_maxbytes, nbunch_to_list
+from .exception import NetworkXError, NetworkXUnbounded
+
+__all__ = ["center", "diameter", "eccentricity", "periphery", "radius"]
+
+
+def _call(func, G, *args, **kwargs):
+    try:
+        return func(G, *args, **kwargs)
+    except algorithms.exceptions.PointlessConcept as e:
+        # NetworkX raises ValueError from `max` of no eccentricities
+        raise ValueError(*e.args) from e
+    except algorithms.exceptions.Unbounded as e:
+        raise NetworkXUnbounded(*e.args) from e
+    except algorithms.exceptions.GraphBlasAlgorithmException as e:
+        raise NetworkXError(*e.args) from e
+
+
+def eccentricity(G, v=None, sp=None, weight=None, *, chunksize="10 MiB"):
+    G = to_graph(G, weight=weight)
+    nodes = nbunch_to_list(G, v)
+    if sp is not None:
+        e = {}
+        for n in G if nodes is None else nodes:
+            try:
+                length = sp[n]
+                L = len(length)
+            except TypeError as err:
+                raise NetworkXError('Format of "sp" is invalid.') from err
+            if len(G) != L:
+                if G.is_directed():
+                    kind = "digraph is not strongly connected"
+                else:
+                    kind = "graph is not connected"
+                raise NetworkXError(f"Found infinite path length because the {kind}")
+            e[n] = max(length.values())
+    else:
+        result = _call(
+            algorithms.eccentricity, G, nodes, maxbytes=chunksize_to_maxbytes(chunksize, G)
+        )
+        e = G.vector_to_nodemap(result)
+    if v in G:
+        return e[v]
+    return e
+
+
+def diameter(G, e=None, usebounds=False, weight=None, *, chunksize="10 MiB"):
+    # Eccentricity bounds are always used for undirected graphs, since results are exact
+    if e is not None:
+        return max(e.values())
+    G = to_graph(G, weight=weight)
+    return _call(algorithms.diameter, G, maxbytes=chunksize_to_maxbytes(chunksize, G))
+
+
+def periphery(G, e=None, usebounds=False, weight=None, *, chunksize="10 MiB"):
+    if e is not None:
+        diameter = max(e.values())
+        return [v for v in e if e[v] == diameter]
+    G = to_graph(G, weight=weight)
+    result = _call(algorithms.periphery, G, maxbytes=chunksize_to_maxbytes(chunksize, G))
+    return G.vector_to_list(result)
+
+
+def radius(G, e=None, usebounds=False, weight=None, *, chunksize="10 MiB"):
+    if e is not None:
+        return min(e.values())
+    G = to_graph(G, weight=weight)
+    return _call(algorithms.radius, G, maxbytes=chunksize_to_maxbytes(chunksize, G))
+
+
+def center(G, e=None, usebounds=False, weight=None, *, chunksize="10 MiB"):
+    if e is not None:
+        radius = min(e.values())
+        return [v for v in e if e[v] == radius]
+    G = to_graph(G, weight=weight)
+    result = _call(algorithms.center, G, maxbytes=chunksize_to_maxbytes(chunksize, G))
+    return G.vector_to_list(result)
@@ -1,14 +1,41 @@
 from graphblas_algorithms import algorithms
 from graphblas_algorithms.classes.digraph import to_graph
 
-from ..exception import NodeNotFound
+from .._utils import chunksize_to_maxbytes
+from ..exception import NetworkXError, NetworkXPointlessConcept, NetworkXUnbounded, NodeNotFound
 
-__all__ = ["has_path"]
+__all__ = ["average_shortest_path_length", "has_path"]
 
 
-def has_path(G, source, target):
+def has_path(G, source, target, *, landmarks=None):
+    # `landmarks` is the number of landmark nodes of an index that bounds path lengths.
+    # The index is built on first use and cached on G, so it helps repeated queries
+    # on the same graphblas_algorithms Graph or DiGraph.
     G = to_graph(G)
+    if landmarks is not None:
+        landmarks = algorithms.landmark_index(G, landmarks)
     try:
-        return algorithms.has_path(G, source, target)
+        return algorithms.has_path(G, source, target, landmarks=landmarks)
     except KeyError as e:
         raise NodeNotFound(*e.args) from e
+
+
+def average_shortest_path_length(G, weight=None, method=None, *, chunksize="10 MiB"):
+    single_source_methods = ["unweighted", "dijkstra", "bellman-ford"]
+    all_pairs_methods = ["floyd-warshall", "floyd-warshall-numpy"]
+    if method is None:
+        method = "unweighted" if weight is None else "dijkstra"
+    if method not in single_source_methods + all_pairs_methods:
+        raise ValueError(f"method not supported: {method}")
+    # Every method computes the same lengths, so use the fastest one
+    G = to_graph(G, weight=None if method == "unweighted" else weight)
+    try:
+        return algorithms.average_shortest_path_length(
+            G, maxbytes=chunksize_to_maxbytes(chunksize, G)
+        )
+    except algorithms.exceptions.PointlessConcept as e:
+        raise NetworkXPointlessConcept(*e.args) from e
+    except algorithms.exceptions.Unbounded as e:
+        raise NetworkXUnbounded(*e.args) from e
+    except algorithms.exceptions.GraphBlasAlgorithmException as e:
+        raise NetworkXError(*e.args) from e
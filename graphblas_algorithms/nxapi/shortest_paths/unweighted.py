@@ -1,7 +1,12 @@
+import time
+
+import numpy as np
+
 from graphblas_algorithms import algorithms
+from graphblas_algorithms._utils import BFS_ENTRY_BYTES, imap_ordered, node_chunks
 from graphblas_algorithms.classes.digraph import to_graph
 
-from .._utils import normalize_chunksize, partition
+from .._utils import AUTO_CHUNK_BYTES, AdaptiveChunks, normalize_chunksize, uses_processes
 from ..exception import NodeNotFound
 
 __all__ = [
@@ -27,19 +32,78 @@ def single_target_shortest_path_length(G, target, cutoff=None):
     return G.vector_to_nodemap(v)
 
 
-def all_pairs_shortest_path_length(G, cutoff=None, *, chunksize="10 MiB"):
+def all_pairs_shortest_path_length(
+    G, cutoff=None, *, chunksize="10 MiB", executor=None, max_workers=None
+):
+    # `chunksize` limits the memory used by sources that are processed together
+    # (a number is the number of sources if each reaches every node).  More sources
+    # are processed together when they reach only part of the graph, and results are
+    # yielded in the order of the nodes.  A number of bytes is converted to sources
+    # with the same cost per path length (`BFS_ENTRY_BYTES`) that the BFS charges.
+    # `chunksize="auto"` uses a fixed memory budget here, and with an executor, sizes
+    # of chunks adapt to the observed density and compute time of earlier chunks (see
+    # `AdaptiveChunks`).
+    #
+    # If `executor` or `max_workers` is given, then chunks of `chunksize` sources are
+    # computed concurrently (SuiteSparse:GraphBLAS releases the GIL) by `executor` or
+    # by a thread pool with `max_workers` threads.  At most `max_workers` chunks are
+    # in flight, and results are yielded in the order of the nodes.  With a
+    # ProcessPoolExecutor or `executor="processes"`, worker processes share the graph
+    # in shared memory (see `multiprocess_path_length_chunks`).
     G = to_graph(G)
-    chunksize = normalize_chunksize(chunksize, len(G) * G._A.dtype.np_type.itemsize, len(G))
-    if chunksize is None:
-        D = algorithms.all_pairs_shortest_path_length(G, cutoff)
-        yield from G.matrix_to_nodenodemap(D).items()
-    elif chunksize < 2:
-        for source in G:
-            d = algorithms.single_source_shortest_path_length(G, source, cutoff)
-            yield (source, G.vector_to_nodemap(d))
+    if len(G) == 0:
+        return
+    rowsize = len(G) * BFS_ENTRY_BYTES
+    if chunksize == "auto":
+        chunks = AdaptiveChunks(list(G), len(G), np.dtype(int).itemsize)
+        chunksize = None
     else:
-        for cur_nodes in partition(chunksize, list(G)):
-            D = algorithms.all_pairs_shortest_path_length(G, cutoff, nodes=cur_nodes)
-            for i, source in enumerate(cur_nodes):
+        chunksize = normalize_chunksize(chunksize, rowsize, len(G))
+        chunks = None
+    if uses_processes(executor):
+        results = algorithms.multiprocess_path_length_chunks(
+            G,
+            weighted=False,
+            cutoff=cutoff,
+            chunksize=chunksize,
+            chunks=chunks,
+            executor=None if executor == "processes" else executor,
+            max_workers=max_workers,
+        )
+        for indices, D in results:
+            if chunks is not None:
+                # Compute times in the workers aren't observed, so only adapt to memory
+                chunks.record(D.nrows, D.nvals)
+            for i, index in enumerate(indices.tolist()):
                 d = D[i, :].new(name=f"all_pairs_shortest_path_length_{i}")
+                yield (G.id_to_key[index], G.vector_to_nodemap(d))
+        return
+    if executor is not None or max_workers is not None:
+
+        def compute(nodes):
+            start = time.perf_counter()
+            D = algorithms.all_pairs_shortest_path_length(G, cutoff, nodes=nodes)
+            rows = [
+                D[i, :].new(name=f"all_pairs_shortest_path_length_{i}") for i in range(len(nodes))
+            ]
+            return nodes, rows, D.nvals, time.perf_counter() - start
+
+        if chunks is None:
+            chunks = node_chunks(chunksize, list(G))
+        for nodes, rows, nvals, seconds in imap_ordered(
+            compute, chunks, executor=executor, max_workers=max_workers
+        ):
+            if isinstance(chunks, AdaptiveChunks):
+                chunks.record(len(nodes), nvals, seconds)
+            for source, d in zip(nodes, rows, strict=True):
                 yield (source, G.vector_to_nodemap(d))
+        return
+    if chunks is not None:
+        # The number of sources processed together already adapts to their reach
+        maxbytes = AUTO_CHUNK_BYTES
+    else:
+        maxbytes = None if chunksize is None else chunksize * rowsize
+    for source, d in algorithms.all_pairs_shortest_path_length_iter(
+        G, cutoff, maxbytes=maxbytes, ordered=True
+    ):
+        yield (source, G.vector_to_nodemap(d))
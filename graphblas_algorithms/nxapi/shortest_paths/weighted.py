@@ -1,33 +1,112 @@
+import time
+
 from graphblas_algorithms import algorithms, exceptions
+from graphblas_algorithms._utils import BFS_ENTRY_BYTES, imap_ordered, node_chunks, partition
 from graphblas_algorithms.classes.digraph import to_graph
 
-from .._utils import normalize_chunksize, partition
+from .._utils import AUTO_CHUNK_BYTES, AdaptiveChunks, normalize_chunksize, uses_processes
 from ..exception import NetworkXNoPath, NetworkXUnbounded, NodeNotFound
 
 __all__ = [
     "all_pairs_bellman_ford_path_length",
     "bellman_ford_path",
     "bellman_ford_path_length",
+    "dijkstra_path_length",
     "negative_edge_cycle",
     "single_source_bellman_ford_path_length",
+    "single_source_dijkstra_path_length",
 ]
 
 
-def all_pairs_bellman_ford_path_length(G, weight="weight", *, chunksize="10 MiB"):
+def all_pairs_bellman_ford_path_length(
+    G, weight="weight", *, chunksize="10 MiB", executor=None, max_workers=None
+):
     # Larger chunksize offers more parallelism, but uses more memory.
     # Chunksize indicates for how many source nodes to compute at one time.
     # The default is to choose the number of rows so the result, if dense,
-    # will be about 10MB.
+    # will be about 10MB.  With `chunksize="auto"`, chunk sizes adapt to the
+    # observed density and compute time of earlier chunks (see `AdaptiveChunks`).
+    #
+    # If `executor` or `max_workers` is given, then chunks are computed concurrently
+    # by `executor` or by a thread pool with `max_workers` threads.  At most
+    # `max_workers` chunks are in flight, and results are yielded in order.  With a
+    # ProcessPoolExecutor or `executor="processes"`, worker processes share the graph
+    # in shared memory (see `multiprocess_path_length_chunks`).
     G = to_graph(G, weight=weight)
-    chunksize = normalize_chunksize(chunksize, len(G) * G._A.dtype.np_type.itemsize, len(G))
-    if chunksize is None:
+    if len(G) == 0:
+        return
+    itemsize = G._A.dtype.np_type.itemsize
+    rowsize = len(G) * itemsize
+    if chunksize == "auto":
+        chunks = AdaptiveChunks(list(G), len(G), itemsize)
+        chunksize = max(1, AUTO_CHUNK_BYTES // max(1, rowsize))
+    else:
+        chunksize = normalize_chunksize(chunksize, rowsize, len(G))
+        chunks = None
+    if uses_processes(executor):
+        results = algorithms.multiprocess_path_length_chunks(
+            G,
+            chunksize=chunksize,
+            chunks=chunks,
+            executor=None if executor == "processes" else executor,
+            max_workers=max_workers,
+        )
+        try:
+            for indices, D in results:
+                if chunks is not None:
+                    # Compute times in the workers aren't observed, so only adapt to memory
+                    chunks.record(D.nrows, D.nvals)
+                for i, index in enumerate(indices.tolist()):
+                    d = D[i, :].new(name=f"all_pairs_bellman_ford_path_length_{i}")
+                    yield (G.id_to_key[index], G.vector_to_nodemap(d))
+        except algorithms.exceptions.Unbounded as e:
+            raise NetworkXUnbounded(*e.args) from e
+        return
+    if executor is not None or max_workers is not None:
+        if chunks is None:
+            chunks = node_chunks(chunksize, list(G))
+        yield from _all_pairs_bellman_ford_concurrent(G, chunks, executor, max_workers)
+        return
+    if G.get_property("is_iso"):
+        is_negative, iso_value = G.get_properties("has_negative_edges+ iso_value")
+        if not is_negative:
+            # All edges have the same weight, so use BFS and stream results per source.
+            # The number of sources processed together already adapts to their reach.
+            if chunks is not None:
+                maxbytes = AUTO_CHUNK_BYTES
+            else:
+                maxbytes = None if chunksize is None else chunksize * len(G) * BFS_ENTRY_BYTES
+            for source, d in algorithms.all_pairs_shortest_path_length_iter(
+                G, maxbytes=maxbytes, dtype=iso_value.dtype, ordered=True
+            ):
+                if iso_value != 1:
+                    d *= iso_value
+                yield (source, G.vector_to_nodemap(d))
+            return
+    if G.is_directed() and G.get_property("has_negative_edges-"):
+        # Johnson's algorithm: make weights non-negative once, then each chunk is fast
+        func = algorithms.johnson_path_lengths
+    else:
+        func = algorithms.bellman_ford_path_lengths
+    if chunks is not None:
+        for cur_nodes in chunks:
+            start = time.perf_counter()
+            try:
+                D = func(G, cur_nodes)
+            except algorithms.exceptions.Unbounded as e:
+                raise NetworkXUnbounded(*e.args) from e
+            chunks.record(D.nrows, D.nvals, time.perf_counter() - start)
+            for i, source in enumerate(cur_nodes):
+                d = D[i, :].new(name=f"all_pairs_bellman_ford_path_length_{i}")
+                yield (source, G.vector_to_nodemap(d))
+    elif chunksize is None:
         # All at once
         try:
-            D = algorithms.bellman_ford_path_lengths(G)
+            D = func(G)
         except algorithms.exceptions.Unbounded as e:
             raise NetworkXUnbounded(*e.args) from e
         yield from G.matrix_to_nodenodemap(D).items()
-    elif chunksize < 2:
+    elif chunksize < 2 and func is algorithms.bellman_ford_path_lengths:
         for source in G:
             try:
                 d = algorithms.single_source_bellman_ford_path_length(G, source)
@@ -36,8 +115,10 @@ def all_pairs_bellman_ford_path_length(G, weight="weight", *, chunksize="10 MiB"
             yield (source, G.vector_to_nodemap(d))
     else:
         for cur_nodes in partition(chunksize, list(G)):
+            if chunksize < 2:
+                cur_nodes = [cur_nodes]
             try:
-                D = algorithms.bellman_ford_path_lengths(G, cur_nodes)
+                D = func(G, cur_nodes)
             except algorithms.exceptions.Unbounded as e:
                 raise NetworkXUnbounded(*e.args) from e
             for i, source in enumerate(cur_nodes):
@@ -45,6 +126,42 @@ def all_pairs_bellman_ford_path_length(G, weight="weight", *, chunksize="10 MiB"
                 yield (source, G.vector_to_nodemap(d))
 
 
+def _all_pairs_bellman_ford_concurrent(G, chunks, executor, max_workers):
+    iso_value = None
+    if G.get_property("is_iso") and not G.get_property("has_negative_edges+"):
+        # All edges have the same weight, so use BFS
+        iso_value = G.get_property("iso_value")
+        func = None
+    elif G.is_directed() and G.get_property("has_negative_edges-"):
+        func = algorithms.johnson_path_lengths
+    else:
+        func = algorithms.bellman_ford_path_lengths
+
+    def compute(nodes):
+        start = time.perf_counter()
+        if func is None:
+            D = algorithms.all_pairs_shortest_path_length(G, nodes=nodes, dtype=iso_value.dtype)
+            if iso_value != 1:
+                D *= iso_value
+        else:
+            D = func(G, nodes)
+        rows = [
+            D[i, :].new(name=f"all_pairs_bellman_ford_path_length_{i}") for i in range(len(nodes))
+        ]
+        return nodes, rows, D.nvals, time.perf_counter() - start
+
+    try:
+        for nodes, rows, nvals, seconds in imap_ordered(
+            compute, chunks, executor=executor, max_workers=max_workers
+        ):
+            if isinstance(chunks, AdaptiveChunks):
+                chunks.record(len(nodes), nvals, seconds)
+            for source, d in zip(nodes, rows, strict=True):
+                yield (source, G.vector_to_nodemap(d))
+    except algorithms.exceptions.Unbounded as e:
+        raise NetworkXUnbounded(*e.args) from e
+
+
 def single_source_bellman_ford_path_length(G, source, weight="weight"):
     # TODO: what if weight is a function?
     G = to_graph(G, weight=weight)
@@ -64,6 +181,8 @@ def bellman_ford_path(G, source, target, weight="weight"):
         return algorithms.bellman_ford_path(G, source, target)
     except KeyError as e:
         raise NodeNotFound(*e.args) from e
+    except exceptions.Unbounded as e:
+        raise NetworkXUnbounded(*e.args) from e
 
 
 def bellman_ford_path_length(G, source, target, weight="weight"):
@@ -76,6 +195,34 @@ def bellman_ford_path_length(G, source, target, weight="weight"):
         raise NetworkXNoPath(*e.args) from e
 
 
+def _check_dijkstra(G, source):
+    if source not in G:
+        raise NodeNotFound(f"Node {source} not found in graph")
+    if G.is_multigraph():
+        raise NotImplementedError("Dijkstra is not implemented for multigraphs")
+    if G.get_property("has_negative_edges+"):
+        # networkx may or may not raise ValueError for negative weights
+        raise NotImplementedError("Dijkstra is not implemented for negative weights")
+
+
+def single_source_dijkstra_path_length(G, source, cutoff=None, weight="weight"):
+    G = to_graph(G, weight=weight)
+    _check_dijkstra(G, source)
+    d = algorithms.single_source_dijkstra_path_length(G, source, cutoff=cutoff)
+    return G.vector_to_nodemap(d)
+
+
+def dijkstra_path_length(G, source, target, weight="weight"):
+    G = to_graph(G, weight=weight)
+    _check_dijkstra(G, source)
+    if target not in G:
+        raise NetworkXNoPath(f"Node {target} not reachable from {source}")
+    try:
+        return algorithms.dijkstra_path_length(G, source, target)
+    except exceptions.NoPath as e:
+        raise NetworkXNoPath(*e.args) from e
+
+
 def negative_edge_cycle(G, weight="weight", heuristic=True):
     # TODO: what if weight is a function?
     # TODO: use a heuristic to try to stop early
@@ -0,0 +1,58 @@
+import networkx as nx
+import pytest
+
+from graphblas_algorithms import DiGraph, Graph, nxapi
+
+
+@pytest.mark.parametrize("chunksize", [None, 1, 7, "3 chunks"])
+@pytest.mark.parametrize("directed", [False, True])
+def test_betweenness_chunksize(chunksize, directed):
+    G = nx.gnp_random_graph(30, 0.1, seed=42, directed=directed)
+    G.add_edge(0, 0)
+    G2 = (DiGraph if directed else Graph).from_networkx(G)
+    for kwargs in [{}, {"normalized": False}, {"endpoints": True}, {"k": 10}]:
+        expected = nx.betweenness_centrality(G, seed=1, **kwargs)
+        result = nxapi.betweenness_centrality(G2, seed=1, chunksize=chunksize, **kwargs)
+        assert result == pytest.approx(expected)
+    for kwargs in [{}, {"normalized": False}, {"k": 10}]:
+        expected = nx.edge_betweenness_centrality(G, seed=1, **kwargs)
+        result = nxapi.edge_betweenness_centrality(G2, seed=1, chunksize=chunksize, **kwargs)
+        assert result == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("chunksize", [None, 1, "100 b"])
+@pytest.mark.parametrize("directed", [False, True])
+def test_closeness_harmonic_chunksize(chunksize, directed):
+    G = nx.gnp_random_graph(30, 0.1, seed=42, directed=directed)
+    G2 = (DiGraph if directed else Graph).from_networkx(G)
+    for wf_improved in [True, False]:
+        expected = nx.closeness_centrality(G, wf_improved=wf_improved)
+        result = nxapi.closeness_centrality(G2, wf_improved=wf_improved, chunksize=chunksize)
+        assert result == pytest.approx(expected)
+    expected = nx.harmonic_centrality(G, nbunch=[0, 1, 2], sources=range(10, 20))
+    result = nxapi.harmonic_centrality(
+        G2, nbunch=[0, 1, 2], sources=range(10, 20), chunksize=chunksize
+    )
+    assert dict(result) == pytest.approx(expected)
+
+
+def test_betweenness_weighted_fallback(monkeypatch):
+    # Unequal weights aren't implemented, so automatic dispatch lets NetworkX run them
+    from networkx.utils.backends import _dispatch
+
+    from graphblas_algorithms.interface import Dispatcher
+
+    monkeypatch.setattr(_dispatch, "_automatic_backends", ["graphblas"])
+    G = nx.gnp_random_graph(30, 0.1, seed=42)
+    nx.set_edge_attributes(G, 2, "weight")
+    args = (G,)
+    assert Dispatcher.can_run("betweenness_centrality", args, {"weight": "weight"})
+    nx.set_edge_attributes(G, {e: i % 3 + 1 for i, e in enumerate(G.edges)}, "weight")
+    for name in ["betweenness_centrality", "edge_betweenness_centrality"]:
+        assert not Dispatcher.can_run(name, args, {"weight": "weight"})
+        assert Dispatcher.can_run(name, args, {})
+        expected = getattr(nx, name).orig_func(G, weight="weight")
+        result = getattr(nx, name)(G, weight="weight")
+        assert result == pytest.approx(expected)
+        with pytest.raises(NotImplementedError):
+            getattr(nxapi, name)(G, weight="weight")
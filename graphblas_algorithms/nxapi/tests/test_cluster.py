@@ -1,6 +1,9 @@
 import networkx as nx
+import numpy as np
+import pytest
+from graphblas.semiring import plus_pair
 
-from graphblas_algorithms import DiGraph, nxapi
+from graphblas_algorithms import DiGraph, Graph, algorithms, nxapi
 
 
 def test_directed():
@@ -32,3 +35,37 @@ def test_directed():
     expected = nx.average_clustering(G, count_zeros=False)
     result = nxapi.average_clustering(G2, count_zeros=False)
     assert result == expected
+
+
+def test_triangle_methods():
+    # Low average degree (edge-wise triangles) and skewed degrees (degree ordering)
+    for G in [nx.grid_2d_graph(10, 10), nx.barabasi_albert_graph(1000, 12, seed=1)]:
+        G = nx.convert_node_labels_to_integers(G)
+        G2 = Graph.from_networkx(G)
+        expected = sum(nx.triangles(G).values()) // 3
+        for method in [None, "Burkhardt", "Cohen", "Sandia", "SandiaDot"]:
+            assert algorithms.total_triangles(G2, method=method) == expected
+        assert nxapi.triangles(G2) == nx.triangles(G)
+        with pytest.raises(ValueError, match="method"):
+            algorithms.total_triangles(G2, method="bad")
+    L = algorithms.cluster._degree_ordered_L(G2)
+    assert plus_pair(L @ L).new(mask=L.S).reduce_scalar().get(0) == expected
+    degrees = G2.get_property("degrees-").to_dense(fill_value=0)
+    assert (np.diff(degrees[G2.get_property("degree_order").to_dense()]) >= 0).all()
+
+
+def test_clustering_nodes():
+    # Few nodes use only their rows of the adjacency matrix; self-edges are ignored
+    for create_using in [nx.Graph, nx.DiGraph]:
+        G = nx.gnp_random_graph(300, 0.05, directed=create_using is nx.DiGraph, seed=3)
+        G.add_edges_from((i, i) for i in range(0, 300, 4))
+        for u, v in G.edges:
+            G[u][v]["weight"] = (u + v) % 5 + 1
+        G2 = (DiGraph if G.is_directed() else Graph).from_networkx(G, weight="weight")
+        for nodes in [None, [0, 1, 2, 4, 8]]:
+            assert nxapi.clustering(G2, nodes) == nx.clustering(G, nodes)
+            result = nxapi.clustering(G2, nodes, weight="weight")
+            expected = nx.clustering(G, nodes, weight="weight")
+            assert result == pytest.approx(expected)
+            if not G.is_directed():
+                assert nxapi.triangles(G2, nodes) == nx.triangles(G, nodes)
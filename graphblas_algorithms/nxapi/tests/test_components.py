@@ -0,0 +1,98 @@
+import networkx as nx
+import pytest
+
+from graphblas_algorithms import DiGraph, Graph, algorithms, nxapi
+
+
+def _add_isolated_nodes_and_self_edges(G):
+    n = len(G)
+    G.add_nodes_from(range(n, n + 5))
+    G.add_edges_from([(0, 0), (n + 1, n + 1)])
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_connected_components(seed):
+    # Sparse random graphs have many components of different sizes
+    G = nx.gnp_random_graph(60, 0.03, seed=seed)
+    _add_isolated_nodes_and_self_edges(G)
+    G2 = Graph.from_networkx(G)
+    expected = sorted(map(sorted, nx.connected_components(G)))
+    assert sorted(map(sorted, nxapi.connected_components(G2))) == expected
+    assert nxapi.number_connected_components(G2) == len(expected)
+    # Labels are the smallest node index of each component
+    labels, _ = algorithms.connected_components(G2)
+    assert G2.vector_to_dict(labels) == {
+        node: min(component) for component in expected for node in component
+    }
+    D = nx.gnp_random_graph(60, 0.02, seed=seed, directed=True)
+    _add_isolated_nodes_and_self_edges(D)
+    D2 = DiGraph.from_networkx(D)
+    expected = sorted(map(sorted, nx.weakly_connected_components(D)))
+    assert sorted(map(sorted, nxapi.weakly_connected_components(D2))) == expected
+    assert nxapi.number_weakly_connected_components(D2) == len(expected)
+
+
+def _cycles_graph(seed):
+    # Cycles joined by one-way edges, with tails that trimming removes
+    G = nx.DiGraph()
+    for i in range(6):
+        nx.add_cycle(G, range(10 * i, 10 * i + 3 + i))
+    G.add_edges_from([(0, 10), (10, 20), (0, 30), (31, 40), (50, 12), (51, 0)])
+    nx.add_path(G, [20, 100, 101, 102])
+    nx.add_path(G, [103, 104, 40])
+    R = nx.gnp_random_graph(20, 0.08, seed=seed, directed=True)
+    G.update(nx.relabel_nodes(R, {i: 200 + i for i in R}))
+    _add_isolated_nodes_and_self_edges(G)
+    return G
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_strongly_connected_components(seed):
+    from graphblas import Vector
+
+    from graphblas_algorithms.algorithms.components.strongly_connected import _trim
+
+    G = _cycles_graph(seed)
+    G2 = DiGraph.from_networkx(G)
+    # Trimming leaves the cycles, so they are found by coloring
+    A, AT = G2.get_properties("offdiag offdiagT")
+    labels = Vector(int, len(G2))
+    remaining = Vector(bool, len(G2))
+    remaining << True
+    _trim(A, AT, labels, remaining)
+    assert 0 < remaining.nvals < len(G2)
+    expected = sorted(map(sorted, nx.strongly_connected_components(G)))
+    assert sorted(map(sorted, nxapi.strongly_connected_components(G2))) == expected
+    assert nxapi.number_strongly_connected_components(G2) == len(expected)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_condensation(seed):
+    from graphblas_algorithms.algorithms.components.strongly_connected import _sinks_first
+
+    G = _cycles_graph(seed)
+    G2 = DiGraph.from_networkx(G)
+    expected = nx.condensation(G)
+    for scc in [None, list(nx.strongly_connected_components(G))]:
+        C = nxapi.condensation(G2, scc)
+        mapping = C.graph["mapping"]
+        assert set(mapping) == set(G)
+        # The members of each component are the same as in NetworkX
+        members = {}
+        for node, component in mapping.items():
+            members.setdefault(component, set()).add(node)
+        assert sorted(map(sorted, members.values())) == sorted(
+            sorted(members) for _, members in expected.nodes(data="members")
+        )
+        if scc is not None:
+            assert mapping == expected.graph["mapping"]
+        # Edges of the condensation are the edges between components
+        rows, cols, _ = C._A.to_coo()
+        edges = set(zip(C.list_to_keys(rows.tolist()), C.list_to_keys(cols.tolist()), strict=True))
+        assert edges == {(mapping[u], mapping[v]) for u, v in G.edges if mapping[u] != mapping[v]}
+        if scc is None:
+            # Components are numbered sinks first, so edges go to smaller numbers
+            assert all(u > v for u, v in edges)
+    numbers = _sinks_first(C._A)
+    assert sorted(numbers) == list(range(len(C)))
+    assert all(numbers[u] > numbers[v] for u, v in zip(rows, cols, strict=True))
@@ -0,0 +1,57 @@
+import random
+
+import networkx as nx
+import pytest
+
+from graphblas_algorithms import DiGraph, Graph, nxapi
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_bounded_eccentricities(weighted):
+    G = nx.connected_watts_strogatz_graph(60, 4, 0.3, seed=42)
+    if weighted:
+        for i, (u, v) in enumerate(G.edges):
+            G.edges[u, v]["weight"] = i % 5 + 1
+    G2 = Graph.from_networkx(G, weight="weight" if weighted else None)
+    weight = "weight" if weighted else None
+    assert nxapi.eccentricity(G2, weight=weight) == nx.eccentricity(G, weight=weight)
+    assert nxapi.eccentricity(G2, [3, 7], weight=weight) == nx.eccentricity(
+        G, [3, 7], weight=weight
+    )
+    for func in ["diameter", "radius"]:
+        assert getattr(nxapi, func)(G2, weight=weight) == getattr(nx, func)(G, weight=weight)
+    for func in ["periphery", "center"]:
+        result = getattr(nxapi, func)(G2, weight=weight)
+        assert sorted(result) == sorted(getattr(nx, func)(G, weight=weight))
+
+
+def test_bounded_eccentricities_float():
+    # Bounds from different sources may differ by rounding, which must not loop forever
+    G = nx.connected_watts_strogatz_graph(80, 4, 0.2, seed=0)
+    rng = random.Random(1)
+    for i, (u, v) in enumerate(G.edges):
+        G.edges[u, v]["weight"] = rng.randint(1, 9) if i % 2 else rng.random() * 10
+    G2 = Graph.from_networkx(G, weight="weight")
+    expected = nx.eccentricity(G, weight="weight")
+    assert nxapi.eccentricity(G2, weight="weight") == pytest.approx(expected)
+    assert nxapi.diameter(G2, weight="weight") == pytest.approx(max(expected.values()))
+    assert nxapi.radius(G2, weight="weight") == pytest.approx(min(expected.values()))
+    # Eccentricities are compared exactly, so nodes whose path lengths differ from
+    # the extreme only by rounding may be left out
+    for func, extreme in [("periphery", max), ("center", min)]:
+        value = extreme(expected.values())
+        result = set(getattr(nxapi, func)(G2, weight="weight"))
+        assert result
+        assert result <= {
+            node for node, ecc in expected.items() if ecc == pytest.approx(value, rel=1e-12)
+        }
+
+
+@pytest.mark.parametrize("chunksize", [None, 1, "100 b"])
+def test_directed_chunksize(chunksize):
+    G = nx.DiGraph(nx.cycle_graph(20, create_using=nx.DiGraph))
+    G.add_edges_from([(0, 10), (5, 15), (12, 3)])
+    G2 = DiGraph.from_networkx(G)
+    assert nxapi.eccentricity(G2, chunksize=chunksize) == nx.eccentricity(G)
+    assert nxapi.diameter(G2, chunksize=chunksize) == nx.diameter(G)
+    assert nxapi.radius(G2, chunksize=chunksize) == nx.radius(G)
@@ -0,0 +1,258 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import networkx as nx
+import pytest
+
+from graphblas_algorithms import DiGraph, Graph, algorithms, nxapi
+
+
+@pytest.mark.parametrize("chunksize", [None, 1, 3, "1 kb", "100 b", "3 chunks"])
+@pytest.mark.parametrize("directed", [False, True])
+def test_all_pairs_chunksize(chunksize, directed):
+    # Many small components, so sources reach only a small part of the graph
+    G = nx.disjoint_union_all(
+        nx.gnp_random_graph(10, 0.3, seed=i, directed=directed) for i in range(10)
+    )
+    G2 = (DiGraph if directed else Graph).from_networkx(G)
+    for cutoff in [None, 0, 2]:
+        expected = dict(nx.all_pairs_shortest_path_length(G, cutoff))
+        result = list(nxapi.all_pairs_shortest_path_length(G2, cutoff, chunksize=chunksize))
+        assert dict(result) == expected
+        assert [source for source, _ in result] == list(G)
+    nx.set_edge_attributes(G, 2, "weight")
+    G2 = (DiGraph if directed else Graph).from_networkx(G, weight="weight")
+    expected = dict(nx.all_pairs_bellman_ford_path_length(G))
+    result = list(nxapi.all_pairs_bellman_ford_path_length(G2, chunksize=chunksize))
+    assert dict(result) == expected
+    assert [source for source, _ in result] == list(G)
+    # Sources are yielded in node order even if later sources finish first
+    G = nx.path_graph(10, nx.DiGraph if directed else nx.Graph)
+    G2 = (DiGraph if directed else Graph).from_networkx(G)
+    expected = list(nx.all_pairs_shortest_path_length(G))
+    result = nxapi.all_pairs_shortest_path_length(G2, chunksize=chunksize)
+    assert [(u, dict(d)) for u, d in result] == expected
+
+
+@pytest.mark.parametrize("chunksize", [None, 1, "100 b"])
+@pytest.mark.parametrize("directed", [False, True])
+def test_path_length_reductions_chunksize(chunksize, directed):
+    G = nx.gnp_random_graph(20, 0.3, seed=42, directed=directed)
+    nx.set_edge_attributes(G, {e: i % 3 + 1 for i, e in enumerate(G.edges)}, "weight")
+    for weight in [None, "weight"]:
+        G2 = (DiGraph if directed else Graph).from_networkx(G, weight=weight)
+        expected = nx.average_shortest_path_length(G, weight=weight)
+        result = nxapi.average_shortest_path_length(G2, weight=weight, chunksize=chunksize)
+        assert result == pytest.approx(expected)
+        assert nxapi.wiener_index(G2, weight, chunksize=chunksize) == nx.wiener_index(G, weight)
+
+
+@pytest.mark.parametrize("dtype", [int, "float32"])
+def test_delta_stepping(dtype):
+    # Weights vary a lot, so there are both light and heavy edges
+    G = nx.grid_2d_graph(8, 8, create_using=nx.DiGraph)
+    nx.set_edge_attributes(G, {e: 2 ** (i * 7 % 11) for i, e in enumerate(G.edges)}, "weight")
+    G.add_edge((0, 0), (0, 0), weight=5)
+    G2 = DiGraph.from_networkx(G, weight="weight", dtype=dtype)
+    assert G2.get_property("heavy_edges-").nvals > 0
+    source = (0, 0)
+    expected = nx.single_source_dijkstra_path_length(G, source)
+    assert nxapi.single_source_dijkstra_path_length(G2, source) == expected
+    assert nxapi.single_source_bellman_ford_path_length(G2, source) == expected
+    expected = nx.single_source_dijkstra_path_length(G, source, cutoff=300)
+    assert nxapi.single_source_dijkstra_path_length(G2, source, cutoff=300) == expected
+    for target in [(0, 1), (4, 4), (7, 7)]:
+        expected = nx.dijkstra_path_length(G, source, target)
+        assert nxapi.dijkstra_path_length(G2, source, target) == expected
+        assert nxapi.bellman_ford_path_length(G2, source, target) == expected
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_bool_weights(directed):
+    # Non-iso BOOL weights are used as 0 and 1
+    G = nx.gnp_random_graph(30, 0.15, seed=1, directed=directed)
+    nx.set_edge_attributes(G, {e: i % 3 != 0 for i, e in enumerate(G.edges)}, "weight")
+    G2 = (DiGraph if directed else Graph).from_networkx(G, weight="weight", dtype=bool)
+    assert not G2.get_property("is_iso")
+    expected = nx.single_source_bellman_ford_path_length(G, 0)
+    assert nxapi.single_source_bellman_ford_path_length(G2, 0) == expected
+    for target in expected:
+        assert nxapi.bellman_ford_path_length(G2, 0, target) == expected[target]
+    expected = dict(nx.all_pairs_bellman_ford_path_length(G))
+    assert dict(nxapi.all_pairs_bellman_ford_path_length(G2)) == expected
+    assert dict(nxapi.all_pairs_bellman_ford_path_length(G2, chunksize=7)) == expected
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_bfs_push_pull(monkeypatch, directed):
+    # A path into a dense cluster and out again: the frontier grows large enough to pull
+    # from the cluster, then shrinks back to pushing along the path.
+    from graphblas_algorithms.algorithms import _bfs
+
+    create_using = nx.DiGraph if directed else nx.Graph
+    G = nx.path_graph(30, create_using=create_using)
+    G.update(nx.complete_graph(range(30, 90), create_using=create_using))
+    nx.add_path(G, range(29, 31))
+    nx.add_path(G, range(89, 130))
+    G2 = (DiGraph if directed else Graph).from_networkx(G)
+    methods = []
+    get_push_pull = _bfs._get_push_pull
+
+    def recording_get_push_pull(*args, **kwargs):
+        expand = get_push_pull(*args, **kwargs)
+
+        def recording_expand(semiring, q, v):
+            expr = expand(semiring, q, v)
+            methods.append(expr.method_name)  # "vxm" to push, "mxv" to pull
+            return expr
+
+        return recording_expand
+
+    monkeypatch.setattr(_bfs, "_get_push_pull", recording_get_push_pull)
+    for source in [0, 60, 129]:
+        methods.clear()
+        expected = nx.single_source_shortest_path_length(G, source)
+        assert nxapi.single_source_shortest_path_length(G2, source) == expected
+        if source == 0:
+            # Push, then pull in the cluster, then push again
+            assert methods[0] == "vxm"
+            assert "vxm" in methods[methods.index("mxv") :]
+    if directed:
+        expected = nx.shortest_path_length(G, target=129)
+        assert dict(nxapi.single_target_shortest_path_length(G2, 129)) == expected
+
+
+def test_bellman_ford_path():
+    G = nx.DiGraph()
+    G.add_weighted_edges_from(
+        [(0, 1, 2.5), (1, 2, -1.0), (0, 2, 1.75), (2, 3, 0.5), (1, 3, 1.0), (3, 4, 0.0)]
+    )
+    G2 = DiGraph.from_networkx(G, weight="weight")
+    for target in G:
+        assert nxapi.bellman_ford_path(G2, 0, target) == nx.bellman_ford_path(G, 0, target)
+    # A negative cycle that doesn't reach the target
+    G.add_weighted_edges_from([(1, 5, 1.0), (5, 6, -2.0), (6, 5, 1.0)])
+    G2 = DiGraph.from_networkx(G, weight="weight")
+    with pytest.raises(nx.NetworkXUnbounded):
+        nxapi.bellman_ford_path(G2, 0, 4)
+
+
+@pytest.mark.parametrize("chunksize", [None, 1, 7])
+def test_johnson_chunksize(chunksize):
+    G = nx.gnp_random_graph(30, 0.15, seed=42, directed=True)
+    # Negative weights without negative cycles
+    nx.set_edge_attributes(G, {(u, v): (u + v) % 5 + u - v for u, v in G.edges}, "weight")
+    G2 = DiGraph.from_networkx(G, weight="weight")
+    expected = dict(nx.all_pairs_bellman_ford_path_length(G))
+    result = dict(nxapi.all_pairs_bellman_ford_path_length(G2, chunksize=chunksize))
+    assert result == expected
+    if "johnson_graph" in G2._cache:
+        # The reweighted graph and its properties are shared by every chunk
+        Gr = G2._cache["johnson_graph"]
+        delta = Gr._cache["delta"]
+        dict(nxapi.all_pairs_bellman_ford_path_length(G2, chunksize=chunksize))
+        assert G2._cache["johnson_graph"] is Gr
+        assert Gr._cache["delta"] is delta
+    G.add_edge(3, 5, weight=-100)
+    G2 = DiGraph.from_networkx(G, weight="weight")
+    with pytest.raises(nx.NetworkXUnbounded):
+        dict(nxapi.all_pairs_bellman_ford_path_length(G2, chunksize=chunksize))
+
+
+@pytest.mark.parametrize("blocksize", [1, 3, 16, 100])
+@pytest.mark.parametrize("directed", [False, True])
+def test_floyd_warshall_blocksize(blocksize, directed):
+    G = nx.gnp_random_graph(40, 0.08, seed=42, directed=directed)
+    nx.set_edge_attributes(G, {e: i % 5 + 1 for i, e in enumerate(G.edges)}, "weight")
+    G.add_node(40)
+    G2 = (DiGraph if directed else Graph).from_networkx(G, weight="weight")
+    _, D = algorithms.floyd_warshall_predecessor_and_distance(
+        G2, is_weighted=True, compute_predecessors=False, blocksize=blocksize
+    )
+    expected = nx.floyd_warshall_numpy(G)
+    assert (D.to_dense(fill_value=float("inf")) == expected).all()
+
+
+@pytest.mark.parametrize("k", [0, 1, 8])
+@pytest.mark.parametrize("directed", [False, True])
+def test_landmarks(k, directed):
+    G = nx.disjoint_union(
+        nx.gnp_random_graph(40, 0.06, seed=42, directed=directed),
+        nx.gnp_random_graph(10, 0.2, seed=42, directed=directed),
+    )
+    G2 = (DiGraph if directed else Graph).from_networkx(G)
+    landmarks = algorithms.landmark_index(G2, k)
+    for u in range(0, 50, 3):
+        for v in range(0, 50, 2):
+            try:
+                expected = nx.shortest_path_length(G, u, v)
+            except nx.NetworkXNoPath:
+                expected = None
+            try:
+                result = algorithms.bidirectional_shortest_path_length(
+                    G2, u, v, landmarks=landmarks
+                )
+            except algorithms.exceptions.NoPath:
+                result = None
+            assert result == expected
+            assert nxapi.has_path(G2, u, v, landmarks=k) == (expected is not None)
+
+
+@pytest.mark.parametrize("chunksize", [None, 1, 7])
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_all_pairs_executor(chunksize, max_workers):
+    G = nx.gnp_random_graph(30, 0.1, seed=42, directed=True)
+    G2 = DiGraph.from_networkx(G)
+    expected = list(nx.all_pairs_shortest_path_length(G))
+    result = nxapi.all_pairs_shortest_path_length(G2, chunksize=chunksize, max_workers=max_workers)
+    assert [(u, dict(d)) for u, d in result] == [(u, dict(d)) for u, d in expected]
+    nx.set_edge_attributes(G, {e: i % 5 - 1 for i, e in enumerate(G.edges)}, "weight")
+    G.remove_edges_from([(u, v) for u, v, w in G.edges(data="weight") if w < 0 and u > v])
+    G2 = DiGraph.from_networkx(G, weight="weight")
+    expected = list(nx.all_pairs_bellman_ford_path_length(G))
+    with ThreadPoolExecutor(2) as executor:
+        result = nxapi.all_pairs_bellman_ford_path_length(
+            G2, chunksize=chunksize, executor=executor, max_workers=max_workers
+        )
+        assert [(u, dict(d)) for u, d in result] == [(u, dict(d)) for u, d in expected]
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_all_pairs_processes(directed):
+    G = nx.gnp_random_graph(30, 0.1, seed=42, directed=directed)
+    G2 = (DiGraph if directed else Graph).from_networkx(G)
+    expected = list(nx.all_pairs_shortest_path_length(G, 3))
+    result = nxapi.all_pairs_shortest_path_length(
+        G2, 3, chunksize=7, executor="processes", max_workers=2
+    )
+    assert [(u, dict(d)) for u, d in result] == [(u, dict(d)) for u, d in expected]
+    nx.set_edge_attributes(G, {e: i % 5 - directed for i, e in enumerate(G.edges)}, "weight")
+    G.remove_edges_from([(u, v) for u, v, w in G.edges(data="weight") if w < 0 and u > v])
+    G2 = (DiGraph if directed else Graph).from_networkx(G, weight="weight")
+    expected = list(nx.all_pairs_bellman_ford_path_length(G))
+    with ProcessPoolExecutor(2) as executor:
+        result = nxapi.all_pairs_bellman_ford_path_length(G2, chunksize=4, executor=executor)
+        assert [(u, dict(d)) for u, d in result] == [(u, dict(d)) for u, d in expected]
+        # Johnson potentials are computed once in this process and shared with workers
+        assert ("johnson_potentials" in G2._cache) == directed
+        G2 = (DiGraph if directed else Graph).from_networkx(
+            nx.path_graph(5, nx.DiGraph if directed else nx.Graph), weight="weight"
+        )
+        G2._A[4, 4] = -1
+        with pytest.raises(nx.NetworkXUnbounded):
+            list(nxapi.all_pairs_bellman_ford_path_length(G2, executor=executor))
+
+
+@pytest.mark.parametrize("executor", [None, "threads", "processes"])
+def test_all_pairs_auto_chunksize(executor):
+    kwargs = {"max_workers": 2} if executor == "threads" else {"executor": executor}
+    G = nx.disjoint_union_all(nx.gnp_random_graph(10, 0.3, seed=i) for i in range(20))
+    G2 = Graph.from_networkx(G)
+    expected = dict(nx.all_pairs_shortest_path_length(G))
+    result = dict(nxapi.all_pairs_shortest_path_length(G2, chunksize="auto", **kwargs))
+    assert result == expected
+    nx.set_edge_attributes(G, {e: i % 3 + 1 for i, e in enumerate(G.edges)}, "weight")
+    G2 = Graph.from_networkx(G, weight="weight")
+    expected = dict(nx.all_pairs_bellman_ford_path_length(G))
+    result = dict(nxapi.all_pairs_bellman_ford_path_length(G2, chunksize="auto", **kwargs))
+    assert result == expected
+    assert list(nxapi.all_pairs_shortest_path_length(Graph(), chunksize="auto")) == []
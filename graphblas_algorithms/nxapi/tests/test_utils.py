@@ -1,6 +1,6 @@
 import pytest
 
-from graphblas_algorithms.nxapi._utils import normalize_chunksize
+from graphblas_algorithms.nxapi._utils import AdaptiveChunks, normalize_chunksize
 
 
 def test_normalize_chunksize():
@@ -31,3 +31,16 @@ def test_normalize_chunksize():
         normalize_chunksize("1bad0 TB")
     with pytest.raises(TypeError, match="N argument is required"):
         normalize_chunksize("10 chunks")
+
+
+def test_adaptive_chunks():
+    chunks = AdaptiveChunks(list(range(1000)), 1000, 8, maxbytes=8000 * 10, seconds=1)
+    assert chunks.size == 10
+    it = iter(chunks)
+    assert len(next(it)) == 10
+    chunks.record(10, 10 * 5)  # Each row has 5 values of 16 bytes each
+    assert chunks.size == 40  # Grows by at most 4x
+    chunks.record(40, 40 * 5, seconds=2)
+    assert chunks.size == 20  # Slower than the target time
+    assert len(next(it)) == 20
+    assert sum(map(len, it)) == 970
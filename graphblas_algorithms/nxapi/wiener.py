@@ -0,0 +1,17 @@
+from graphblas_algorithms import algorithms
+from graphblas_algorithms.classes.digraph import to_graph
+
+from ._utils import chunksize_to_maxbytes
+from .exception import NetworkXPointlessConcept, NetworkXUnbounded
+
+__all__ = ["wiener_index"]
+
+
+def wiener_index(G, weight=None, *, chunksize="10 MiB"):
+    G = to_graph(G, weight=weight)
+    try:
+        return algorithms.wiener_index(G, maxbytes=chunksize_to_maxbytes(chunksize, G))
+    except algorithms.exceptions.PointlessConcept as e:
+        raise NetworkXPointlessConcept(*e.args) from e
+    except algorithms.exceptions.Unbounded as e:
+        raise NetworkXUnbounded(*e.args) from e
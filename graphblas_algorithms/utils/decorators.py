@@ -1,6 +1,6 @@
 from graphblas import Matrix
 
-__all__ = ["not_implemented_for"]
+__all__ = ["not_implemented_for", "py_random_state"]
 
 
 def not_implemented_for(*graph_types):
@@ -18,3 +18,9 @@ def not_implemented_for(*graph_types):
 
     rv._func = inner
     return rv
+
+
+def py_random_state(random_state_argument):
+    import networkx.utils.decorators
+
+    return networkx.utils.decorators.py_random_state(random_state_argument)